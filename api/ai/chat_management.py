@@ -19,7 +19,8 @@ from models.schemas.response_models import (
     SessionResponse, SessionDetailResponse, SessionListResponse, SessionStatsResponse,
     SessionCreateResponse, SessionUpdateResponse, SessionBulkActionResponse
 )
-from services.ai.chat_management_service import chat_management_service
+from services.registry import chat_management_service
+from services.ai.deadlines import request_deadline
 from services.auth.session_management_service import get_session_management_service
 from services.auth_utils import get_current_user_simple as get_current_user
 from services.database.database import get_db
@@ -331,6 +332,7 @@ async def send_message(
     """
     log_function_entry(logger, "send_message")
     start_time = time.time()
+    deadline = request_deadline()
     
     try:
         user_id = str(current_user.id)
@@ -338,6 +340,7 @@ async def send_message(
             chat_id=chat_id,
             user_id=user_id,
             message=request.message,
+            deadline=deadline,
             message_type=request.message_type,
             attachments=request.attachments,
             context=request.context,
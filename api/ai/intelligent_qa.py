@@ -3,8 +3,9 @@ from typing import List
 import time
 import datetime
 
-from services.ai.intelligent_qa_service import intelligent_qa_service
-from services.dependencies import get_current_user
+from services.registry import intelligent_qa_service
+from services.ai.deadlines import request_deadline
+from services.dependencies import get_current_user, get_current_admin_user
 from models.domain.user import User
 from config.logging_config import get_logger, log_function_entry, log_function_exit, log_performance, log_error_with_context
 
@@ -21,6 +22,7 @@ async def ask_intelligent_question(
         result = await intelligent_qa_service.process_question(
             question=question,
             user_id=str(current_user.id),
+            deadline=request_deadline(),
         )
         return result
     except Exception as e:
@@ -59,7 +61,7 @@ async def scrape_news_sources(
     start_time = time.time()
     
     try:
-        from services.ai.web_scraping_service import web_scraping_service
+        from services.registry import web_scraping_service
         
         # Initialize web scraping service if needed
         if not web_scraping_service.session:
@@ -153,5 +155,105 @@ async def scrape_news_sources(
         }
 
 
+@router.post("/knowledge/snapshot")
+async def build_knowledge_snapshot(
+    rebuild: bool = Query(True, description="Sync the knowledge files into Qdrant before exporting the snapshot"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    📦 Build a Qdrant snapshot of the knowledge base
+    
+    The snapshot is keyed by a hash of the knowledge files and embedding model and
+    is restored automatically at startup when the hash matches.
+    """
+    log_function_entry(logger, "build_knowledge_snapshot", rebuild=rebuild, user_email=current_user.email)
+    start_time = time.time()
+    
+    from services.registry import data_integration_service
+    result = await data_integration_service.build_snapshot(rebuild=rebuild)
+    
+    duration = time.time() - start_time
+    log_function_exit(logger, "build_knowledge_snapshot", result=result, duration=duration)
+    if result.get("status") != "success":
+        raise HTTPException(status_code=500, detail=result.get("error"))
+    return result
+
+
+@router.post("/knowledge/snapshot/restore")
+async def restore_knowledge_snapshot(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    ♻️ Restore the knowledge base from the snapshot matching the current knowledge files
+    """
+    log_function_entry(logger, "restore_knowledge_snapshot", user_email=current_user.email)
+    start_time = time.time()
+    
+    from services.registry import data_integration_service
+    result = await data_integration_service.restore_snapshot()
+    
+    duration = time.time() - start_time
+    log_function_exit(logger, "restore_knowledge_snapshot", result=result, duration=duration)
+    if result.get("status") == "not_found":
+        raise HTTPException(status_code=404, detail=result.get("message"))
+    if result.get("status") == "conflict":
+        raise HTTPException(status_code=409, detail=result.get("error"))
+    if result.get("status") != "success":
+        raise HTTPException(status_code=500, detail=result.get("error"))
+    return result
+
+
+@router.post("/knowledge/reload")
+async def reload_knowledge(
+    filename: str = Query(None, description="Knowledge file to reload (default: every file changed on disk)"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    🔄 Hot-reload knowledge files
+    
+    Re-parses the edited file(s), swaps the in-memory knowledge snapshot and
+    pushes only the changed pairs to Qdrant and Redis.
+    """
+    log_function_entry(logger, "reload_knowledge", filename=filename, user_email=current_user.email)
+    start_time = time.time()
+    
+    from services.registry import data_integration_service
+    result = await data_integration_service.reload_knowledge(filename=filename)
+    
+    duration = time.time() - start_time
+    log_function_exit(logger, "reload_knowledge", result=result, duration=duration)
+    if result.get("status") == "not_found":
+        raise HTTPException(status_code=404, detail=result.get("error"))
+    if result.get("status") == "error":
+        raise HTTPException(status_code=500, detail=result.get("error"))
+    return result
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    📊 Cache statistics: per-namespace hit ratios of the two-tier cache and the Redis knowledge cache
+    """
+    from services.registry import redis_service
+    from services.database.two_tier_cache import two_tier_cache
+    return {
+        "two_tier_cache": two_tier_cache.get_stats(),
+        "redis": await redis_service.get_cache_stats()
+    }
+
+
+@router.get("/models/stats")
+async def get_model_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    🧭 Gemini model routing: calls, latency percentiles, tokens and estimated cost per route
+    """
+    from services.registry import gemini_service
+    return gemini_service.get_stats()
+
+
 # Export the router
 intelligent_qa_router = router
\ No newline at end of file
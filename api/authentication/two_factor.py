@@ -130,7 +130,11 @@ class TwoFactorService:
             raise
 
     def verify_and_enable_2fa(self, current_user: User, verify_data: TwoFactorVerifyRequest, db: Session):
-        if not current_user.two_factor_secret:
+        # The cached current user carries no credentials; read the secret from the database
+        user_repo = get_user_repository()
+        user = user_repo.get_user_by_id(db, str(current_user.id))
+        two_factor_secret = user.two_factor_secret if user else None
+        if not two_factor_secret:
             raise HTTPException(status_code=400, detail="2FA is not set up. Please set it up first.")
 
         # Check rate limiting
@@ -142,7 +146,7 @@ class TwoFactorService:
 
         # 1. Verify the code
         two_factor_service = get_two_factor_auth_service()
-        is_valid = two_factor_service.verify_code(current_user.two_factor_secret, verify_data.code)
+        is_valid = two_factor_service.verify_code(two_factor_secret, verify_data.code)
         
         # Record the attempt
         self._record_attempt(str(current_user.id), is_valid)
@@ -154,7 +158,6 @@ class TwoFactorService:
             )
 
         # 2. Enable 2FA for the user
-        user_repo = get_user_repository()
         user_repo.update_user(db, str(current_user.id), {"two_factor_enabled": True})
 
         return GeneralResponse(status="success", message="2FA has been successfully enabled.")
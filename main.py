@@ -35,7 +35,9 @@ initialization_state = {
         "gemini_service": {"status": "pending", "message": "Not started"}
     },
     "overall_progress": 0,
-    "error": None
+    "error": None,
+    # Which worker ran the knowledge base step and the shared (Redis) readiness record
+    "cluster": {"role": "pending", "worker_id": None, "leader": None}
 }
 
 class InitializationManager:
@@ -82,12 +84,30 @@ class InitializationManager:
             self.state["components"]["knowledge_base"]["status"] = "in_progress"
             self.state["components"]["knowledge_base"]["message"] = "Loading knowledge data..."
             
-            from services.ai.intelligent_qa_service import intelligent_qa_service
-            knowledge_result = await intelligent_qa_service.initialize_system()
+            # Only one worker ingests the knowledge base; the others wait for its readiness record
+            from services.registry import intelligent_qa_service, data_integration_service
+            from services.database.init_coordinator import init_coordinator
+            from services.registry import qdrant_service
+            knowledge_hash = await asyncio.to_thread(data_integration_service.compute_knowledge_hash)
+            # An embedded (QDRANT_MODE=local) collection lives in each process, so every worker loads its own
+            outcome = await init_coordinator.run_once(
+                knowledge_hash,
+                intelligent_qa_service.initialize_system,
+                coordinate=not qdrant_service.is_local
+            )
+            knowledge_result = outcome["result"] or {}
+            self.state["cluster"] = {
+                "role": outcome["role"],
+                "worker_id": init_coordinator.worker_id,
+                "leader": (outcome["state"] or {}).get("leader", init_coordinator.worker_id)
+            }
             
             if knowledge_result.get("status") == "success":
                 self.state["components"]["knowledge_base"]["status"] = "completed"
-                self.state["components"]["knowledge_base"]["message"] = "Knowledge base loaded successfully"
+                self.state["components"]["knowledge_base"]["message"] = (
+                    f"Knowledge base loaded by worker {self.state['cluster']['leader']}"
+                    if outcome["role"] == "follower" else "Knowledge base loaded successfully"
+                )
             else:
                 self.state["components"]["knowledge_base"]["status"] = "failed"
                 self.state["components"]["knowledge_base"]["message"] = f"Failed: {knowledge_result.get('error', 'Unknown error')}"
@@ -99,7 +119,6 @@ class InitializationManager:
             self.state["components"]["qdrant"]["status"] = "in_progress"
             self.state["components"]["qdrant"]["message"] = "Testing connection..."
             
-            from services.ai.qdrant_service import qdrant_service
             qdrant_healthy = qdrant_service.is_connected()
             
             if qdrant_healthy:
@@ -116,7 +135,7 @@ class InitializationManager:
             self.state["components"]["embedding_service"]["status"] = "in_progress"
             self.state["components"]["embedding_service"]["message"] = "Testing service..."
             
-            from services.ai.embedding_service import embedding_service
+            from services.registry import embedding_service
             embedding_healthy = embedding_service.is_available()
             
             if embedding_healthy:
@@ -133,7 +152,7 @@ class InitializationManager:
             self.state["components"]["gemini_service"]["status"] = "in_progress"
             self.state["components"]["gemini_service"]["message"] = "Testing service..."
             
-            from services.ai.gemini_service import gemini_service
+            from services.registry import gemini_service
             gemini_healthy = gemini_service.is_available()
             
             if gemini_healthy:
@@ -167,27 +186,30 @@ class InitializationManager:
             self.state["error"] = str(e)
             logger.error(f"❌ System initialization failed after {duration:.2f} seconds: {e}")
     
-    def get_status(self) -> Dict[str, Any]:
-        """Get current initialization status"""
-        return self.state.copy()
+    async def get_status(self) -> Dict[str, Any]:
+        """Get current initialization status, including the cluster-wide record"""
+        status = self.state.copy()
+        from services.database.init_coordinator import init_coordinator
+        status["cluster"] = {**self.state["cluster"], **(await init_coordinator.get_cluster_status())}
+        return status
     
     def is_ready(self) -> bool:
         """Check if the system is ready to handle requests"""
         return self.state["status"] == "completed"
     
-    def get_health_status(self) -> Dict[str, Any]:
+    async def get_health_status(self) -> Dict[str, Any]:
         """Get health status for health check endpoint"""
         if self.state["status"] == "not_started":
             return {
                 "status": "starting",
                 "message": "System is starting up",
-                "initialization": self.state
+                "initialization": await self.get_status()
             }
         elif self.state["status"] == "in_progress":
             return {
                 "status": "initializing",
                 "message": "System is initializing",
-                "initialization": self.state
+                "initialization": await self.get_status()
             }
         elif self.state["status"] == "completed":
             failed_components = sum(1 for comp in self.state["components"].values() if comp["status"] == "failed")
@@ -195,19 +217,19 @@ class InitializationManager:
                 return {
                     "status": "healthy",
                     "message": "System is fully operational",
-                    "initialization": self.state
+                    "initialization": await self.get_status()
                 }
             else:
                 return {
                     "status": "degraded",
                     "message": f"System is operational with {failed_components} failed components",
-                    "initialization": self.state
+                    "initialization": await self.get_status()
                 }
         else:  # failed
             return {
                 "status": "unhealthy",
                 "message": "System initialization failed",
-                "initialization": self.state
+                "initialization": await self.get_status()
             }
     
     async def restart_initialization(self) -> bool:
@@ -240,10 +262,38 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Failed to start background initialization: {e}")
         # Continue startup even if initialization fails
     
+    # Periodically remove expired news vectors from Qdrant
+    from services.registry import news_integration_service
+    news_integration_service.start_expiry_scheduler()
+    
+    # Periodically recount the Redis cache stats counters with SCAN
+    from services.registry import redis_service
+    redis_service.start_stats_maintenance()
+    
+    # Two-tier cache: invalidate on committed row changes, listen for other workers' invalidations
+    from services.database.cache_invalidation import register_cache_invalidation
+    from services.database.two_tier_cache import two_tier_cache
+    register_cache_invalidation()
+    two_tier_cache.start_invalidation_listener()
+    
+    # Hot-reload edited knowledge files (KNOWLEDGE_WATCH=true)
+    from services.registry import data_integration_service
+    data_integration_service.start_knowledge_watcher()
+    
     yield
     
     logger.info("🛑 Shutting down Syria GPT application...")
     
+    await news_integration_service.stop_expiry_scheduler()
+    await data_integration_service.stop_knowledge_watcher()
+    await two_tier_cache.stop_invalidation_listener()
+    
+    # Close Redis connection pools if the service was ever used
+    from services.registry import registry
+    if registry.is_initialized("redis_service"):
+        await redis_service.stop_stats_maintenance()
+        await redis_service.close()
+    
     # Cancel any ongoing initialization
     if init_manager._initialization_task and not init_manager._initialization_task.done():
         logger.info("🔄 Cancelling ongoing initialization...")
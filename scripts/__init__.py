@@ -0,0 +1 @@
+# Operational and benchmark scripts (run from the project root with `python -m scripts.<name>`)
@@ -0,0 +1,85 @@
+"""
+Benchmark embedded (local mode) Qdrant search latency as the collection grows.
+
+Local mode searches by brute force, so latency grows linearly with the number of
+points. This script inserts random unit vectors at increasing collection sizes and
+reports p50/p95 search latency, flagging the first size whose p95 exceeds the
+latency budget - beyond that point a Qdrant server (HNSW index) should be used.
+
+Usage:
+    python -m scripts.benchmark_qdrant_local --sizes 1000 5000 10000 25000 50000 --budget-ms 20
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+
+def _random_unit_vectors(count: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    vectors = rng.standard_normal((count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def benchmark(sizes, dim: int, queries: int, k: int, budget_ms: float):
+    rng = np.random.default_rng(42)
+    client = QdrantClient(location=":memory:")
+    collection = "local_mode_benchmark"
+    client.create_collection(
+        collection_name=collection,
+        vectors_config=VectorParams(size=dim, distance=Distance.COSINE)
+    )
+
+    results = []
+    inserted = 0
+    for size in sorted(sizes):
+        # Grow the collection incrementally up to `size`
+        batch = _random_unit_vectors(size - inserted, dim, rng)
+        for start in range(0, len(batch), 1000):
+            chunk = batch[start:start + 1000]
+            client.upsert(
+                collection_name=collection,
+                points=[
+                    PointStruct(id=inserted + start + i, vector=vector.tolist())
+                    for i, vector in enumerate(chunk)
+                ]
+            )
+        inserted = size
+
+        latencies = []
+        for query in _random_unit_vectors(queries, dim, rng):
+            started = time.perf_counter()
+            client.search(collection_name=collection, query_vector=query.tolist(), limit=k)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        p50, p95 = np.percentile(latencies, [50, 95])
+        results.append({
+            "points": size,
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "within_budget": bool(p95 <= budget_ms)
+        })
+
+    first_over_budget = next((r["points"] for r in results if not r["within_budget"]), None)
+    return {
+        "dimension": dim,
+        "queries_per_size": queries,
+        "k": k,
+        "budget_ms": budget_ms,
+        "results": results,
+        "first_size_over_budget": first_over_budget
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 25000, 50000])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=20.0, help="Acceptable p95 search latency")
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.sizes, args.dim, args.queries, args.k, args.budget_ms), indent=2))
@@ -0,0 +1,26 @@
+"""
+Benchmark recall@k of the configured Qdrant index (HNSW + quantization) against
+an exact, unquantized baseline.
+
+Usage:
+    QDRANT_QUANTIZATION=scalar python -m scripts.benchmark_qdrant_recall --k 10 --samples 200
+"""
+import argparse
+import asyncio
+import json
+
+from services.registry import qdrant_service
+
+
+async def main(k: int, samples: int):
+    await qdrant_service._ensure_collection_exists()
+    result = await qdrant_service.benchmark_recall(k=k, sample_size=samples)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=10, help="Number of neighbours compared per query")
+    parser.add_argument("--samples", type=int, default=100, help="Number of stored vectors used as queries")
+    args = parser.parse_args()
+    asyncio.run(main(args.k, args.samples))
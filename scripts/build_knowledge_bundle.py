@@ -0,0 +1,88 @@
+"""
+Compile data/syria_knowledge into the binary knowledge bundle.
+
+The bundle (string table, pair records, keyword index and optionally the pair
+embeddings) is memory-mapped by the knowledge store at startup instead of
+parsing the JSON files. It is only used while its recorded file hashes match
+the JSON files, so a stale bundle is ignored rather than served.
+
+Usage:
+    python -m scripts.build_knowledge_bundle                    # records and indexes only
+    python -m scripts.build_knowledge_bundle --with-embeddings  # also copy the vectors stored in Qdrant
+    python -m scripts.build_knowledge_bundle --benchmark        # compare JSON and bundle load times
+"""
+import argparse
+import json
+import time
+
+from services.ai.knowledge_store import KnowledgeStore, knowledge_store
+
+
+def collect_embeddings(batch_size: int = 256):
+    """Main and (shared) variant vectors of every pair, read back from Qdrant"""
+    from services.registry import qdrant_service
+    from services.registry import embedding_service
+    from services.ai.data_integration_service import DataIntegrationService
+
+    entries = knowledge_store.snapshot.entries
+    wanted = {}
+    for entry in entries:
+        _, variant_texts = DataIntegrationService._embedding_texts(entry)
+        wanted[entry.id] = [qdrant_service.qa_point_id(entry.id, 0)] + [
+            qdrant_service.variant_point_id(text) for text in variant_texts.values()
+        ]
+
+    point_ids = list(dict.fromkeys(point_id for ids in wanted.values() for point_id in ids))
+    vectors = {}
+    for start in range(0, len(point_ids), batch_size):
+        points = qdrant_service.client.retrieve(
+            collection_name=qdrant_service.collection_name,
+            ids=point_ids[start:start + batch_size],
+            with_vectors=True,
+            with_payload=False
+        )
+        vectors.update({str(point.id): point.vector for point in points})
+
+    embeddings = {}
+    for qa_id, ids in wanted.items():
+        if all(point_id in vectors for point_id in ids):
+            embeddings[qa_id] = [vectors[point_id] for point_id in ids]
+    return embeddings, embedding_service.model_name, embedding_service.output_dim
+
+
+def benchmark(rounds: int = 5):
+    def best_of(use_bundle: bool) -> float:
+        timings = []
+        for _ in range(rounds):
+            store = KnowledgeStore()
+            start = time.perf_counter()
+            store._build_snapshot(use_bundle=use_bundle)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    json_seconds, bundle_seconds = best_of(False), best_of(True)
+    return {
+        "json_load_ms": round(json_seconds * 1000, 2),
+        "bundle_load_ms": round(bundle_seconds * 1000, 2),
+        "speedup": round(json_seconds / bundle_seconds, 1) if bundle_seconds else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--with-embeddings", action="store_true", help="Include the vectors currently stored in Qdrant")
+    parser.add_argument("--benchmark", action="store_true", help="Measure JSON vs bundle load time after building")
+    args = parser.parse_args()
+
+    embeddings, model_name, dimension = None, None, 0
+    if args.with_embeddings:
+        embeddings, model_name, dimension = collect_embeddings()
+
+    result = knowledge_store.build_bundle(embeddings=embeddings, embedding_model=model_name, dimension=dimension)
+    if args.benchmark:
+        result["benchmark"] = benchmark()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
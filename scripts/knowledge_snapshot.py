@@ -0,0 +1,43 @@
+"""
+Build or restore the Qdrant knowledge snapshot.
+
+The snapshot is keyed by a hash of the knowledge files and the embedding model,
+so a deployment whose data has not changed can restore it at boot instead of
+re-embedding every Q&A pair.
+
+Usage:
+    python -m scripts.knowledge_snapshot build      # sync the knowledge files into Qdrant and export a snapshot
+    python -m scripts.knowledge_snapshot export     # export the current collection as-is
+    python -m scripts.knowledge_snapshot restore    # restore the snapshot matching the current hash
+    python -m scripts.knowledge_snapshot hash       # print the current knowledge hash and artifact path
+"""
+import argparse
+import asyncio
+import json
+
+from services.registry import data_integration_service
+
+
+async def main(command: str):
+    if command == "build":
+        result = await data_integration_service.build_snapshot(rebuild=True)
+    elif command == "export":
+        result = await data_integration_service.build_snapshot(rebuild=False)
+    elif command == "restore":
+        result = await data_integration_service.restore_snapshot()
+    else:
+        knowledge_hash = data_integration_service.compute_knowledge_hash()
+        snapshot_path = data_integration_service.get_snapshot_path(knowledge_hash)
+        result = {
+            "knowledge_hash": knowledge_hash,
+            "snapshot_path": str(snapshot_path),
+            "snapshot_exists": snapshot_path.exists()
+        }
+    print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["build", "export", "restore", "hash"])
+    args = parser.parse_args()
+    asyncio.run(main(args.command))
@@ -0,0 +1,130 @@
+"""
+Measure the msgpack knowledge records against the former JSON-in-hash layout.
+
+Every pair of data/syria_knowledge is encoded both ways. The script reports
+payload bytes, per-record encode/decode time (full record, and keywords only
+as used by search ranking) and, when Redis is reachable, the server-side memory of
+both layouts measured with MEMORY USAGE on scratch keys.
+
+Usage:
+    python -m scripts.measure_redis_records              # payload size and decode CPU
+    python -m scripts.measure_redis_records --redis      # also Redis memory (writes and deletes scratch keys)
+"""
+import argparse
+import json
+import time
+
+from services.ai.knowledge_store import knowledge_store
+from services.database.redis_service import decode_record, encode_record, unpack_record
+
+SCRATCH_PREFIX = "syria:bench:records"
+
+
+def legacy_fields(entry):
+    """Hash fields of the previous record layout"""
+    return {
+        "question_variants": json.dumps(list(entry.question_variants), ensure_ascii=False),
+        "answer": entry.answer,
+        "keywords": json.dumps(list(entry.keywords), ensure_ascii=False),
+        "confidence": str(entry.confidence),
+        "source": entry.source,
+        "category": entry.category
+    }
+
+
+def legacy_decode(qa_id, fields):
+    return {
+        "id": qa_id,
+        "question_variants": json.loads(fields["question_variants"] or "[]"),
+        "answer": fields["answer"] or "",
+        "keywords": json.loads(fields["keywords"] or "[]"),
+        "confidence": float(fields["confidence"] or 1.0),
+        "source": fields["source"] or "",
+        "category": fields["category"] or ""
+    }
+
+
+def best_of(function, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def measure_cpu(entries, rounds: int = 5):
+    legacy = [(entry.id, legacy_fields(entry)) for entry in entries]
+    binary = [(entry.id, encode_record(entry)) for entry in entries]
+    timings = {
+        "legacy_decode": best_of(lambda: [legacy_decode(qa_id, fields) for qa_id, fields in legacy], rounds),
+        "msgpack_decode": best_of(lambda: [decode_record(qa_id, blob) for qa_id, blob in binary], rounds),
+        "legacy_keywords": best_of(lambda: [json.loads(fields["keywords"]) for _, fields in legacy], rounds),
+        "msgpack_keywords": best_of(lambda: [unpack_record(blob)[0] for _, blob in binary], rounds),
+        "legacy_encode": best_of(lambda: [legacy_fields(entry) for entry in entries], rounds),
+        "msgpack_encode": best_of(lambda: [encode_record(entry) for entry in entries], rounds)
+    }
+    return {
+        f"{name}_us_per_record": round(seconds / len(entries) * 1e6, 2)
+        for name, seconds in timings.items()
+    }
+
+
+def measure_payload(entries):
+    legacy_bytes = sum(
+        len(name.encode()) + len(value.encode())
+        for entry in entries for name, value in legacy_fields(entry).items()
+    )
+    binary_bytes = sum(len(encode_record(entry)) for entry in entries)
+    return {
+        "legacy_payload_bytes": legacy_bytes,
+        "msgpack_payload_bytes": binary_bytes,
+        "payload_saving": round(1 - binary_bytes / legacy_bytes, 3)
+    }
+
+
+def measure_redis_memory(entries):
+    from services.registry import redis_service
+    if not redis_service.is_connected():
+        return {"error": "Redis not connected"}
+
+    client = redis_service.client
+    pipe = client.pipeline(transaction=False)
+    for entry in entries:
+        pipe.hset(f"{SCRATCH_PREFIX}:legacy:{entry.id}", mapping=legacy_fields(entry))
+        pipe.set(f"{SCRATCH_PREFIX}:msgpack:{entry.id}", encode_record(entry))
+    pipe.execute()
+    try:
+        for layout in ("legacy", "msgpack"):
+            for entry in entries:
+                pipe.memory_usage(f"{SCRATCH_PREFIX}:{layout}:{entry.id}", samples=0)
+        usage = pipe.execute()
+    finally:
+        for layout in ("legacy", "msgpack"):
+            for entry in entries:
+                pipe.delete(f"{SCRATCH_PREFIX}:{layout}:{entry.id}")
+        pipe.execute()
+
+    legacy_memory, binary_memory = sum(usage[:len(entries)]), sum(usage[len(entries):])
+    return {
+        "legacy_redis_bytes": legacy_memory,
+        "msgpack_redis_bytes": binary_memory,
+        "redis_saving": round(1 - binary_memory / legacy_memory, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis", action="store_true", help="Also measure server-side memory with MEMORY USAGE")
+    parser.add_argument("--rounds", type=int, default=5, help="Timing rounds (best of)")
+    args = parser.parse_args()
+
+    entries = knowledge_store.snapshot.entries
+    result = {"records": len(entries), **measure_payload(entries), **measure_cpu(entries, args.rounds)}
+    if args.redis:
+        result["redis_memory"] = measure_redis_memory(entries)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
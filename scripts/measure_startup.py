@@ -0,0 +1,50 @@
+"""
+Measure how long importing the application takes in a fresh interpreter.
+
+Each run imports main in a new process (as a uvicorn/gunicorn worker would)
+and reports the best wall time plus which heavy optional libraries were
+imported eagerly. Services are built lazily by services.registry, so none of
+them should appear until a request or the background initialization uses them.
+
+Usage:
+    python -m scripts.measure_startup --runs 5
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ["qdrant_client", "google.generativeai", "bs4", "aiohttp", "redis"]
+
+PROBE = (
+    "import json, sys, main; "
+    f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    timings, loaded = [], []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True)
+        timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            print(result.stderr[-2000:], file=sys.stderr)
+            sys.exit(result.returncode)
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+
+    print(json.dumps({
+        "runs": args.runs,
+        "best_seconds": round(min(timings), 3),
+        "median_seconds": round(sorted(timings)[len(timings) // 2], 3),
+        "heavy_modules_loaded_at_import": loaded
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
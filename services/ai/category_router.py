@@ -0,0 +1,119 @@
+import math
+import os
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+from config.logging_config import get_logger
+from .knowledge_store import tokenize
+
+logger = get_logger(__name__)
+
+
+class CategoryRouter:
+    """
+    Cheap intent classifier that routes a question to knowledge categories.
+
+    A token -> per-category count table is built from the question variants and
+    keywords of the knowledge store. A question scores every category by its
+    tokens, each weighted down the more categories it appears in (``سوريا`` says
+    nothing, ``الدستور`` says government). Semantic search is then filtered on the
+    ``category`` payload of the routed categories and falls back to the whole
+    collection when the question matches no category clearly or the routed
+    search finds no good answer.
+    """
+
+    def __init__(
+        self,
+        knowledge_store,
+        max_categories: int = 2,
+        min_share: float = 0.25,
+        min_score: float = 1.0,
+        fallback_score: float = 0.85
+    ):
+        self.knowledge_store = knowledge_store
+        self.max_categories = max_categories
+        self.min_share = min_share
+        self.min_score = min_score
+        # Routed results whose best score is below this are retried unfiltered
+        self.fallback_score = fallback_score
+
+        self._lock = threading.Lock()
+        self._token_counts: Dict[str, Counter] = {}
+        self._categories: List[str] = []
+        self.stats = {"routed": 0, "unrouted": 0, "fallbacks": 0}
+
+        self.rebuild()
+        # Keep the table in step with hot-reloaded knowledge files
+        knowledge_store.add_listener(lambda delta: self.rebuild())
+
+    def rebuild(self):
+        token_counts: Dict[str, Counter] = {}
+        for entry in self.knowledge_store.snapshot.entries:
+            text = " ".join([*entry.question_variants, *entry.keywords])
+            for token in set(tokenize(text)):
+                token_counts.setdefault(token, Counter())[entry.category] += 1
+        with self._lock:
+            self._token_counts = token_counts
+            self._categories = list(self.knowledge_store.snapshot.by_category)
+        logger.debug(f"Category router indexed {len(token_counts)} tokens over {len(self._categories)} categories")
+
+    def classify(self, question: str) -> Dict[str, float]:
+        """Category scores of a question"""
+        token_counts, category_count = self._token_counts, len(self._categories)
+        scores: Counter = Counter()
+        for token in set(tokenize(question)):
+            counts = token_counts.get(token)
+            if not counts:
+                continue
+            weight = math.log(1 + category_count / len(counts))
+            total = sum(counts.values())
+            for category, count in counts.items():
+                scores[category] += weight * count / total
+        return dict(scores)
+
+    def route(self, question: str) -> Optional[List[str]]:
+        """Categories to search, or None to search everything"""
+        scores = self.classify(question)
+        total = sum(scores.values())
+        if total < self.min_score:
+            self.stats["unrouted"] += 1
+            return None
+
+        categories = [
+            category for category, score in sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            if score / total >= self.min_share
+        ][:self.max_categories]
+        if not categories or len(categories) >= len(self._categories):
+            self.stats["unrouted"] += 1
+            return None
+
+        self.stats["routed"] += 1
+        return categories
+
+    def needs_fallback(self, results: List[Dict]) -> bool:
+        if not results or results[0].get("similarity_score", 0) < self.fallback_score:
+            self.stats["fallbacks"] += 1
+            return True
+        return False
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "tokens": len(self._token_counts),
+            "categories": list(self._categories),
+            "max_categories": self.max_categories
+        }
+
+
+def create_category_router(knowledge_store) -> Optional[CategoryRouter]:
+    """Build the category router from environment settings (None when disabled)"""
+    if os.getenv("CATEGORY_ROUTING_ENABLED", "false").lower() != "true":
+        return None
+    return CategoryRouter(
+        knowledge_store,
+        max_categories=int(os.getenv("CATEGORY_ROUTING_MAX_CATEGORIES", 2)),
+        min_share=float(os.getenv("CATEGORY_ROUTING_MIN_SHARE", 0.25)),
+        min_score=float(os.getenv("CATEGORY_ROUTING_MIN_SCORE", 1.0)),
+        fallback_score=float(os.getenv("CATEGORY_ROUTING_FALLBACK_SCORE", 0.85))
+    )
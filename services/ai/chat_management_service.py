@@ -2,18 +2,19 @@ import logging
 import time
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta, timezone
+import os
 import uuid
-import json
 
 from services.repositories.chat_repository import ChatRepository
-from services.ai.intelligent_qa_service import intelligent_qa_service
-from services.ai.gemini_service import gemini_service
-from services.ai.embedding_service import embedding_service
+from services.registry import registry, intelligent_qa_service, gemini_service, embedding_service
 from services.database.database import get_db
+from services.database.two_tier_cache import two_tier_cache
 from config.logging_config import get_logger, log_function_entry, log_function_exit, log_performance, log_error_with_context
 
 logger = get_logger(__name__)
 
+CHAT_SETTINGS_TTL_SECONDS = int(os.getenv("CACHE_CHAT_SETTINGS_TTL_SECONDS", 600))
+
 
 class ChatManagementService:
     """Service for managing AI chat operations"""
@@ -21,6 +22,12 @@ class ChatManagementService:
     def __init__(self):
         pass
     
+    async def _get_settings(self, chat_repository: ChatRepository, user_id: str) -> Dict[str, Any]:
+        """User's chat settings (as a dict) through the two-tier cache"""
+        async def load():
+            return chat_repository.get_or_create_chat_settings(user_id).to_dict()
+        return await two_tier_cache.get_or_load("chat_settings", user_id, load, ttl=CHAT_SETTINGS_TTL_SECONDS)
+    
     async def create_chat(self, user_id: str, **kwargs) -> Dict[str, Any]:
         """Create a new chat"""
         start_time = time.time()
@@ -29,14 +36,14 @@ class ChatManagementService:
             chat_repository = ChatRepository(db)
             
             # Get user's default chat settings
-            settings = chat_repository.get_or_create_chat_settings(user_id)
+            settings = await self._get_settings(chat_repository, user_id)
             
             # Merge with provided kwargs
             chat_data = {
-                "language": settings.default_language,
-                "model_preference": settings.default_model,
-                "max_tokens": settings.default_max_tokens,
-                "temperature": settings.default_temperature,
+                "language": settings["default_language"],
+                "model_preference": settings["default_model"],
+                "max_tokens": settings["default_max_tokens"],
+                "temperature": settings["default_temperature"],
                 **kwargs
             }
             
@@ -47,7 +54,7 @@ class ChatManagementService:
                 "message": "Chat created successfully",
                 "data": {
                     "chat": chat.to_dict(),
-                    "settings": settings.to_dict()
+                    "settings": settings
                 }
             }
             
@@ -62,20 +69,25 @@ class ChatManagementService:
             log_function_exit(logger, "create_chat", duration=duration)
             raise
     
-    async def send_message(self, chat_id: str, user_id: str, message: str, **kwargs) -> Dict[str, Any]:
-        """Send a message and get AI response"""
+    async def send_message(
+        self,
+        chat_id: str,
+        user_id: str,
+        message: str,
+        deadline: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Send a message and get AI response (within `deadline`, a time.monotonic() value)"""
         start_time = time.time()
         try:
             db = next(get_db())
             chat_repository = ChatRepository(db)
             
-            # Get chat and settings
+            # Get chat (its generation settings are per chat)
             chat = chat_repository.get_chat_by_id(chat_id, user_id)
             if not chat:
                 raise ValueError("Chat not found")
             
-            settings = chat_repository.get_or_create_chat_settings(user_id)
-            
             # Create user message
             user_message = chat_repository.create_message(
                 chat_id=chat_id,
@@ -85,39 +97,16 @@ class ChatManagementService:
                 **kwargs
             )
             
-            # Get chat context (recent messages)
-            recent_messages = chat_repository.get_chat_messages(chat_id, user_id, limit=10)
-            context_messages = []
-            
-            for msg in recent_messages[-5:]:  # Last 5 messages for context
-                context_messages.append({
-                    "role": "ai" if msg.is_ai_response else "user",
-                    "content": msg.message
-                })
-            
-            # Prepare context for AI
-            context = {
-                "chat_title": chat.title,
-                "chat_description": chat.description,
-                "chat_context": chat.context,
-                "language": chat.language,
-                "model_preference": chat.model_preference,
-                "max_tokens": chat.max_tokens,
-                "temperature": chat.temperature,
-                "recent_messages": context_messages,
-                "user_settings": settings.to_dict()
-            }
-            
-            # Get AI response using intelligent QA service
+            # Get AI response using intelligent QA service, bounded by the chat's generation limits
             ai_response_start = time.time()
             try:
                 ai_response = await intelligent_qa_service.process_question(
                     question=message,
-                    context=json.dumps(context),
-                    language=chat.language,
+                    user_id=user_id,
                     model_preference=chat.model_preference,
                     max_tokens=chat.max_tokens,
-                    temperature=chat.temperature
+                    temperature=chat.temperature,
+                    deadline=deadline
                 )
                 ai_processing_time = int((time.time() - ai_response_start) * 1000)
             except Exception as e:
@@ -328,13 +317,13 @@ class ChatManagementService:
             db = next(get_db())
             chat_repository = ChatRepository(db)
             
-            settings = chat_repository.get_or_create_chat_settings(user_id)
+            settings = await self._get_settings(chat_repository, user_id)
             
             response = {
                 "status": "success",
                 "message": "Chat settings retrieved successfully",
                 "data": {
-                    "settings": settings.to_dict()
+                    "settings": settings
                 }
             }
             
@@ -486,4 +475,4 @@ class ChatManagementService:
 
 
 # Global chat management service instance
-chat_management_service = ChatManagementService()
+chat_management_service = registry.proxy("chat_management_service")
@@ -2,16 +2,31 @@ import json
 import logging
 import time
 import asyncio
+import hashlib
+import uuid
+import dataclasses
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import os
 
-from .qdrant_service import qdrant_service
-from .embedding_service import embedding_service
-from config.logging_config import get_logger
+from services.registry import registry, qdrant_service, embedding_service
+from .knowledge_store import knowledge_store, KnowledgeEntry, KnowledgeDelta
+from services.database.two_tier_cache import two_tier_cache
+from config.logging_config import get_logger, log_function_entry, log_function_exit, log_performance
 
 logger = get_logger(__name__)
 
+# Categories of points other services write into the knowledge collection; never cleared with it
+SHARED_CATEGORIES = ("user_generated", "news")
+# Redis lock serializing knowledge deltas applied to the shared stores by the workers
+RELOAD_LOCK_KEY = "syria:knowledge:reload:lock"
+# Two-tier cache namespace on which reloaded knowledge files are broadcast
+RELOAD_NAMESPACE = "knowledge"
+# Version of the Qdrant point layout; a manifest or snapshot of another layout is rebuilt.
+# 2: one shared point per distinct question variant instead of one per pair and variant
+POINT_LAYOUT = 2
+
 class DataIntegrationService:
     """
     Service for integrating Syria knowledge data from the data folder
@@ -19,15 +34,130 @@ class DataIntegrationService:
     """
     
     def __init__(self):
-        self.data_path = Path(__file__).parent.parent.parent / "data" / "syria_knowledge"
-        self.knowledge_files = [
-            "general.json",
-            "cities.json", 
-            "culture.json",
-            "economy.json",
-            "government.json",
-            "Real_post_liberation_events.json"
-        ]
+        self.knowledge_store = knowledge_store
+        self.snapshot_dir = Path(os.getenv(
+            "QDRANT_SNAPSHOT_DIR",
+            str(Path(__file__).parent.parent.parent / "data" / "snapshots")
+        ))
+        self.restore_snapshot_on_startup = os.getenv("QDRANT_RESTORE_SNAPSHOT", "true").lower() == "true"
+        # Ingestion pipeline sizing: concurrent embedders/upserters, batch sizes and queue bounds
+        self.embed_concurrency = int(os.getenv("KNOWLEDGE_EMBED_CONCURRENCY", 4))
+        self.upsert_concurrency = int(os.getenv("KNOWLEDGE_UPSERT_CONCURRENCY", 2))
+        self.embed_batch_size = int(os.getenv("KNOWLEDGE_EMBED_BATCH_SIZE", 64))
+        self.upsert_batch_size = int(os.getenv("KNOWLEDGE_UPSERT_BATCH_SIZE", 256))
+        self.ingest_queue_size = int(os.getenv("KNOWLEDGE_INGEST_QUEUE_SIZE", 32))
+        # Per-pair content hashes of what is currently stored in Qdrant (drives incremental sync)
+        self.manifest_path = Path(os.getenv(
+            "KNOWLEDGE_MANIFEST_PATH",
+            str(Path(__file__).parent.parent.parent / "data" / "knowledge_manifest.json")
+        ))
+        # Hot reload: optionally poll the knowledge files and apply edits without a restart
+        self.watch_enabled = os.getenv("KNOWLEDGE_WATCH", "false").lower() == "true"
+        self.watch_interval_seconds = float(os.getenv("KNOWLEDGE_WATCH_INTERVAL_SECONDS", 5))
+        self._watch_task: Optional[asyncio.Task] = None
+        self._reload_lock = asyncio.Lock()
+        self.reload_lock_timeout = float(os.getenv("KNOWLEDGE_RELOAD_LOCK_TIMEOUT_SECONDS", 600))
+        # Files reloaded by another worker are re-read here too
+        self._remote_reloads: set = set()
+        two_tier_cache.add_invalidation_listener(RELOAD_NAMESPACE, self._on_remote_reload)
+        
+    def compute_knowledge_hash(self) -> str:
+        """Hash of the knowledge files plus embedding model, identifying a reusable snapshot"""
+        digest = hashlib.sha256()
+        digest.update(f"{embedding_service.model_name}:{embedding_service.output_dim}:{POINT_LAYOUT}".encode("utf-8"))
+        for filename in self.knowledge_store.knowledge_files:
+            file_path = self.knowledge_store.data_path / filename
+            digest.update(filename.encode("utf-8"))
+            if file_path.exists():
+                digest.update(file_path.read_bytes())
+        return digest.hexdigest()
+    
+    def get_snapshot_path(self, knowledge_hash: Optional[str] = None) -> Path:
+        """Snapshot artifact path for the given (or current) knowledge hash"""
+        knowledge_hash = knowledge_hash or self.compute_knowledge_hash()
+        return self.snapshot_dir / f"{qdrant_service.collection_name}-{knowledge_hash[:16]}.snapshot"
+    
+    async def build_snapshot(self, rebuild: bool = True) -> Dict[str, Any]:
+        """
+        Build the knowledge collection from the data files and save it as a snapshot
+        artifact keyed by the knowledge hash.
+        """
+        log_function_entry(logger, "build_snapshot", rebuild=rebuild)
+        start_time = time.time()
+        
+        try:
+            knowledge_hash = self.compute_knowledge_hash()
+            snapshot_path = self.get_snapshot_path(knowledge_hash)
+            
+            await qdrant_service._ensure_collection_exists()
+            load_result = None
+            if rebuild:
+                load_result = await self._load_data_to_qdrant()
+                if load_result.get("status") == "error":
+                    return {"status": "error", "error": load_result.get("message")}
+            
+            if not await qdrant_service.export_snapshot(snapshot_path):
+                return {"status": "error", "error": "Snapshot export failed"}
+            
+            duration = time.time() - start_time
+            log_performance(logger, "Knowledge snapshot build", duration, snapshot=str(snapshot_path))
+            log_function_exit(logger, "build_snapshot", duration=duration)
+            return {
+                "status": "success",
+                "knowledge_hash": knowledge_hash,
+                "snapshot_path": str(snapshot_path),
+                "snapshot_size_bytes": snapshot_path.stat().st_size,
+                "load_result": load_result,
+                "processing_time": duration
+            }
+        except Exception as e:
+            logger.error(f"❌ Knowledge snapshot build failed: {e}")
+            return {"status": "error", "error": str(e)}
+    
+    async def restore_snapshot(self) -> Dict[str, Any]:
+        """Restore the knowledge collection from the snapshot matching the current knowledge hash"""
+        start_time = time.time()
+        if qdrant_service.is_local:
+            return {"status": "skipped", "message": "Snapshots are not available in local Qdrant mode"}
+        
+        knowledge_hash = self.compute_knowledge_hash()
+        snapshot_path = self.get_snapshot_path(knowledge_hash)
+        
+        if not snapshot_path.exists():
+            return {
+                "status": "not_found",
+                "message": f"No snapshot for knowledge hash {knowledge_hash[:16]}",
+                "knowledge_hash": knowledge_hash
+            }
+
+        # A restore replaces the whole collection, which would silently drop the
+        # user_generated and news points sharing it
+        categories = self._knowledge_categories(self.knowledge_store.snapshot)
+        foreign_points = await qdrant_service.count_points_outside_categories(categories)
+        if foreign_points is None:
+            return {"status": "error", "error": "Failed to count the points outside the knowledge categories"}
+        if foreign_points:
+            return {
+                "status": "conflict",
+                "error": f"Collection holds {foreign_points} points outside the knowledge categories, "
+                         "restoring the snapshot would delete them",
+                "foreign_points": foreign_points
+            }
+
+        if not await qdrant_service.import_snapshot(snapshot_path):
+            return {"status": "error", "error": f"Failed to restore snapshot {snapshot_path}"}
+        
+        # The snapshot was built from exactly these files, so the manifest can be derived from them
+        self._save_manifest(*self._build_manifest_entries())
+        
+        duration = time.time() - start_time
+        log_performance(logger, "Knowledge snapshot restore", duration, snapshot=str(snapshot_path))
+        return {
+            "status": "success",
+            "knowledge_hash": knowledge_hash,
+            "snapshot_path": str(snapshot_path),
+            "processing_time": duration
+        }
         
     async def initialize_knowledge_base(self) -> Dict[str, Any]:
         """
@@ -37,6 +167,20 @@ class DataIntegrationService:
         logger.info("🚀 Starting Syria knowledge base initialization...")
         
         try:
+            # On a cold (empty) collection, a snapshot built from the same files and
+            # embedding model skips ingestion entirely
+            collection_stats = await qdrant_service.get_collection_stats()
+            if self.restore_snapshot_on_startup and not collection_stats.get("points_count"):
+                snapshot_result = await self.restore_snapshot()
+                if snapshot_result.get("status") == "success":
+                    logger.info(f"⚡ Knowledge base restored from snapshot in {snapshot_result['processing_time']:.2f}s")
+                    return {
+                        "status": "success",
+                        "snapshot": snapshot_result,
+                        "summary": {"restored_from_snapshot": True}
+                    }
+                logger.info(f"No usable knowledge snapshot ({snapshot_result.get('message') or snapshot_result.get('error')}), ingesting from files")
+            
             # Test embedding service connection first
             logger.info("🔍 Testing Google Generative AI API connection...")
             if not await embedding_service.test_connection():
@@ -73,35 +217,143 @@ class DataIntegrationService:
                 "error": str(e)
             }
     
+    def _load_manifest(self) -> Dict[str, Any]:
+        """
+        Load the ingestion manifest (per-pair content hashes of what is stored in Qdrant).
+        A manifest for another collection/embedding model/point layout, or one that
+        describes an empty collection, is treated as empty so everything is re-ingested.
+        """
+        empty = {"pairs": {}, "variants": {}}
+        if not self.manifest_path.exists():
+            return empty
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable knowledge manifest {self.manifest_path}: {e}")
+            return empty
+        
+        if (manifest.get("collection") != qdrant_service.collection_name or
+                manifest.get("embedding_model") != embedding_service.model_name or
+                manifest.get("layout") != POINT_LAYOUT):
+            logger.info("Knowledge manifest was built for another collection, embedding model or point layout, re-ingesting")
+            return empty
+        manifest.setdefault("variants", {})
+        return manifest
+    
+    def _save_manifest(self, pairs: Dict[str, Dict[str, str]], variants: Dict[str, str]):
+        """Atomically persist the ingestion manifest (pair hashes and shared variant signatures)"""
+        manifest = {
+            "collection": qdrant_service.collection_name,
+            "embedding_model": embedding_service.model_name,
+            "layout": POINT_LAYOUT,
+            "updated_at": time.time(),
+            "pairs": pairs,
+            "variants": variants
+        }
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        # Per-writer temp file: a concurrent writer can't replace our half-written one
+        tmp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        tmp_path.replace(self.manifest_path)
+    
+    def _build_manifest_entries(self) -> tuple[Dict[str, Dict[str, str]], Dict[str, str]]:
+        """Hash every pair and shared variant group in the knowledge store"""
+        entries = self.knowledge_store.reload().entries
+        pairs = {entry.id: {"hash": entry.content_hash, "file": entry.filename} for entry in entries}
+        return pairs, self._diff_variant_groups(entries, {})["signatures"]
+    
+    @staticmethod
+    def _knowledge_categories(snapshot) -> List[str]:
+        return [category for category in snapshot.by_category if category not in SHARED_CATEGORIES]
+    
     async def _load_data_to_qdrant(self) -> Dict[str, Any]:
-        """Load Syria knowledge data into Qdrant vector database"""
-        logger.info("📥 Loading data into Qdrant vector database...")
+        # Serialized with hot reloads, which also rewrite the manifest
+        async with self._reload_lock:
+            return await self._sync_data_to_qdrant()
+    
+    async def _sync_data_to_qdrant(self) -> Dict[str, Any]:
+        """
+        Incrementally sync the knowledge files into Qdrant.
+        
+        Pairs are diffed against the persisted manifest: only added or changed pairs
+        are embedded and upserted, and points of changed or removed pairs are deleted.
+        """
+        logger.info("📥 Syncing knowledge data into Qdrant vector database...")
         
         try:
-            total_loaded = 0
-            total_failed = 0
-            file_stats = {}
+            previous_manifest = self._load_manifest()
+            previous = previous_manifest["pairs"]
+            previous_variants = previous_manifest["variants"]
             
-            for filename in self.knowledge_files:
-                file_path = self.data_path / filename
-                if file_path.exists():
-                    loaded_count, failed_count = await self._load_json_file_to_qdrant(file_path)
-                    total_loaded += loaded_count
-                    total_failed += failed_count
-                    file_stats[filename] = {
-                        "loaded": loaded_count,
-                        "failed": failed_count
-                    }
-                    logger.info(f"📄 Loaded {loaded_count} items from {filename} (Failed: {failed_count})")
-                else:
-                    logger.warning(f"⚠️ File not found: {file_path}")
-                    file_stats[filename] = {"loaded": 0, "failed": 0}
+            # Pick up edits made to the files since the store was last loaded
+            snapshot = self.knowledge_store.reload()
+            
+            # Without a manifest we cannot know which knowledge points exist: drop those of the
+            # knowledge categories and re-ingest (user_generated and news points share the collection)
+            collection_stats = await qdrant_service.get_collection_stats()
+            points_count = collection_stats.get("points_count") or 0
+            if not previous and points_count:
+                logger.info(f"No knowledge manifest for {points_count} existing points, deleting knowledge-file points")
+                if not await qdrant_service.delete_points_by_category(self._knowledge_categories(snapshot)):
+                    return {"status": "error", "message": "Failed to delete knowledge points"}
+            elif previous and not points_count:
+                logger.info("Knowledge manifest exists but the collection is empty, re-ingesting")
+                previous, previous_variants = {}, {}
+            current_pairs: Dict[str, KnowledgeEntry] = dict(snapshot.by_id)
+            
+            added = [qa_id for qa_id in current_pairs if qa_id not in previous]
+            changed = [qa_id for qa_id, entry in current_pairs.items()
+                       if qa_id in previous and previous[qa_id]["hash"] != entry.content_hash]
+            removed = [qa_id for qa_id in previous if qa_id not in current_pairs]
+            unchanged = len(current_pairs) - len(added) - len(changed)
+            logger.info(f"🧮 Knowledge diff: {len(added)} added, {len(changed)} changed, "
+                        f"{len(removed)} removed, {unchanged} unchanged")
+            
+            if not await qdrant_service.delete_qa_points(changed + removed):
+                return {"status": "error", "message": "Failed to delete outdated points"}
+            
+            variant_diff = self._diff_variant_groups(snapshot.entries, previous_variants)
+            if not await self._apply_variant_changes(variant_diff):
+                return {"status": "error", "message": "Failed to update shared variant points"}
+            
+            manifest = {qa_id: entry for qa_id, entry in previous.items()
+                        if qa_id in current_pairs and qa_id not in changed}
+            pending_by_file: Dict[str, List[KnowledgeEntry]] = {}
+            for qa_id in added + changed:
+                entry = current_pairs[qa_id]
+                pending_by_file.setdefault(entry.filename, []).append(entry)
+            
+            pipeline_result = await self._run_ingestion_pipeline(pending_by_file, variant_diff["pending"])
+            for qa_id, filename, pair_hash in pipeline_result["stored"]:
+                manifest[qa_id] = {"hash": pair_hash, "file": filename}
+            variants_manifest = self._variants_manifest(variant_diff, pipeline_result["stored_variants"])
+            # Failed pairs stay out of the manifest so they are retried on the next sync
+            file_stats = {filename: {"loaded": 0, "failed": 0} for filename in self.knowledge_store.knowledge_files}
+            file_stats.update(pipeline_result["file_stats"])
+            total_loaded = sum(stats["loaded"] for stats in file_stats.values())
+            total_failed = sum(stats["failed"] for stats in file_stats.values())
+            
+            self._save_manifest(manifest, variants_manifest)
+            
+            for filename, stats in file_stats.items():
+                logger.info(f"📄 {filename}: {stats['loaded']} upserted (Failed: {stats['failed']})")
             
             return {
                 "status": "success",
                 "total_loaded": total_loaded,
                 "total_failed": total_failed,
-                "file_stats": file_stats
+                "added": len(added),
+                "changed": len(changed),
+                "removed": len(removed),
+                "unchanged": unchanged,
+                "file_stats": file_stats,
+                "variant_points": len(variants_manifest),
+                "variants_embedded": len(pipeline_result["stored_variants"]),
+                "variants_failed": len(variant_diff["pending"]) - len(pipeline_result["stored_variants"]),
+                "embedding_calls": pipeline_result["embedding_calls"],
+                "pipeline_time": pipeline_result["duration"]
             }
             
         except Exception as e:
@@ -111,104 +363,272 @@ class DataIntegrationService:
                 "message": str(e)
             }
     
-    async def _load_json_file_to_qdrant(self, file_path: Path) -> tuple[int, int]:
-        """Load a single JSON file's content into Qdrant"""
-        loaded_count = 0
-        failed_count = 0
+    @staticmethod
+    def _canonical_variant(text: str) -> str:
+        """Canonical form of a question variant; pairs sharing it share one variant point"""
+        return " ".join(text.split())
+    
+    @classmethod
+    def _embedding_texts(cls, entry: KnowledgeEntry) -> tuple[str, Dict[int, str]]:
+        """Text of the main pair embedding plus the canonical variant texts (by index) that get variant points"""
+        question_variants = entry.question_variants
+        combined_text = f"{' '.join(question_variants)} {entry.answer} {' '.join(entry.keywords)}"
+        main_question = cls._canonical_variant(question_variants[0]) if question_variants else ""
+        variant_texts = {}
+        for index, variant in enumerate(question_variants[1:], start=1):
+            text = cls._canonical_variant(variant)
+            if text and text != main_question and text not in variant_texts.values():
+                variant_texts[index] = text
+        return combined_text, variant_texts
+    
+    @staticmethod
+    def _variant_member(entry: KnowledgeEntry) -> Dict[str, Any]:
+        """The part of a pair stored on the shared variant points it appears on"""
+        return {
+            "qa_id": entry.id,
+            "answer": entry.answer,
+            "confidence": entry.confidence,
+            "source": entry.source,
+            "category": entry.category,
+            "keywords": list(entry.keywords)
+        }
+    
+    def _diff_variant_groups(self, entries, previous: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Group the pairs by canonical variant text and diff the groups against the manifest.
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            category = data.get("category", file_path.stem)
-            qa_pairs = data.get("qa_pairs", [])
-            
-            logger.info(f"Processing {len(qa_pairs)} Q&A pairs from {file_path.name}")
-            
-            for qa_pair in qa_pairs:
+        Only texts never stored before need an embedding; a group whose pairs changed
+        just gets its payload rewritten, and texts no pair uses any more are deleted.
+        """
+        groups: Dict[str, List[KnowledgeEntry]] = {}
+        for entry in entries:
+            for text in self._embedding_texts(entry)[1].values():
+                groups.setdefault(text, []).append(entry)
+        signatures = {
+            text: hashlib.sha256("\n".join(
+                f"{entry.id}:{entry.content_hash}" for entry in sorted(members, key=lambda e: e.id)
+            ).encode("utf-8")).hexdigest()
+            for text, members in groups.items()
+        }
+        return {
+            "groups": groups,
+            "signatures": signatures,
+            "pending": {text: members for text, members in groups.items() if text not in previous},
+            "changed": [text for text in groups if text in previous and previous[text] != signatures[text]],
+            "removed": [text for text in previous if text not in groups],
+            "previous": previous
+        }
+    
+    async def _apply_variant_changes(self, variant_diff: Dict[str, Any]) -> bool:
+        """Delete unused variant points and refresh the answers of changed groups"""
+        if variant_diff["removed"] or variant_diff["changed"]:
+            logger.info(f"🔁 Shared variants: {len(variant_diff['pending'])} new, "
+                        f"{len(variant_diff['changed'])} changed, {len(variant_diff['removed'])} removed")
+        if not await qdrant_service.delete_variant_points(variant_diff["removed"]):
+            return False
+        return await qdrant_service.update_variant_payloads({
+            text: [self._variant_member(entry) for entry in variant_diff["groups"][text]]
+            for text in variant_diff["changed"]
+        })
+    
+    @staticmethod
+    def _variants_manifest(variant_diff: Dict[str, Any], stored_variants: List[str]) -> Dict[str, str]:
+        """Signatures of the variant points now stored (failed new texts are retried next sync)"""
+        signatures = variant_diff["signatures"]
+        manifest = {text: signatures[text] for text in variant_diff["previous"] if text in signatures}
+        manifest.update({text: signatures[text] for text in stored_variants})
+        return manifest
+    
+    def _bundled_variant_embedding(self, text: str, members: List[KnowledgeEntry]) -> Optional[List[float]]:
+        """Vector of a variant text precompiled into the knowledge bundle for any pair that uses it"""
+        for entry in members:
+            bundled = self.knowledge_store.get_embeddings(entry, embedding_service.model_name)
+            variant_texts = list(self._embedding_texts(entry)[1].values())
+            if bundled and len(bundled) == len(variant_texts) + 1:
+                return bundled[1 + variant_texts.index(text)]
+        return None
+    
+    async def _run_ingestion_pipeline(
+        self,
+        pending_by_file: Dict[str, List[KnowledgeEntry]],
+        pending_variants: Optional[Dict[str, List[KnowledgeEntry]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Embed and upsert Q&A pairs through a streaming pipeline:
+        file readers -> batch embedders -> batch upserters, connected by bounded queues.
+        
+        Readers for all files run concurrently, embedding batches pack texts from
+        several pairs into one API call, and upserts overlap with embedding, so
+        the build is bounded by embedding API throughput rather than serial latency.
+        Each pair gets its own point; `pending_variants` (canonical variant text ->
+        pairs using it) are embedded once per text into shared variant points.
+        """
+        start_time = time.time()
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=self.ingest_queue_size)
+        upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=self.ingest_queue_size)
+        stored: List[tuple] = []
+        stored_variants: List[str] = []
+        file_stats = {filename: {"loaded": 0, "failed": 0} for filename in pending_by_file}
+        counters = {"embedding_calls": 0}
+        
+        def mark_failed(job: Dict[str, Any]):
+            if "variant" not in job:
+                file_stats[job["filename"]]["failed"] += 1
+        
+        async def read_file(filename: str, items: List[KnowledgeEntry]):
+            for entry in items:
+                combined_text, _ = self._embedding_texts(entry)
+                job = {"entry": entry, "filename": filename, "texts": [combined_text]}
+                if not combined_text.strip():
+                    logger.warning(f"Skipping Q&A pair {entry.id} with empty text content")
+                    mark_failed(job)
+                    continue
+                # Embeddings precompiled into the knowledge bundle skip the embedding API
+                bundled = self.knowledge_store.get_embeddings(entry, embedding_service.model_name)
+                if bundled:
+                    job["embeddings"] = bundled[:1]
+                    await upsert_queue.put(job)
+                    continue
+                await embed_queue.put(job)
+        
+        async def read_variants():
+            for text, members in (pending_variants or {}).items():
+                job = {"variant": text, "members": members, "texts": [text]}
+                bundled = self._bundled_variant_embedding(text, members)
+                if bundled:
+                    job["embeddings"] = [bundled]
+                    await upsert_queue.put(job)
+                    continue
+                await embed_queue.put(job)
+        
+        async def next_batch(queue: asyncio.Queue, size_of, limit: int) -> tuple[List[Any], bool]:
+            """Wait for one item, then drain without waiting up to `limit` (by size_of)"""
+            item = await queue.get()
+            if item is None:
+                return [], True
+            batch, total = [item], size_of(item)
+            while total < limit:
                 try:
-                    # Prepare data for Qdrant
-                    qa_id = qa_pair.get("id")
-                    if not qa_id:
-                        logger.warning(f"Skipping Q&A pair without ID in {file_path.name}")
-                        failed_count += 1
-                        continue
-                    
-                    # Create text for embedding
-                    question_text = " ".join(qa_pair.get("question_variants", []))
-                    answer_text = qa_pair.get("answer", "")
-                    keywords_text = " ".join(qa_pair.get("keywords", []))
-                    
-                    # Combine all text for embedding
-                    combined_text = f"{question_text} {answer_text} {keywords_text}"
-                    
-                    # Skip if text is too short or empty
-                    if not combined_text.strip():
-                        logger.warning(f"Skipping Q&A pair {qa_id} with empty text content")
-                        failed_count += 1
-                        continue
-                    
-                    # Generate embedding with retry logic
-                    embedding = await self._generate_embedding_with_retry(combined_text, qa_id)
-                    
-                    if embedding:
-                        # Store in Qdrant
-                        await qdrant_service.add_qa_pair(
-                            qa_id=qa_id,
-                            question_variants=qa_pair.get("question_variants", []),
-                            answer=answer_text,
-                            keywords=qa_pair.get("keywords", []),
-                            confidence=qa_pair.get("confidence", 1.0),
-                            source=qa_pair.get("source", ""),
-                            category=category,
-                            embedding=embedding
-                        )
-                        loaded_count += 1
-                        logger.debug(f"✅ Successfully loaded Q&A pair {qa_id}")
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    return batch, True
+                batch.append(item)
+                total += size_of(item)
+            return batch, False
+        
+        async def embed_worker():
+            while True:
+                jobs, finished = await next_batch(embed_queue, lambda job: len(job["texts"]), self.embed_batch_size)
+                if jobs:
+                    texts = [text for job in jobs for text in job["texts"]]
+                    counters["embedding_calls"] += 1
+                    embeddings = await self._generate_embeddings_with_retry(texts, f"{len(jobs)} pairs")
+                    if embeddings is None:
+                        for job in jobs:
+                            mark_failed(job)
                     else:
-                        logger.warning(f"Failed to generate embedding for Q&A pair {qa_id}")
-                        failed_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing Q&A pair {qa_pair.get('id', 'unknown')}: {e}")
-                    failed_count += 1
-                    continue
-            
-            logger.info(f"📊 File {file_path.name} processing complete: {loaded_count} loaded, {failed_count} failed")
-            return loaded_count, failed_count
-            
-        except Exception as e:
-            logger.error(f"Error loading file {file_path}: {e}")
-            return 0, 0
+                        offset = 0
+                        for job in jobs:
+                            job["embeddings"] = embeddings[offset:offset + len(job["texts"])]
+                            offset += len(job["texts"])
+                            await upsert_queue.put(job)
+                if finished:
+                    return
+        
+        async def upsert_worker():
+            while True:
+                jobs, finished = await next_batch(upsert_queue, lambda job: len(job["texts"]), self.upsert_batch_size)
+                if jobs:
+                    points = []
+                    for job in jobs:
+                        if "variant" in job:
+                            points.append(qdrant_service.build_variant_point(
+                                job["variant"],
+                                [self._variant_member(entry) for entry in job["members"]],
+                                job["embeddings"][0]
+                            ))
+                            continue
+                        entry = job["entry"]
+                        points.extend(qdrant_service.build_qa_points(
+                            qa_id=entry.id,
+                            question_variants=list(entry.question_variants),
+                            answer=entry.answer,
+                            keywords=list(entry.keywords),
+                            confidence=entry.confidence,
+                            source=entry.source,
+                            category=entry.category,
+                            embedding=job["embeddings"][0]
+                        ))
+                    if await qdrant_service.upsert_points(points):
+                        for job in jobs:
+                            if "variant" in job:
+                                stored_variants.append(job["variant"])
+                                continue
+                            file_stats[job["filename"]]["loaded"] += 1
+                            stored.append((job["entry"].id, job["filename"], job["entry"].content_hash))
+                    else:
+                        for job in jobs:
+                            mark_failed(job)
+                if finished:
+                    return
+        
+        embedders = [asyncio.create_task(embed_worker()) for _ in range(self.embed_concurrency)]
+        # The embedded local client is not safe for concurrent writes
+        upsert_concurrency = 1 if qdrant_service.is_local else self.upsert_concurrency
+        upserters = [asyncio.create_task(upsert_worker()) for _ in range(upsert_concurrency)]
+        try:
+            await asyncio.gather(
+                read_variants(),
+                *(read_file(filename, items) for filename, items in pending_by_file.items())
+            )
+            for _ in embedders:
+                await embed_queue.put(None)
+            await asyncio.gather(*embedders)
+            for _ in upserters:
+                await upsert_queue.put(None)
+            await asyncio.gather(*upserters)
+        finally:
+            for task in embedders + upserters:
+                task.cancel()
+        
+        duration = time.time() - start_time
+        if stored or stored_variants or any(stats["failed"] for stats in file_stats.values()):
+            log_performance(logger, "Knowledge ingestion pipeline", duration, pairs=len(stored),
+                            variants=len(stored_variants), embedding_calls=counters["embedding_calls"])
+        return {
+            "stored": stored,
+            "stored_variants": stored_variants,
+            "file_stats": file_stats,
+            "embedding_calls": counters["embedding_calls"],
+            "duration": duration
+        }
     
-    async def _generate_embedding_with_retry(self, text: str, qa_id: str, max_retries: int = 3) -> Optional[List[float]]:
+    async def _generate_embeddings_with_retry(self, texts: List[str], label: str, max_retries: int = 3) -> Optional[List[List[float]]]:
         """
-        Generate embedding with retry logic and detailed error logging
+        Generate a batch of embeddings with retry logic and detailed error logging
         """
         for attempt in range(max_retries):
             try:
-                logger.debug(f"Generating embedding for Q&A pair {qa_id} (attempt {attempt + 1}/{max_retries})")
+                logger.debug(f"Generating {len(texts)} embeddings for {label} (attempt {attempt + 1}/{max_retries})")
                 
-                embedding = await embedding_service.generate_embedding(text)
+                embeddings = await embedding_service.generate_embeddings(texts)
                 
-                if embedding:
-                    logger.debug(f"✅ Successfully generated embedding for Q&A pair {qa_id}")
-                    return embedding
-                else:
-                    logger.warning(f"Embedding generation returned None for Q&A pair {qa_id} (attempt {attempt + 1})")
+                if embeddings:
+                    return embeddings
+                logger.warning(f"Batch embedding returned nothing for {label} (attempt {attempt + 1})")
                     
             except Exception as e:
-                logger.warning(f"Embedding generation attempt {attempt + 1} failed for Q&A pair {qa_id}: {e}")
-                
-                if attempt < max_retries - 1:
-                    # Wait before retrying with exponential backoff
-                    wait_time = 2 ** attempt
-                    logger.info(f"Retrying embedding generation for {qa_id} in {wait_time} seconds...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(f"All {max_retries} attempts failed for Q&A pair {qa_id}. Final error: {e}")
+                logger.warning(f"Embedding attempt {attempt + 1} failed for {label}: {e}")
+            
+            if attempt < max_retries - 1:
+                # Wait before retrying with exponential backoff
+                wait_time = 2 ** attempt
+                logger.info(f"Retrying embedding generation for {label} in {wait_time} seconds...")
+                await asyncio.sleep(wait_time)
         
-        logger.error(f"Failed to generate embedding for Q&A pair {qa_id} after {max_retries} attempts")
+        logger.error(f"Failed to generate embeddings for {label} after {max_retries} attempts")
         return None
     
     def _generate_summary(self, qdrant_result: Dict[str, Any]) -> Dict[str, Any]:
@@ -221,17 +641,189 @@ class DataIntegrationService:
             "total_failed": qdrant_failed,
             "success_rate": f"{(qdrant_total / (qdrant_total + qdrant_failed) * 100):.1f}%" if (qdrant_total + qdrant_failed) > 0 else "0%",
             "qdrant_loaded": qdrant_total,
+            "added": qdrant_result.get("added", 0),
+            "changed": qdrant_result.get("changed", 0),
+            "removed": qdrant_result.get("removed", 0),
+            "unchanged": qdrant_result.get("unchanged", 0),
             "qdrant_status": qdrant_result.get("status", "unknown"),
-            "files_processed": len(self.knowledge_files)
+            "files_processed": len(self.knowledge_store.knowledge_files)
         }
     
+    @property
+    def _shared_stores(self) -> bool:
+        """Whether the Qdrant collection is shared by the workers (not embedded per process)"""
+        return not qdrant_service.is_local
+    
+    @asynccontextmanager
+    async def _store_lock(self):
+        """Cluster-wide lock around applying deltas to the shared Qdrant collection, manifest and Redis"""
+        from services.registry import redis_service
+        if not self._shared_stores or not await redis_service.is_connected_async():
+            yield
+            return
+        lock = redis_service.async_client.lock(
+            RELOAD_LOCK_KEY, timeout=self.reload_lock_timeout, blocking_timeout=self.reload_lock_timeout
+        )
+        if not await lock.acquire():
+            raise TimeoutError("Timed out waiting for the knowledge reload lock")
+        try:
+            yield
+        finally:
+            try:
+                await lock.release()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to release knowledge reload lock: {e}")
+    
+    async def reload_knowledge(self, filename: Optional[str] = None, broadcast: bool = True) -> Dict[str, Any]:
+        """
+        Hot-reload knowledge files without a restart.
+        
+        Only the given file (or every file changed on disk) is re-parsed; the
+        knowledge store swaps its snapshot atomically and the delta is pushed
+        to Qdrant and Redis by one worker at a time (the part another worker
+        already applied is skipped). The reloaded files are then broadcast so
+        every worker refreshes its in-memory snapshot and caches.
+        """
+        log_function_entry(logger, "reload_knowledge", filename=filename)
+        start_time = time.time()
+        
+        async with self._reload_lock:
+            try:
+                if filename and filename not in self.knowledge_store.knowledge_files:
+                    return {"status": "not_found", "error": f"Unknown knowledge file: {filename}"}
+                filenames = [filename] if filename else self.knowledge_store.changed_files()
+                
+                files = {}
+                if filenames:
+                    async with self._store_lock():
+                        for name in filenames:
+                            delta = self.knowledge_store.reload_file(name)
+                            files[name] = await self._apply_knowledge_delta(delta)
+                    if broadcast:
+                        for name in filenames:
+                            await two_tier_cache.invalidate(RELOAD_NAMESPACE, name)
+                
+                duration = time.time() - start_time
+                if filenames:
+                    log_performance(logger, "Knowledge hot reload", duration, files=filenames)
+                log_function_exit(logger, "reload_knowledge", duration=duration)
+                return {
+                    "status": "success" if all(r["status"] == "success" for r in files.values()) else "partial",
+                    "files": files,
+                    "processing_time": duration
+                }
+            except Exception as e:
+                logger.error(f"❌ Knowledge reload failed: {e}")
+                return {"status": "error", "error": str(e)}
+    
+    def _on_remote_reload(self, filename: Optional[str]):
+        """Another worker reloaded `filename`: refresh this worker's snapshot too"""
+        task = asyncio.create_task(self.reload_knowledge(filename, broadcast=False))
+        self._remote_reloads.add(task)
+        task.add_done_callback(self._remote_reloads.discard)
+    
+    @staticmethod
+    def _unapplied_delta(delta: KnowledgeDelta, manifest: Dict[str, Dict[str, str]]) -> KnowledgeDelta:
+        """The part of `delta` the shared stores don't hold yet (another worker may have applied it)"""
+        changed = [(entry, previous) for entry, previous in zip(delta.changed, delta.previous)
+                   if manifest.get(entry.id, {}).get("hash") != entry.content_hash]
+        return dataclasses.replace(
+            delta,
+            added=tuple(entry for entry in delta.added if manifest.get(entry.id, {}).get("hash") != entry.content_hash),
+            changed=tuple(entry for entry, _ in changed),
+            previous=tuple(previous for _, previous in changed),
+            removed=tuple(entry for entry in delta.removed if entry.id in manifest)
+        )
+    
+    async def _apply_knowledge_delta(self, delta: KnowledgeDelta) -> Dict[str, Any]:
+        """Push one reloaded file's delta to Qdrant (and the manifest) and Redis"""
+        result = {
+            "status": "success",
+            "added": len(delta.added),
+            "changed": len(delta.changed),
+            "removed": len(delta.removed)
+        }
+        if delta.is_empty:
+            return result
+        
+        previous_manifest = self._load_manifest()
+        manifest = previous_manifest["pairs"]
+        if self._shared_stores:
+            delta = self._unapplied_delta(delta, manifest)
+            if delta.is_empty:
+                result["already_applied"] = True
+                return result
+        stale_ids = [entry.id for entry in delta.changed + delta.removed]
+        if not await qdrant_service.delete_qa_points(stale_ids):
+            return {**result, "status": "error", "error": "Failed to delete outdated points"}
+        for qa_id in stale_ids:
+            manifest.pop(qa_id, None)
+        
+        # The store already holds the reloaded file, so this regroups the whole corpus
+        variant_diff = self._diff_variant_groups(self.knowledge_store.snapshot.entries, previous_manifest["variants"])
+        if not await self._apply_variant_changes(variant_diff):
+            return {**result, "status": "error", "error": "Failed to update shared variant points"}
+        
+        pipeline_result = await self._run_ingestion_pipeline(
+            {delta.filename: list(delta.added + delta.changed)}, variant_diff["pending"]
+        )
+        for qa_id, filename, pair_hash in pipeline_result["stored"]:
+            manifest[qa_id] = {"hash": pair_hash, "file": filename}
+        self._save_manifest(manifest, self._variants_manifest(variant_diff, pipeline_result["stored_variants"]))
+        
+        failed = pipeline_result["file_stats"].get(delta.filename, {}).get("failed", 0)
+        if failed:
+            # Left out of the manifest, so the next full sync retries them
+            result.update(status="partial", failed=failed)
+        
+        try:
+            from services.registry import redis_service
+            result["redis_updated"] = await asyncio.to_thread(redis_service.apply_knowledge_delta, delta)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not push knowledge delta to Redis: {e}")
+            result["redis_updated"] = False
+        return result
+    
+    async def _watch_loop(self):
+        """Poll the knowledge files and hot-reload the ones that changed"""
+        while True:
+            await asyncio.sleep(self.watch_interval_seconds)
+            try:
+                if self.knowledge_store.changed_files():
+                    result = await self.reload_knowledge()
+                    if result.get("status") != "success":
+                        logger.warning(f"⚠️ Knowledge hot reload finished with status {result.get('status')}")
+            except Exception as e:
+                logger.warning(f"⚠️ Knowledge watcher iteration failed: {e}")
+    
+    def start_knowledge_watcher(self):
+        """Start watching the knowledge files when KNOWLEDGE_WATCH is enabled (idempotent)"""
+        if not self.watch_enabled or (self._watch_task and not self._watch_task.done()):
+            return
+        self._watch_task = asyncio.create_task(self._watch_loop())
+        logger.info(f"👀 Watching knowledge files every {self.watch_interval_seconds}s in {self.knowledge_store.data_path}")
+    
+    async def stop_knowledge_watcher(self):
+        """Cancel the knowledge file watcher"""
+        if self._watch_task and not self._watch_task.done():
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+        self._watch_task = None
+    
     async def clear_knowledge_base(self) -> Dict[str, Any]:
-        """Clear existing data from Qdrant"""
+        """Clear the knowledge-file points from Qdrant (user Q&A and news points are kept)"""
         logger.info("🧹 Clearing knowledge base data...")
         
         try:
-            # Clear Qdrant data
-            await qdrant_service.clear_collection()
+            # Clear Qdrant data of the knowledge categories only
+            categories = self._knowledge_categories(self.knowledge_store.snapshot)
+            if not await qdrant_service.delete_points_by_category(categories):
+                return {"status": "error", "message": "Failed to delete knowledge points"}
+            if self.manifest_path.exists():
+                self.manifest_path.unlink()
             
             logger.info("✅ Knowledge base cleared successfully")
             return {
@@ -253,8 +845,8 @@ class DataIntegrationService:
             
             return {
                 "qdrant": qdrant_stats,
-                "files_available": len(self.knowledge_files),
-                "data_path": str(self.data_path)
+                "files_available": len(self.knowledge_store.knowledge_files),
+                "data_path": str(self.knowledge_store.data_path)
             }
             
         except Exception as e:
@@ -265,8 +857,8 @@ class DataIntegrationService:
             }
 
 # Global data integration service instance
-data_integration_service = DataIntegrationService()
+data_integration_service = registry.proxy("data_integration_service")
 
 def get_data_integration_service():
     """Get the global data integration service instance"""
-    return data_integration_service
+    return registry.get("data_integration_service")
@@ -0,0 +1,18 @@
+import os
+import time
+from typing import Optional
+
+# مهلة الطلب الكاملة التي تضعها طبقة الـ API (ثوانٍ)
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("QA_REQUEST_TIMEOUT_SECONDS", 20))
+
+
+def request_deadline(timeout: Optional[float] = None) -> float:
+    """Absolute deadline (time.monotonic() clock) of a request starting now"""
+    return time.monotonic() + (timeout if timeout is not None else REQUEST_TIMEOUT_SECONDS)
+
+
+def time_left(deadline: Optional[float]) -> Optional[float]:
+    """Seconds until `deadline`, None when the request has no deadline"""
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
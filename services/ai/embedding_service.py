@@ -6,6 +6,7 @@ from typing import List, Optional
 from dotenv import load_dotenv
 import google.generativeai as genai
 from config.logging_config import get_logger
+from services.registry import registry
 
 # تحميل ملف .env
 load_dotenv()
@@ -50,7 +51,9 @@ class EmbeddingService:
             if not self.initialized:
                 await self.initialize()
 
-            result = genai.embed_content(
+            # The SDK call is blocking; keep it off the event loop
+            result = await asyncio.to_thread(
+                genai.embed_content,
                 model=self.model_name,
                 content=text,
                 task_type="retrieval_document"
@@ -62,6 +65,30 @@ class EmbeddingService:
             logger.error(f"Error generating embedding: {e}")
             return None
 
+    async def generate_embeddings(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Generate embeddings for several texts in a single API call (order preserved)."""
+        if not texts:
+            return []
+        try:
+            if not self.initialized:
+                await self.initialize()
+
+            result = await asyncio.to_thread(
+                genai.embed_content,
+                model=self.model_name,
+                content=texts,
+                task_type="retrieval_document"
+            )
+            embeddings = result['embedding']
+            if len(embeddings) != len(texts):
+                logger.error(f"Batch embedding returned {len(embeddings)} vectors for {len(texts)} texts")
+                return None
+            logger.debug(f"Generated {len(embeddings)} embeddings in one batch")
+            return embeddings
+        except Exception as e:
+            logger.error(f"Error generating batch embeddings: {e}")
+            return None
+
 
     def is_available(self) -> bool:
         return getattr(self, "model_available", False)
@@ -73,4 +100,4 @@ class EmbeddingService:
 
 
 # Singleton
-embedding_service = EmbeddingService()
\ No newline at end of file
+embedding_service = registry.proxy("embedding_service")
\ No newline at end of file
@@ -1,10 +1,17 @@
 import os
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+import time
+from datetime import timedelta
+from typing import Optional, Dict, Any, List, Tuple
 import asyncio
 import google.generativeai as genai
 import ast
 from config.logging_config import get_logger
+from services.registry import registry
+from .prompts import ANSWER_PROMPT, VARIANTS_PROMPT, SYSTEM_INSTRUCTIONS
+from .model_router import ModelRoute, create_model_router
+from .deadlines import time_left
 
 from dotenv import load_dotenv
 
@@ -21,6 +28,27 @@ class GeminiService:
         self.api_key = os.getenv("GOOGLE_API_KEY")
         self.model_name = "gemini-2.5-flash"
         self.max_tokens = 2000
+        # Models are built once per (task, model) with the task's system instruction
+        self._models: Dict[Tuple[str, str], Any] = {}
+        self._models_lock = threading.Lock()
+        # Gemini context caching of the system instructions; off by default since the current
+        # instructions are below the models' minimum cacheable size
+        self.context_cache_enabled = os.getenv("GEMINI_CONTEXT_CACHE_ENABLED", "false").lower() == "true"
+        self.context_cache_ttl = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL_SECONDS", 3600))
+        self._context_caches: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._context_cache_retry_at: Dict[Tuple[str, str], float] = {}
+        self._context_cache_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self.usage: Dict[str, Dict[str, int]] = {}
+        # اختيار النموذج حسب نوع المهمة وتعقيد السؤال (self.model_name هو النموذج القياسي)
+        self.router = create_model_router(self.model_name)
+        # حد أقصى لكل استدعاء ليس له مهلة طلب (أخبار، نسخ الأسئلة)
+        self.call_timeout = float(os.getenv("GEMINI_CALL_TIMEOUT_SECONDS", 60))
+        # Hedged requests: a duplicate call once the first one is slower than the route's p95
+        self.hedging_enabled = os.getenv("GEMINI_HEDGING_ENABLED", "true").lower() == "true"
+        self.hedge_percentile = float(os.getenv("GEMINI_HEDGE_PERCENTILE", 95))
+        self.hedge_min_samples = int(os.getenv("GEMINI_HEDGE_MIN_SAMPLES", 20))
+        self.hedge_max_ratio = float(os.getenv("GEMINI_HEDGE_MAX_RATIO", 0.1))
+        self.hedge_stats = {"eligible": 0, "hedged": 0, "hedge_wins": 0, "deadline_exceeded": 0}
 
         if not self.api_key:
             logger.warning("GOOGLE_API_KEY not found - using mock mode")
@@ -33,6 +61,194 @@ class GeminiService:
     def is_connected(self) -> bool:
         return self.model_available
 
+    def _cached_content_model(self, task: str, model_name: str):
+        """Model bound to a Gemini context cache holding the task's system instruction, or None"""
+        key = (task, model_name)
+        now = time.time()
+        cached = self._context_caches.get(key)
+        # Renew a little before the server-side expiry
+        if cached and cached[1] - 60 > now:
+            return cached[0]
+        if self._context_cache_retry_at.get(key, 0) > now:
+            return None
+        with self._models_lock:
+            lock = self._context_cache_locks.setdefault(key, threading.Lock())
+        # One thread creates the cache (a blocking API call); concurrent callers don't wait for it
+        if not lock.acquire(blocking=False):
+            return cached[0] if cached and cached[1] > now else None
+        try:
+            return self._create_context_cache(task, model_name, key)
+        finally:
+            lock.release()
+
+    def _create_context_cache(self, task: str, model_name: str, key: Tuple[str, str]):
+        now = time.time()
+        cached = self._context_caches.get(key)
+        if cached and cached[1] - 60 > now:
+            return cached[0]
+        if self._context_cache_retry_at.get(key, 0) > now:
+            return None
+        try:
+            from google.generativeai import caching
+            content = caching.CachedContent.create(
+                model=model_name if model_name.startswith("models/") else f"models/{model_name}",
+                display_name=f"syriagpt-{task}",
+                system_instruction=SYSTEM_INSTRUCTIONS[task],
+                ttl=timedelta(seconds=self.context_cache_ttl)
+            )
+            model = genai.GenerativeModel.from_cached_content(cached_content=content)
+            self._context_caches[key] = (model, now + self.context_cache_ttl)
+            logger.info(f"🗄️ [GEMINI_SERVICE] context cache created for {task} on {model_name}")
+            return model
+        except Exception as e:
+            # e.g. the instruction is below the model's minimum cacheable size; don't retry every call
+            self._context_cache_retry_at[key] = now + self.context_cache_ttl
+            logger.info(f"Gemini context caching unavailable for {task} on {model_name}, using system_instruction: {e}")
+            return None
+
+    def _get_model(self, task: Optional[str] = None, model_name: Optional[str] = None):
+        """
+        Reusable model for a task: served from a context cache where available,
+        otherwise carrying the task's system instruction. Built once per process.
+        """
+        model_name = model_name or self.model_name
+        if task in SYSTEM_INSTRUCTIONS and self.context_cache_enabled:
+            model = self._cached_content_model(task, model_name)
+            if model is not None:
+                return model
+        with self._models_lock:
+            key = (task or "default", model_name)
+            model = self._models.get(key)
+            if model is None:
+                model = genai.GenerativeModel(model_name, system_instruction=SYSTEM_INSTRUCTIONS.get(task))
+                self._models[key] = model
+            return model
+
+    def _record_usage(self, task: str, response):
+        """Input/cached/output token counters per task"""
+        metadata = getattr(response, "usage_metadata", None)
+        if metadata is None:
+            return
+        usage = self.usage.setdefault(task, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "output_tokens": 0})
+        usage["calls"] += 1
+        usage["prompt_tokens"] += getattr(metadata, "prompt_token_count", 0) or 0
+        usage["cached_tokens"] += getattr(metadata, "cached_content_token_count", 0) or 0
+        usage["output_tokens"] += getattr(metadata, "candidates_token_count", 0) or 0
+
+    def _generation_config(self, max_tokens: Optional[int] = None, temperature: Optional[float] = None):
+        """GenerationConfig for one call; the output cap defaults to the service-wide max_tokens"""
+        config = {"max_output_tokens": max_tokens or self.max_tokens}
+        if temperature is not None:
+            config["temperature"] = temperature
+        return genai.GenerationConfig(**config)
+
+    @staticmethod
+    def _finish_reason(response) -> Optional[str]:
+        candidates = getattr(response, "candidates", None)
+        if not candidates:
+            return None
+        reason = getattr(candidates[0], "finish_reason", None)
+        return getattr(reason, "name", None) or (str(reason) if reason is not None else None)
+
+    async def _call(self, task: str, route: ModelRoute, prompt: str, generation_config, timeout: float):
+        """One asynchronous generate_content RPC, cancelled server-side after `timeout` seconds"""
+        # Building the model may create a context cache (a blocking API call)
+        model = await asyncio.to_thread(self._get_model, task, route.model)
+        return await model.generate_content_async(
+            prompt,
+            generation_config=generation_config,
+            request_options={"timeout": timeout}
+        )
+
+    def _hedge_delay(self, route: ModelRoute) -> Optional[float]:
+        """Seconds after which a call of `route` is hedged, None when it shouldn't be"""
+        if not self.hedging_enabled:
+            return None
+        self.hedge_stats["eligible"] += 1
+        if self.hedge_stats["hedged"] >= self.hedge_max_ratio * self.hedge_stats["eligible"]:
+            return None
+        return self.router.latency_percentile(route.name, self.hedge_percentile, min_samples=self.hedge_min_samples)
+
+    async def _generate(
+        self,
+        task: str,
+        route: ModelRoute,
+        prompt: str,
+        generation_config=None,
+        deadline: Optional[float] = None,
+        hedge: bool = False
+    ):
+        """
+        Run one generate_content call of `task` on the routed model, accounting latency and cost.
+
+        The call is bounded by `deadline` (time.monotonic()) or `call_timeout`, and
+        raises asyncio.TimeoutError past it. With `hedge`, a duplicate request is
+        sent when the first one outlives the route's latency percentile, and the
+        first successful response wins.
+        """
+        start_time = time.monotonic()
+        timeout = min(self.call_timeout, time_left(deadline)) if deadline is not None else self.call_timeout
+        if timeout <= 0:
+            self.hedge_stats["deadline_exceeded"] += 1
+            raise asyncio.TimeoutError(f"deadline already passed before the {task} call")
+        end_time = start_time + timeout
+
+        hedge_delay = self._hedge_delay(route) if hedge else None
+        primary = asyncio.ensure_future(self._call(task, route, prompt, generation_config, timeout))
+        pending = {primary}
+        try:
+            if hedge_delay is not None and hedge_delay < timeout:
+                done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+                if not done:
+                    self.hedge_stats["hedged"] += 1
+                    pending.add(asyncio.ensure_future(
+                        self._call(task, route, prompt, generation_config, end_time - time.monotonic())
+                    ))
+                    logger.info(f"⏱️ [GEMINI_SERVICE] {route.name} slower than p{self.hedge_percentile:g} ({hedge_delay:.2f}s), hedging")
+                else:
+                    pending = done
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, end_time - time.monotonic()), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self.hedge_stats["deadline_exceeded"] += 1
+                    raise asyncio.TimeoutError(f"{task} call exceeded its {timeout:.1f}s budget")
+                for finished in done:
+                    if finished.exception() is None:
+                        response = finished.result()
+                        if finished is not primary:
+                            self.hedge_stats["hedge_wins"] += 1
+                        self.router.record(route, time.monotonic() - start_time, response)
+                        self._record_usage(task, response)
+                        return response
+                    error = finished.exception()
+            raise error
+        except BaseException:
+            self.router.record(route, time.monotonic() - start_time, error=True)
+            raise
+        finally:
+            # The losing or timed-out RPCs are cancelled rather than left running
+            for task_future in pending:
+                task_future.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "model_name": self.model_name,
+            "context_cache_enabled": self.context_cache_enabled,
+            "context_caches": [f"{task}:{model_name}" for task, model_name in self._context_caches],
+            "usage": self.usage,
+            "routing": self.router.get_stats(),
+            "hedging": {
+                "enabled": self.hedging_enabled,
+                "percentile": self.hedge_percentile,
+                "max_ratio": self.hedge_max_ratio,
+                **self.hedge_stats
+            }
+        }
+
     def is_available(self) -> bool:
         """Check if the Gemini service is available"""
         return self.model_available
@@ -60,87 +276,74 @@ class GeminiService:
             logger.error(f"❌ Google Gemini API connection test failed: {e}")
             return False
 
-    async def answer_question(self, question: str) -> Optional[Dict[str, Any]]:
-        """Generate an answer for a given question"""
+    async def answer_question(
+        self,
+        question: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        model_preference: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Generate an answer for a given question.
+
+        `max_tokens` caps the output (and so the latency and cost of the call);
+        `temperature` defaults to the model's own when not given. The model is
+        picked by the router from the question's complexity and the chat's
+        `model_preference`. Past `deadline` (time.monotonic()) the call is
+        abandoned and None is returned; slow calls are hedged.
+        """
         logger.info(f"🔍 [GEMINI_SERVICE] معالجة السؤال: {question[:50]}...")
         if not self.model_available:
             logger.warning("❌ [GEMINI_SERVICE] النموذج غير متاح، إرجاع رد وهمي")
             return {"answer": f"[MOCK ANSWER] {question}", "model_used": "mock"}
 
 
-        context = f"""
-                    أنت مساعد ذكي متخصص في المعلومات السورية. استخدم المعلومات التالية كمرجع:
-                    
-                    - سوريا جمهورية ديمقراطية حديثة
-                    - العاصمة: دمشق
-                    - اللغة الرسمية: العربية
-                    - العملة: الليرة السورية
-                    - عدد المحافظات: 14 محافظة
-                    - النظام السياسي: جمهوري ديمقراطي
-                    - الدستور: دستور الجمهورية العربية السورية (2012)
-                    - البرلمان: مجلس الشعب (250 عضو)
-                    - الرئيس الحالي: أحمد الشرع (بعد تحرير سوريا)
-                    - الحزب الحاكم: منتخب ديمقراطياً
-                    """
-
-        prompt = f"""أنت SyriaGPT، مساعد ذكي متخصص في المعلومات السورية تم تدريبه من قبل وكالة نظم المعلومات السورية. أجب على السؤال التالي بدقة ووضوح:
-
-                    معلومات مهمة:
-                    - إذا سُئلت عن هويتك، قل أنك SyriaGPT من وكالة نظم المعلومات السورية
-                    - الرئيس الحالي لسوريا هو أحمد الشرع (بعد تحرير سوريا من نظام الأسد)
-                    - سوريا جمهورية ديمقراطية حديثة
-                    - النظام السياسي مبني على دستور الجمهورية العربية السورية
-
-                    السياق المرجعي:
-                    {context}
-
-                    السؤال: {question}
-
-                    تعليمات مهمة:
-                    - أجب باللغة العربية فقط
-                    - كن دقيقاً ومحدداً في المعلومات
-                    - إذا لم تكن متأكداً من معلومة، قل "لا أستطيع التأكد من هذه المعلومة"
-                    - لا تخترع معلومات غير موجودة أو غير مؤكدة
-                    - ركز على المعلومات الرسمية والموثقة
-                    - اجعل إجابتك مختصرة ومفيدة
-                    - تجنب التكرار والتفاصيل غير الضرورية
-                    - إذا سُئلت عن هويتك، قل أنك SyriaGPT من وكالة نظم المعلومات السورية"""
+        # التعليمات الثابتة مرسلة كـ system_instruction، والسؤال وحده كمحتوى المستخدم
+        prompt = ANSWER_PROMPT.format(question=question)
+        generation_config = self._generation_config(max_tokens, temperature)
+        route = self.router.route("answer", question, model_preference)
 
         try:
-            # إنشاء نموذج GenerativeModel
-            model = genai.GenerativeModel(self.model_name)
+            # توليد المحتوى بالنموذج المختار
+            response = await self._generate("answer", route, prompt, generation_config, deadline=deadline, hedge=True)
+            # بلوغ حد max_output_tokens يعني أن الإجابة مقطوعة
+            truncated = self._finish_reason(response) == "MAX_TOKENS"
             
-            # توليد المحتوى
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: model.generate_content(prompt)
-            )
-            
-            # الوصول للنص الناتج
-            answer = response.text
+            # الوصول للنص الناتج (لا يوجد نص إذا استُهلك الحد كاملاً قبل أي مخرجات)
+            try:
+                answer = response.text
+            except ValueError:
+                answer = ""
             
             # التحقق من جودة الإجابة
             if not answer or len(answer.strip()) < 5:
                 logger.warning("Received empty or very short answer from Gemini")
-                return {"answer": "عذراً، لم أتمكن من توليد إجابة مناسبة. يرجى إعادة صياغة السؤال.", "model_used": self.model_name}
+                return {"answer": "عذراً، لم أتمكن من توليد إجابة مناسبة. يرجى إعادة صياغة السؤال.", "model_used": route.model}
             
             # تنظيف الإجابة من النصوص غير المرغوب فيها
             answer = answer.strip()
             if answer.startswith("أعتذر") and len(answer) < 20:
                 logger.warning("Received apology response from Gemini")
-                return {"answer": "عذراً، لا أستطيع الإجابة على هذا السؤال بدقة. يرجى طرح سؤال أكثر تحديداً.", "model_used": self.model_name}
+                return {"answer": "عذراً، لا أستطيع الإجابة على هذا السؤال بدقة. يرجى طرح سؤال أكثر تحديداً.", "model_used": route.model}
             
             logger.info(f"✅ [GEMINI_SERVICE] تم توليد إجابة بنجاح من Gemini")
             return {
                 "answer": answer, 
-                "model_used": self.model_name,
+                "model_used": route.model,
                 "source": "gemini_service",
+                "truncated": truncated,
                 "debug_info": {
-                    "model_name": self.model_name,
+                    "model_name": route.model,
+                    "route": route.name,
                     "answer_length": len(answer),
-                    "question_length": len(question)
+                    "question_length": len(question),
+                    "max_output_tokens": generation_config.max_output_tokens
                 }
             }
+        except asyncio.TimeoutError as e:
+            logger.warning(f"⏱️ [GEMINI_SERVICE] انتهت مهلة الإجابة من Gemini: {e}")
+            return None
         except Exception as e:
             logger.error(f"❌ [GEMINI_SERVICE] فشل في الحصول على إجابة من Gemini: {e}")
             return None
@@ -149,14 +352,10 @@ class GeminiService:
         """Generate content using Gemini"""
         if not self.model_available:
             return ""
+        generation_config = self._generation_config(max_tokens, temperature)
         
         try:
-            model = genai.GenerativeModel(self.model_name)
-            
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: model.generate_content(prompt, max_tokens, temperature)
-            )
+            response = await self._generate("content", self.router.route("content"), prompt, generation_config)
             
             return response.text
             
@@ -178,22 +377,11 @@ class GeminiService:
             logger.warning("Empty question provided for variant generation")
             return [original_question]
 
-        prompt = f"""أنشئ 5 أسئلة مشابهة و تملك معنى السؤال الأصلي و بما يتوافق مع المجتمع السوري:
-                    أعد النتيجة بتنسيق list من  {num_variants} عناصر هكذا:
-                    [ , , , , ]
-                    لا تعد اي شيئ مثل (إليك 5 أسئلة مشابهة تتناسب مع السياق السوري:) مباشرة اعط القائمة
-                    السؤال الأصلي:
-                    {cleaned_question}"""
+        prompt = VARIANTS_PROMPT.format(num_variants=num_variants, question=cleaned_question)
         
         try:
-            # إنشاء نموذج GenerativeModel
-            model = genai.GenerativeModel(self.model_name)
-            
-            # توليد المحتوى
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: model.generate_content(prompt)
-            )
+            # توليد المحتوى بالنموذج الخفيف المخصص لهذه المهمة
+            response = await self._generate("variants", self.router.route("variants"), prompt)
             
             if not response or not response.text:
                 logger.warning("Empty response from Gemini for question variants")
@@ -228,4 +416,4 @@ class GeminiService:
         return {"is_safe": True, "safety_ratings": []}
 
 # Global instance
-gemini_service = GeminiService()
\ No newline at end of file
+gemini_service = registry.proxy("gemini_service")
\ No newline at end of file
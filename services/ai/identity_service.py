@@ -3,6 +3,7 @@ import logging
 from typing import Dict, Optional
 from config.config_loader import config_loader
 from config.logging_config import get_logger
+from services.registry import registry
 
 logger = get_logger(__name__)
 
@@ -149,4 +150,4 @@ class IdentityService:
         return None
 
 # Create singleton instance
-identity_service = IdentityService()
+identity_service = registry.proxy("identity_service")
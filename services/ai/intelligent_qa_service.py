@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import os
 from typing import Dict, List, Optional, Any
 import time
 import uuid
@@ -6,16 +8,22 @@ import re
 from datetime import datetime
 
 # الخدمات
-from .qdrant_service import qdrant_service
-from .embedding_service import embedding_service
-from .gemini_service import gemini_service
-from .identity_service import identity_service
+from services.registry import registry, qdrant_service, embedding_service, gemini_service, identity_service
+from .semantic_cache import create_semantic_cache
+from .category_router import create_category_router
+from .knowledge_store import knowledge_store
+from .deadlines import time_left
 from services.repositories.qa_pair_repository import QAPairRepository
 from services.database.database import get_db
+from services.database.two_tier_cache import two_tier_cache
 from config.logging_config import get_logger, log_function_entry, log_function_exit, log_performance, log_error_with_context
 
 logger = get_logger(__name__)
 
+ANSWER_CACHE_TTL_SECONDS = int(os.getenv("CACHE_ANSWER_TTL_SECONDS", 3600))
+# وقت يُحجز قبل انتهاء مهلة الطلب لإرجاع أفضل نتيجة بحث بدلاً من إجابة Gemini
+DEADLINE_FALLBACK_RESERVE_SECONDS = float(os.getenv("QA_DEADLINE_FALLBACK_RESERVE_SECONDS", 1.0))
+
 class IntelligentQAService:
     """
     خدمة Q&A:
@@ -33,6 +41,15 @@ class IntelligentQAService:
         self.medium_confidence_threshold: float = 0.5  # عتبة متوسطة
         self.low_confidence_threshold: float = 0.3     # عتبة منخفضة
         self.max_variants_to_generate: int = 3         # تقليل عدد المتغيرات
+        # كاش دلالي داخل العملية للأسئلة المتكررة (يتجنب الرحلة إلى Qdrant)
+        self.semantic_cache = create_semantic_cache(embedding_service.output_dim)
+        if self.semantic_cache:
+            # Cached results may carry answers that a knowledge reload just changed
+            knowledge_store.add_listener(lambda delta: self.semantic_cache.clear())
+        # توجيه البحث إلى الفئات ذات الصلة (CATEGORY_ROUTING_ENABLED)
+        self.category_router = create_category_router(knowledge_store)
+        # تخزينات أسئلة تجاوزت مهلة الطلب وتكتمل في الخلفية
+        self._background_tasks: set = set()
         self._initialized: bool = True
         log_function_exit(logger, "__init__", duration=time.time() - start_time)
 
@@ -40,10 +57,20 @@ class IntelligentQAService:
         self,
         question: str,
         user_id: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        model_preference: Optional[str] = None,
+        deadline: Optional[float] = None,
     ) -> Dict[str, Any]:
-        """معالجة السؤال بالترتيب الصحيح: هوية -> سوريا -> عام"""
+        """
+        معالجة السؤال بالترتيب الصحيح: هوية -> سوريا -> عام
+
+        `max_tokens` و `temperature` و `model_preference` (إعدادات المحادثة) تُمرَّر إلى Gemini عند توليد إجابة جديدة.
+        `deadline` (time.monotonic()) تضعه طبقة الـ API: إذا لم يُجب Gemini قبل اقترابه
+        تُعاد أفضل نتيجة بحث دلالي ولو كانت دون عتبة الإجابة المخزنة.
+        """
         
-        log_function_entry(logger, "process_question", question_length=len(question), user_id=user_id)
+        log_function_entry(logger, "process_question", question_length=len(question), user_id=user_id, max_tokens=max_tokens)
         start_time = time.time()
 
         try:
@@ -69,6 +96,7 @@ class IntelligentQAService:
             
             # 3. البحث الدلالي في Qdrant
             search_results = await self.search_similar_questions(question)
+            fallback_match = None
             if search_results:
                 best_match = search_results[0]
                 similarity_score = best_match.get("similarity_score", 0)
@@ -77,7 +105,6 @@ class IntelligentQAService:
                     logger.info(f"✅ [INTELLIGENT_QA] تم العثور على إجابة موجودة في Qdrant")
                     answer_id = best_match.get("qa_id")
 
-                    db = next(get_db())
                     try:
                         # تحويل answer_id إلى UUID إذا كان نصيًا
                         if isinstance(answer_id, str):
@@ -87,13 +114,12 @@ class IntelligentQAService:
                                 logger.warning(f"معرف الإجابة غير صالح: {answer_id}")
                                 return {"status": "error", "error": "Invalid QA ID format"}
 
-                        qa_pair_repo = QAPairRepository()
-                        qa_pair = qa_pair_repo.get_qa_pair_by_id(db, answer_id)
+                        answer_text = await self._get_cached_answer(answer_id)
 
-                        if qa_pair:
+                        if answer_text is not None:
                             return {
                                 "status": "success",
-                                "answer": qa_pair.answer_text,
+                                "answer": answer_text,
                                 "source": "cached",
                                 "confidence": similarity_score
                             }
@@ -105,29 +131,48 @@ class IntelligentQAService:
                         logger.warning(f"فشل جلب الإجابة المخزنة: {e}")
                         return {"status": "error", "error": str(e)}
 
-                    finally:
-                        db.close()
+                # أفضل تطابق دون العتبة: احتياطي إذا لم يُجب Gemini ضمن المهلة
+                fallback_match = best_match
 
             else:
                 logger.info(f"❌ [INTELLIGENT_QA] لم يتم العثور على إجابة موجودة في Qdrant، المتابعة لـ Gemini")
 
             # 4. الإجابة باستخدام Gemini للأسئلة العامة
             logger.info(f"🔍 [INTELLIGENT_QA] استخدام Gemini للأسئلة العامة...")
-            answer_result = await gemini_service.answer_question(
-                question=question
-            )
+            # يُحجز جزء من المهلة لجلب الإجابة الاحتياطية
+            gemini_deadline = deadline
+            if deadline is not None and fallback_match is not None:
+                gemini_deadline = deadline - DEADLINE_FALLBACK_RESERVE_SECONDS
+            answer_result = None
+            if gemini_deadline is None or time_left(gemini_deadline) > 0:
+                answer_result = await gemini_service.answer_question(
+                    question=question,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    model_preference=model_preference,
+                    deadline=gemini_deadline
+                )
             if not answer_result or not answer_result.get("answer"):
+                if fallback_match is not None:
+                    fallback_response = await self._retrieval_fallback(fallback_match)
+                    if fallback_response:
+                        log_function_exit(logger, "process_question", duration=time.time() - start_time)
+                        return fallback_response
                 return {"status": "error", "error": "فشل توليد الإجابة باستخدام Gemini"}
 
             answer_text = answer_result["answer"]
 
-            # تخزين السؤال والجواب
-            qa_pair_id = await self.store_qa_pair(question=question, answer=answer_text, user_id=user_id)
+            # تخزين السؤال والجواب (الإجابة المقطوعة بحد المحادثة لا تُعاد لمستخدمين آخرين)
+            qa_pair_id = None
+            if not answer_result.get("truncated"):
+                qa_pair_id = await self._store_within_deadline(question, answer_text, user_id, deadline)
 
             return {
                 "status": "success",
                 "answer": answer_text,
                 "source": "gemini_general",
+                "model_used": answer_result.get("model_used"),
+                "truncated": answer_result.get("truncated", False),
                 "qa_pair_id": qa_pair_id
             }
 
@@ -140,6 +185,75 @@ class IntelligentQAService:
 
 
 
+
+    async def _get_cached_answer(self, answer_id: uuid.UUID) -> Optional[str]:
+        """الإجابة المخزنة عبر كاش ذي مستويين (الذاكرة ثم Redis) قبل PostgreSQL"""
+        return await two_tier_cache.get_or_load(
+            "answers",
+            str(answer_id),
+            lambda: asyncio.to_thread(self._get_stored_answer, answer_id),
+            ttl=ANSWER_CACHE_TTL_SECONDS
+        )
+
+    async def _retrieval_fallback(self, match: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """أفضل إجابة من البحث الدلالي (دون عتبة الإجابة المخزنة) عند تعذر إجابة Gemini ضمن المهلة"""
+        # نقاط ملفات المعرفة (ومعظم نقاط المستخدمين) تحمل الإجابة في الـ payload
+        answer_text = match.get("answer")
+        if not answer_text:
+            # وإلا فهي سؤال مستخدم معرّفه UUID في PostgreSQL
+            try:
+                answer_id = uuid.UUID(str(match.get("qa_id")))
+            except ValueError:
+                return None
+            try:
+                answer_text = await self._get_cached_answer(answer_id)
+            except Exception as e:
+                logger.warning(f"فشل جلب الإجابة الاحتياطية: {e}")
+                return None
+        if not answer_text:
+            return None
+        logger.info(f"↩️ [INTELLIGENT_QA] إرجاع أفضل نتيجة بحث (تشابه {match.get('similarity_score', 0):.2f}) بدلاً من Gemini")
+        return {
+            "status": "success",
+            "answer": answer_text,
+            "source": "retrieval_fallback",
+            "confidence": match.get("similarity_score", 0)
+        }
+
+    async def _store_within_deadline(
+        self,
+        question: str,
+        answer: str,
+        user_id: Optional[str],
+        deadline: Optional[float]
+    ) -> Optional[str]:
+        """
+        تخزين السؤال والجواب دون تجاوز مهلة الطلب: ما لم ينتهِ قبلها
+        (توليد النسخ والـ embeddings) يكتمل في الخلفية ويُعاد None كمعرف.
+        """
+        if deadline is None:
+            return await self.store_qa_pair(question=question, answer=answer, user_id=user_id)
+        task = asyncio.create_task(self.store_qa_pair(question=question, answer=answer, user_id=user_id))
+        done, _ = await asyncio.wait({task}, timeout=max(0.0, time_left(deadline)))
+        if task in done:
+            return task.result()
+        self._background_tasks.add(task)
+        task.add_done_callback(self._finish_background_store)
+        return None
+
+    def _finish_background_store(self, task: asyncio.Task):
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Failed to store QA pair in the background: {task.exception()}")
+
+    def _get_stored_answer(self, answer_id: uuid.UUID) -> Optional[str]:
+        """نص الإجابة المخزنة في PostgreSQL"""
+        db = next(get_db())
+        try:
+            qa_pair = QAPairRepository().get_qa_pair_by_id(db, answer_id)
+            return qa_pair.answer_text if qa_pair else None
+        finally:
+            db.close()
             
     async def store_qa_pair(
         self,
@@ -182,7 +296,7 @@ class IntelligentQAService:
             qa_id=str(qa_pair.id),
             question=question,
             embedding=question_embedding,
-            metadata={"answer": answer}
+            metadata={"answer": answer, "category": "user_generated"}
         )
         
         if not store_success:
@@ -201,7 +315,7 @@ class IntelligentQAService:
                             qa_id=str(qa_pair.id),
                             question=variant,
                             embedding=variant_embedding,
-                            metadata={"answer": answer, "is_variant": True}  # مرتبط بالجواب الأصلي
+                            metadata={"answer": answer, "is_variant": True, "category": "user_generated"}  # مرتبط بالجواب الأصلي
                         )
                     else:
                         logger.warning(f"Failed to generate embedding for variant: {variant}")
@@ -224,12 +338,38 @@ class IntelligentQAService:
             if not question_embedding:
                 logger.error(f"Failed to generate embedding for search question: {question}")
                 return []
+
+            if self.semantic_cache:
+                cached = self.semantic_cache.lookup(question_embedding)
+                if cached:
+                    cached_results, cache_similarity = cached
+                    logger.debug(f"⚡ [SEMANTIC_CACHE] hit (similarity: {cache_similarity:.3f})")
+                    # لا تتجاوز الثقة المعادة درجة تشابه السؤال مع السؤال المخزن
+                    return [
+                        {**result, "similarity_score": min(result["similarity_score"], cache_similarity)}
+                        for result in cached_results[:limit]
+                    ]
                 
+            categories = self.category_router.route(question) if self.category_router else None
             results = await qdrant_service.search_similar_questions(
                 question_embedding,
                 limit=limit,
-                score_threshold=self.semantic_search_threshold
+                score_threshold=self.semantic_search_threshold,
+                filters={"category": categories} if categories else None
             )
+            if categories and self.category_router.needs_fallback(results):
+                # لا توجد إجابة جيدة ضمن الفئات المختارة: البحث في المجموعة كاملة
+                logger.debug(f"🧭 [CATEGORY_ROUTING] no good match in {categories}, searching all categories")
+                results = await qdrant_service.search_similar_questions(
+                    question_embedding,
+                    limit=limit,
+                    score_threshold=self.semantic_search_threshold
+                )
+
+            # تخزين النتائج عالية الثقة فقط
+            if (self.semantic_cache and results and
+                    results[0].get("similarity_score", 0) >= self.high_confidence_threshold):
+                self.semantic_cache.add(question_embedding, results)
             return results
         except Exception as e:
             logger.error(f"Failed to search similar questions: {e}")
@@ -257,15 +397,18 @@ class IntelligentQAService:
 
             # Load Syria knowledge data into Qdrant
             logger.info("🔄 Loading Syria knowledge data...")
-            from services.ai.data_integration_service import data_integration_service
+            from services.registry import data_integration_service
             data_result = await data_integration_service.initialize_knowledge_base()
 
-            if data_result.get("status") == "success":
-                logger.info("✅ Syria knowledge data loaded successfully")
-            else:
-                logger.warning(f"⚠️ Failed to load Syria knowledge data: {data_result.get('error', 'Unknown error')}")
-
             duration = time.time() - start_time
+            if data_result.get("status") != "success":
+                error = data_result.get("error") or data_result.get("message") or "Unknown error"
+                logger.warning(f"⚠️ Failed to load Syria knowledge data: {error}")
+                log_function_exit(logger, "initialize_system", duration=duration)
+                # A failed load must not be published as a completed cluster initialization
+                return {"status": "error", "error": f"Knowledge data loading failed: {error}", "data_loading": data_result}
+
+            logger.info("✅ Syria knowledge data loaded successfully")
             log_function_exit(logger, "initialize_system", duration=duration)
 
             return {
@@ -283,76 +426,49 @@ class IntelligentQAService:
     async def _search_local_data_directly(self, question: str) -> Dict[str, Any]:
         """البحث المباشر في البيانات المحلية بدون استخدام embedding"""
         try:
-            import json
-            from pathlib import Path
-            
-            # مسار البيانات - استخدام مسار مرن
-            base_path = Path(__file__).parent.parent.parent
-            data_path = base_path / "frontend_folder" / "public" / "data" / "syria_knowledge"
-            
-            # إذا لم يوجد المسار، جرب المسار البديل
-            if not data_path.exists():
-                data_path = base_path / "data" / "syria_knowledge"
-            knowledge_files = [
-                "general.json",
-                "cities.json", 
-                "culture.json",
-                "economy.json",
-                "government.json",
-                "Real_post_liberation_events.json",
-                "modern_syria.json"
-            ]
+            # البيانات محملة مرة واحدة في مخزن المعرفة المشترك
+            snapshot = knowledge_store.snapshot
             
             # البحث في الملفات مع إعطاء أولوية للملفات الحديثة
             priority_files = ["modern_syria.json", "government.json", "general.json"]
-            all_files = priority_files + [f for f in knowledge_files if f not in priority_files]
+            all_files = priority_files + [f.filename for f in snapshot.files if f.filename not in priority_files]
+            
+            question_lower = question.lower()
+            question_words = question_lower.split()
             
             best_match = None
             best_score = 0
             
             for filename in all_files:
-                file_path = data_path / filename
-                if file_path.exists():
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                    except (json.JSONDecodeError, IOError) as e:
-                        logger.warning(f"خطأ في قراءة الملف {filename}: {e}")
-                        continue
+                knowledge_file = snapshot.get_file(filename)
+                if knowledge_file is None:
+                    continue
+                
+                for entry in knowledge_file.entries:
+                    # البحث البسيط في النص (النص المجمع محسوب مسبقاً)
+                    search_text = entry.search_text
                     
-                    qa_pairs = data.get("qa_pairs", [])
-                    for qa_pair in qa_pairs:
-                        # البحث في الأسئلة والإجابات
-                        question_variants = qa_pair.get("question_variants", [])
-                        answer = qa_pair.get("answer", "")
-                        keywords = qa_pair.get("keywords", [])
-                        
-                        # البحث البسيط في النص
-                        search_text = f"{' '.join(question_variants)} {answer} {' '.join(keywords)}".lower()
-                        question_lower = question.lower()
-                        
-                        # البحث عن كلمات مفتاحية
-                        question_words = question_lower.split()
-                        matches = 0
-                        for word in question_words:
-                            if word in search_text:
-                                matches += 1
-                        
-                        # حساب النقاط مع إعطاء أولوية للملفات الحديثة
-                        score = matches / len(question_words) if question_words else 0
-                        if filename in priority_files:
-                            score *= 1.5  # زيادة النقاط للملفات المهمة
-                        
-                        # إذا كان هناك تطابق جيد
-                        if score >= 0.3 and score > best_score:  # 30% من الكلمات (تقليل العتبة)
-                            best_match = {
-                                "answer": answer,
-                                "filename": filename,
-                                "qa_id": qa_pair.get('id', 'unknown'),
-                                "score": score,
-                                "category": data.get("category", "syria")
-                            }
-                            best_score = score
+                    # البحث عن كلمات مفتاحية
+                    matches = 0
+                    for word in question_words:
+                        if word in search_text:
+                            matches += 1
+                    
+                    # حساب النقاط مع إعطاء أولوية للملفات الحديثة
+                    score = matches / len(question_words) if question_words else 0
+                    if filename in priority_files:
+                        score *= 1.5  # زيادة النقاط للملفات المهمة
+                    
+                    # إذا كان هناك تطابق جيد
+                    if score >= 0.3 and score > best_score:  # 30% من الكلمات (تقليل العتبة)
+                        best_match = {
+                            "answer": entry.answer,
+                            "filename": filename,
+                            "qa_id": entry.id,
+                            "score": score,
+                            "category": entry.category
+                        }
+                        best_score = score
             
             if best_match and best_score >= 0.3:  # تأكد من وجود تطابق مقبول
                 logger.info(f"✅ [SYRIA_DATA] Found best match in {best_match['filename']}: {best_match['qa_id']} (score: {best_score:.2f})")
@@ -387,4 +503,4 @@ class IntelligentQAService:
         }
 
 # نسخة الخدمة جاهزة للاستخدام
-intelligent_qa_service = IntelligentQAService()
+intelligent_qa_service = registry.proxy("intelligent_qa_service")
@@ -0,0 +1,287 @@
+"""
+Precompiled binary bundle of the Syria knowledge corpus.
+
+Layout (little-endian, sections 8-byte aligned, offsets stored in the header):
+
+    header     magic, version, section counts, embedding dimension and model,
+               offsets of every section
+    strings    (offset, length) index followed by one UTF-8 blob; every text
+               field of the corpus is a string id into this table
+    files      filename, category, description, sha256 of the source JSON,
+               first record and record count
+    records    fixed-size pair records (ids of their strings, confidence,
+               ranges into the list and vector sections)
+    lists      string ids of question variants and keywords
+    keywords   lower-cased keyword string id -> range of postings
+    postings   record indexes
+    vectors    optional float32 matrix: the main embedding of each pair
+               followed by its variant embeddings
+
+The file is memory-mapped; nothing is parsed as JSON when it is loaded and the
+vectors are exposed as a read-only NumPy view of the mapping.
+"""
+import hashlib
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b"SYKB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sIIIIIIIIIi8Q")
+_STRING = struct.Struct("<II")
+_FILE = struct.Struct("<III32sII")
+_RECORD = struct.Struct("<6Id6I")
+_KEYWORD = struct.Struct("<III")
+_U32 = struct.Struct("<I")
+
+
+def _align(offset: int, boundary: int = 8) -> int:
+    return (offset + boundary - 1) // boundary * boundary
+
+
+class KnowledgeBundle:
+    """Read-only view over a memory-mapped knowledge bundle"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        if len(self._view) < _HEADER.size:
+            self.close()
+            raise ValueError(f"Truncated knowledge bundle: {self.path}")
+
+        (magic, version, self.string_count, self.file_count, self.record_count,
+         self.list_count, self.keyword_count, self.posting_count, self.dimension,
+         self.vector_count, model_sid, *offsets) = _HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a knowledge bundle (version {VERSION}): {self.path}")
+        if any(offset > len(self._view) for offset in offsets):
+            self.close()
+            raise ValueError(f"Truncated knowledge bundle: {self.path}")
+        (self._strings_offset, self._blob_offset, self._files_offset, self._records_offset,
+         self._lists_offset, self._keywords_offset, self._postings_offset, self._vectors_offset) = offsets
+
+        self.embedding_model = self.string(model_sid) if model_sid >= 0 else None
+        self.vectors: Optional[np.ndarray] = None
+        if self.vector_count:
+            self.vectors = np.frombuffer(
+                self._mmap, dtype="<f4", count=self.vector_count * self.dimension, offset=self._vectors_offset
+            ).reshape(self.vector_count, self.dimension)
+
+    def close(self):
+        self.vectors = None
+        self._view.release()
+        self._mmap.close()
+
+    def string(self, sid: int) -> str:
+        offset, length = _STRING.unpack_from(self._view, self._strings_offset + sid * _STRING.size)
+        start = self._blob_offset + offset
+        return str(self._view[start:start + length], "utf-8")
+
+    def string_table(self) -> List[str]:
+        """Every string of the bundle decoded once, indexed by string id"""
+        index = np.frombuffer(self._mmap, dtype="<u4", count=self.string_count * 2, offset=self._strings_offset)
+        starts, lengths = index[0::2].tolist(), index[1::2].tolist()
+        blob = self._mmap[self._blob_offset:self._blob_offset + (starts[-1] + lengths[-1] if starts else 0)]
+        return [str(blob[start:start + length], "utf-8") for start, length in zip(starts, lengths)]
+
+    def records(self) -> List[Dict]:
+        """All pair records with their strings resolved (one pass over the mapping)"""
+        strings = self.string_table()
+        lists = np.frombuffer(self._mmap, dtype="<u4", count=self.list_count, offset=self._lists_offset).tolist()
+        records = []
+        for (qa_id, file_index, answer, source, search_text, content_hash, confidence,
+             variants_start, variants_count, keywords_start, keywords_count,
+             vector_start, vector_count) in _RECORD.iter_unpack(
+                 self._mmap[self._records_offset:self._records_offset + self.record_count * _RECORD.size]):
+            records.append({
+                "id": strings[qa_id],
+                "file_index": file_index,
+                "question_variants": tuple(strings[i] for i in lists[variants_start:variants_start + variants_count]),
+                "answer": strings[answer],
+                "keywords": tuple(strings[i] for i in lists[keywords_start:keywords_start + keywords_count]),
+                "confidence": confidence,
+                "source": strings[source],
+                "search_text": strings[search_text],
+                "content_hash": strings[content_hash],
+                "vector_start": vector_start,
+                "vector_count": vector_count
+            })
+        return records
+
+    def _strings(self, start: int, count: int) -> Tuple[str, ...]:
+        return tuple(
+            self.string(_U32.unpack_from(self._view, self._lists_offset + (start + i) * _U32.size)[0])
+            for i in range(count)
+        )
+
+    def files(self) -> List[Dict]:
+        files = []
+        for index in range(self.file_count):
+            filename, category, description, digest, start, count = _FILE.unpack_from(
+                self._view, self._files_offset + index * _FILE.size
+            )
+            files.append({
+                "filename": self.string(filename),
+                "category": self.string(category),
+                "description": self.string(description),
+                "sha256": digest.hex(),
+                "record_start": start,
+                "record_count": count
+            })
+        return files
+
+    def record(self, index: int) -> Dict:
+        (qa_id, file_index, answer, source, search_text, content_hash, confidence,
+         variants_start, variants_count, keywords_start, keywords_count,
+         vector_start, vector_count) = _RECORD.unpack_from(self._view, self._records_offset + index * _RECORD.size)
+        return {
+            "id": self.string(qa_id),
+            "file_index": file_index,
+            "question_variants": self._strings(variants_start, variants_count),
+            "answer": self.string(answer),
+            "keywords": self._strings(keywords_start, keywords_count),
+            "confidence": confidence,
+            "source": self.string(source),
+            "search_text": self.string(search_text),
+            "content_hash": self.string(content_hash),
+            "vector_start": vector_start,
+            "vector_count": vector_count
+        }
+
+    def keyword_postings(self) -> Dict[str, Tuple[int, ...]]:
+        """Prebuilt lexical index: lower-cased keyword -> record indexes"""
+        postings = np.frombuffer(self._mmap, dtype="<u4", count=self.posting_count, offset=self._postings_offset)
+        index = {}
+        for i in range(self.keyword_count):
+            keyword, start, count = _KEYWORD.unpack_from(self._view, self._keywords_offset + i * _KEYWORD.size)
+            index[self.string(keyword)] = tuple(postings[start:start + count].tolist())
+        return index
+
+    def record_vectors(self, index: int) -> Optional[np.ndarray]:
+        if self.vectors is None:
+            return None
+        record = _RECORD.unpack_from(self._view, self._records_offset + index * _RECORD.size)
+        vector_start, vector_count = record[-2], record[-1]
+        if not vector_count:
+            return None
+        return self.vectors[vector_start:vector_start + vector_count]
+
+
+def write_bundle(
+    path: Path,
+    files: Sequence,
+    file_digests: Dict[str, bytes],
+    embeddings: Optional[Dict[str, Sequence[Sequence[float]]]] = None,
+    embedding_model: Optional[str] = None,
+    dimension: int = 0
+) -> Dict[str, int]:
+    """
+    Compile knowledge files (KnowledgeFile objects) into a bundle at `path`.
+
+    `embeddings` optionally maps a pair id to its main embedding followed by the
+    embeddings of its variant points.
+    """
+    strings: Dict[str, int] = {}
+
+    def sid(text: str) -> int:
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+
+    file_rows, record_rows, lists = [], [], []
+    postings_by_keyword: Dict[str, List[int]] = {}
+    vectors: List[Sequence[float]] = []
+
+    for file_index, knowledge_file in enumerate(files):
+        record_start = len(record_rows)
+        for entry in knowledge_file.entries:
+            record_index = len(record_rows)
+            variants_start = len(lists)
+            lists.extend(sid(variant) for variant in entry.question_variants)
+            keywords_start = len(lists)
+            lists.extend(sid(keyword) for keyword in entry.keywords)
+            for keyword in {keyword.lower() for keyword in entry.keywords}:
+                postings_by_keyword.setdefault(keyword, []).append(record_index)
+
+            entry_vectors = (embeddings or {}).get(entry.id) or []
+            vector_start = len(vectors)
+            vectors.extend(entry_vectors)
+
+            record_rows.append((
+                sid(entry.id), file_index, sid(entry.answer), sid(entry.source),
+                sid(entry.search_text), sid(entry.content_hash), float(entry.confidence),
+                variants_start, len(entry.question_variants), keywords_start, len(entry.keywords),
+                vector_start, len(entry_vectors)
+            ))
+        file_rows.append((
+            sid(knowledge_file.filename), sid(knowledge_file.category), sid(knowledge_file.description),
+            file_digests[knowledge_file.filename], record_start, len(record_rows) - record_start
+        ))
+
+    keyword_rows, postings = [], []
+    for keyword in sorted(postings_by_keyword):
+        record_indexes = postings_by_keyword[keyword]
+        keyword_rows.append((sid(keyword), len(postings), len(record_indexes)))
+        postings.extend(record_indexes)
+
+    model_sid = sid(embedding_model) if vectors and embedding_model else -1
+    if not vectors:
+        dimension = 0
+
+    blob = bytearray()
+    string_index = bytearray()
+    for text in strings:  # insertion order == string id
+        encoded = text.encode("utf-8")
+        string_index += _STRING.pack(len(blob), len(encoded))
+        blob += encoded
+
+    sections = [
+        bytes(string_index),
+        bytes(blob),
+        b"".join(_FILE.pack(*row) for row in file_rows),
+        b"".join(_RECORD.pack(*row) for row in record_rows),
+        np.asarray(lists, dtype="<u4").tobytes(),
+        b"".join(_KEYWORD.pack(*row) for row in keyword_rows),
+        np.asarray(postings, dtype="<u4").tobytes(),
+        np.asarray(vectors, dtype="<f4").reshape(-1).tobytes() if vectors else b""
+    ]
+
+    offsets, position = [], _align(_HEADER.size)
+    for section in sections:
+        offsets.append(position)
+        position = _align(position + len(section))
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(strings), len(file_rows), len(record_rows), len(lists),
+        len(keyword_rows), len(postings), dimension, len(vectors), model_sid, *offsets
+    )
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for offset, section in zip(offsets, sections):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(section)
+    tmp_path.replace(path)
+
+    return {
+        "files": len(file_rows),
+        "records": len(record_rows),
+        "strings": len(strings),
+        "keywords": len(keyword_rows),
+        "vectors": len(vectors),
+        "size_bytes": path.stat().st_size
+    }
+
+
+def file_digest(path: Path) -> bytes:
+    return hashlib.sha256(Path(path).read_bytes()).digest()
@@ -0,0 +1,453 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from config.logging_config import get_logger, log_performance
+from .knowledge_bundle import KnowledgeBundle, file_digest, write_bundle
+
+logger = get_logger(__name__)
+
+DEFAULT_DATA_PATH = Path(__file__).parent.parent.parent / "data" / "syria_knowledge"
+DEFAULT_BUNDLE_PATH = Path(__file__).parent.parent.parent / "data" / "knowledge.bundle"
+
+KNOWLEDGE_FILES = (
+    "general.json",
+    "cities.json",
+    "culture.json",
+    "economy.json",
+    "government.json",
+    "Real_post_liberation_events.json",
+    "modern_syria.json"
+)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens without the Arabic definite article; very short tokens are dropped"""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token.startswith("ال") and len(token) > 4:
+            token = token[2:]
+        if len(token) > 2:
+            tokens.append(token)
+    return tokens
+
+
+@dataclass(frozen=True)
+class KnowledgeEntry:
+    """One validated Q&A pair of the Syria knowledge corpus"""
+    id: str
+    category: str
+    filename: str
+    question_variants: Tuple[str, ...]
+    answer: str
+    keywords: Tuple[str, ...]
+    confidence: float
+    source: str
+    # Lower-cased question variants, answer and keywords, used by lexical matching
+    search_text: str
+    # Hash of everything that ends up in the pair's vectors and payload
+    content_hash: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "question_variants": list(self.question_variants),
+            "answer": self.answer,
+            "keywords": list(self.keywords),
+            "confidence": self.confidence,
+            "source": self.source,
+            "category": self.category
+        }
+
+
+@dataclass(frozen=True)
+class KnowledgeFile:
+    filename: str
+    category: str
+    description: str
+    entries: Tuple[KnowledgeEntry, ...]
+    # (mtime_ns, size) of the file when it was parsed, used to detect edits
+    signature: Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class KnowledgeSnapshot:
+    """Immutable, indexed view of the corpus; replaced as a whole on reload"""
+    files: Tuple[KnowledgeFile, ...]
+    entries: Tuple[KnowledgeEntry, ...]
+    by_id: Mapping[str, KnowledgeEntry]
+    by_keyword: Mapping[str, Tuple[str, ...]]
+    by_category: Mapping[str, Tuple[str, ...]]
+    loaded_at: float
+
+    def get_file(self, filename: str) -> Optional[KnowledgeFile]:
+        for knowledge_file in self.files:
+            if knowledge_file.filename == filename:
+                return knowledge_file
+        return None
+
+
+@dataclass(frozen=True)
+class KnowledgeDelta:
+    """Entries of one file that changed between two snapshots"""
+    filename: str
+    added: Tuple[KnowledgeEntry, ...]
+    changed: Tuple[KnowledgeEntry, ...]
+    removed: Tuple[KnowledgeEntry, ...]
+    # Previous versions of the changed entries (same order as `changed`)
+    previous: Tuple[KnowledgeEntry, ...]
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+
+def _content_hash(question_variants, answer, keywords, confidence, source, category) -> str:
+    content = {
+        "question_variants": list(question_variants),
+        "answer": answer,
+        "keywords": list(keywords),
+        "confidence": confidence,
+        "source": source,
+        "category": category
+    }
+    return hashlib.sha256(json.dumps(content, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class KnowledgeStore:
+    """
+    Single source of the Syria knowledge corpus.
+
+    The JSON files are parsed and validated once into frozen entries with
+    keyword/category indexes. Redis caching, Qdrant ingestion and the local
+    lexical search all read the same snapshot instead of re-parsing the files.
+    When a precompiled bundle matching the files exists it is memory-mapped
+    instead, so no JSON is parsed at all.
+    """
+
+    def __init__(self, data_path: Optional[Path] = None):
+        self.data_path = Path(data_path or os.getenv("KNOWLEDGE_DATA_PATH", str(DEFAULT_DATA_PATH)))
+        self.knowledge_files = KNOWLEDGE_FILES
+        self._snapshot: Optional[KnowledgeSnapshot] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[KnowledgeDelta], None]] = []
+        self.bundle_path = Path(os.getenv("KNOWLEDGE_BUNDLE_PATH", str(DEFAULT_BUNDLE_PATH)))
+        self._bundle: Optional[KnowledgeBundle] = None
+        self._bundle_index: Dict[str, int] = {}
+
+    @property
+    def snapshot(self) -> KnowledgeSnapshot:
+        """Current snapshot, loaded on first use"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._build_snapshot()
+                snapshot = self._snapshot
+        return snapshot
+
+    def reload(self) -> KnowledgeSnapshot:
+        """Re-read the files and swap in a new snapshot"""
+        snapshot = self._build_snapshot()
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def add_listener(self, callback: Callable[[KnowledgeDelta], None]):
+        """Register a callback invoked with the delta after a file reload swaps the snapshot"""
+        self._listeners.append(callback)
+
+    def _file_signature(self, filename: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = (self.data_path / filename).stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def changed_files(self) -> List[str]:
+        """Knowledge files whose on-disk signature differs from the loaded snapshot"""
+        snapshot = self.snapshot
+        changed = []
+        for filename in self.knowledge_files:
+            knowledge_file = snapshot.get_file(filename)
+            loaded = knowledge_file.signature if knowledge_file else None
+            if self._file_signature(filename) != loaded:
+                changed.append(filename)
+        return changed
+
+    def reload_file(self, filename: str) -> KnowledgeDelta:
+        """
+        Re-parse a single file and atomically swap in a snapshot with it replaced.
+
+        Readers holding the previous snapshot keep a consistent view; the
+        returned delta describes what changed for downstream caches.
+        """
+        if filename not in self.knowledge_files:
+            raise ValueError(f"Unknown knowledge file: {filename}")
+
+        with self._lock:
+            current = self._snapshot or self._build_snapshot()
+            old_file = current.get_file(filename)
+            other_ids = {entry.id for entry in current.entries if entry.filename != filename}
+            new_file = self._read_file(filename, other_ids)
+            if new_file is None and self._file_signature(filename) is not None:
+                # Unreadable (e.g. half-written) file: keep serving the previous version
+                new_file = old_file
+
+            files = []
+            for name in self.knowledge_files:
+                knowledge_file = new_file if name == filename else current.get_file(name)
+                if knowledge_file is not None:
+                    files.append(knowledge_file)
+            self._snapshot = self._index_files(files)
+
+        old_entries = {entry.id: entry for entry in (old_file.entries if old_file else ())}
+        new_entries = {entry.id: entry for entry in (new_file.entries if new_file else ())}
+        changed_ids = [qa_id for qa_id, entry in new_entries.items()
+                       if qa_id in old_entries and old_entries[qa_id].content_hash != entry.content_hash]
+        delta = KnowledgeDelta(
+            filename=filename,
+            added=tuple(entry for qa_id, entry in new_entries.items() if qa_id not in old_entries),
+            changed=tuple(new_entries[qa_id] for qa_id in changed_ids),
+            removed=tuple(entry for qa_id, entry in old_entries.items() if qa_id not in new_entries),
+            previous=tuple(old_entries[qa_id] for qa_id in changed_ids)
+        )
+        logger.info(f"🔄 Reloaded {filename}: {len(delta.added)} added, {len(delta.changed)} changed, "
+                    f"{len(delta.removed)} removed")
+
+        if not delta.is_empty:
+            for callback in self._listeners:
+                try:
+                    callback(delta)
+                except Exception as e:
+                    logger.warning(f"⚠️ Knowledge reload listener failed: {e}")
+        return delta
+
+    def entries(self) -> Tuple[KnowledgeEntry, ...]:
+        return self.snapshot.entries
+
+    def get(self, qa_id: str) -> Optional[KnowledgeEntry]:
+        return self.snapshot.by_id.get(qa_id)
+
+    def _read_file(self, filename: str, seen_ids: set) -> Optional[KnowledgeFile]:
+        file_path = self.data_path / filename
+        signature = self._file_signature(filename)
+        if signature is None:
+            logger.warning(f"⚠️ Knowledge file not found: {file_path}")
+            return None
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.error(f"❌ Failed to read knowledge file {filename}: {e}")
+            return None
+
+        category = data.get("category", file_path.stem)
+        entries: List[KnowledgeEntry] = []
+        for qa_pair in data.get("qa_pairs", []):
+            qa_id = qa_pair.get("id")
+            if not qa_id:
+                logger.warning(f"Skipping Q&A pair without ID in {filename}")
+                continue
+            qa_id = str(qa_id)
+            if qa_id in seen_ids:
+                logger.warning(f"Skipping duplicate Q&A pair {qa_id} in {filename}")
+                continue
+
+            question_variants = tuple(str(v) for v in qa_pair.get("question_variants", []) if v)
+            answer = qa_pair.get("answer", "") or ""
+            if not question_variants and not answer:
+                logger.warning(f"Skipping empty Q&A pair {qa_id} in {filename}")
+                continue
+            keywords = tuple(str(k) for k in qa_pair.get("keywords", []) if k)
+            confidence = qa_pair.get("confidence", 1.0)
+            source = qa_pair.get("source", "") or ""
+
+            seen_ids.add(qa_id)
+            entries.append(KnowledgeEntry(
+                id=qa_id,
+                category=category,
+                filename=filename,
+                question_variants=question_variants,
+                answer=answer,
+                keywords=keywords,
+                confidence=confidence,
+                source=source,
+                search_text=f"{' '.join(question_variants)} {answer} {' '.join(keywords)}".lower(),
+                content_hash=_content_hash(question_variants, answer, keywords, confidence, source, category)
+            ))
+
+        return KnowledgeFile(
+            filename=filename,
+            category=category,
+            description=data.get("description", ""),
+            entries=tuple(entries),
+            signature=signature
+        )
+
+    def _build_snapshot(self, use_bundle: bool = True) -> KnowledgeSnapshot:
+        start_time = time.time()
+        if use_bundle:
+            snapshot = self._load_bundle()
+            if snapshot is not None:
+                log_performance(logger, "Knowledge store load (bundle)", time.time() - start_time,
+                                files=len(snapshot.files), entries=len(snapshot.entries))
+                return snapshot
+
+        seen_ids: set = set()
+        files = []
+        for filename in self.knowledge_files:
+            knowledge_file = self._read_file(filename, seen_ids)
+            if knowledge_file is not None:
+                files.append(knowledge_file)
+
+        snapshot = self._index_files(files)
+        log_performance(logger, "Knowledge store load", time.time() - start_time,
+                        files=len(files), entries=len(snapshot.entries))
+        return snapshot
+
+    @staticmethod
+    def _index_files(files: List[KnowledgeFile], by_keyword: Optional[Dict[str, Any]] = None) -> KnowledgeSnapshot:
+        entries = tuple(entry for knowledge_file in files for entry in knowledge_file.entries)
+        build_keywords = by_keyword is None
+        by_keyword = {} if build_keywords else by_keyword
+        by_category: Dict[str, List[str]] = {}
+        for entry in entries:
+            if build_keywords:
+                for keyword in {keyword.lower() for keyword in entry.keywords}:
+                    by_keyword.setdefault(keyword, []).append(entry.id)
+            by_category.setdefault(entry.category, []).append(entry.id)
+
+        snapshot = KnowledgeSnapshot(
+            files=tuple(files),
+            entries=entries,
+            by_id=MappingProxyType({entry.id: entry for entry in entries}),
+            by_keyword=MappingProxyType({k: tuple(v) for k, v in by_keyword.items()}),
+            by_category=MappingProxyType({k: tuple(v) for k, v in by_category.items()}),
+            loaded_at=time.time()
+        )
+        return snapshot
+
+    def _current_digests(self) -> Dict[str, bytes]:
+        return {
+            filename: file_digest(self.data_path / filename)
+            for filename in self.knowledge_files
+            if (self.data_path / filename).exists()
+        }
+
+    def _load_bundle(self) -> Optional[KnowledgeSnapshot]:
+        """Snapshot from the precompiled bundle, or None when it is missing or stale"""
+        if not self.bundle_path.exists():
+            return None
+        try:
+            bundle = KnowledgeBundle(self.bundle_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable knowledge bundle {self.bundle_path}: {e}")
+            return None
+
+        bundle_files = bundle.files()
+        digests = self._current_digests()
+        if {f["filename"]: f["sha256"] for f in bundle_files} != {k: v.hex() for k, v in digests.items()}:
+            logger.info(f"Knowledge bundle {self.bundle_path} is stale, loading the JSON files")
+            bundle.close()
+            return None
+
+        records = bundle.records()
+        record_ids: List[str] = [record["id"] for record in records]
+        files = []
+        for bundle_file in bundle_files:
+            filename, category = bundle_file["filename"], bundle_file["category"]
+            entries = []
+            start = bundle_file["record_start"]
+            for record in records[start:start + bundle_file["record_count"]]:
+                entries.append(KnowledgeEntry(
+                    id=record["id"],
+                    category=category,
+                    filename=filename,
+                    question_variants=record["question_variants"],
+                    answer=record["answer"],
+                    keywords=record["keywords"],
+                    confidence=record["confidence"],
+                    source=record["source"],
+                    search_text=record["search_text"],
+                    content_hash=record["content_hash"]
+                ))
+            files.append(KnowledgeFile(
+                filename=filename,
+                category=category,
+                description=bundle_file["description"],
+                entries=tuple(entries),
+                signature=self._file_signature(filename)
+            ))
+
+        by_keyword = {
+            keyword: tuple(record_ids[index] for index in postings)
+            for keyword, postings in bundle.keyword_postings().items()
+        }
+        # Earlier bundles stay mapped while vectors taken from them may still be referenced
+        self._bundle = bundle
+        self._bundle_index = {qa_id: index for index, qa_id in enumerate(record_ids)}
+        return self._index_files(files, by_keyword)
+
+    def build_bundle(
+        self,
+        embeddings: Optional[Dict[str, List[List[float]]]] = None,
+        embedding_model: Optional[str] = None,
+        dimension: int = 0
+    ) -> Dict[str, Any]:
+        """Compile the JSON knowledge files into the binary bundle"""
+        start_time = time.time()
+        digests = self._current_digests()
+        snapshot = self._build_snapshot(use_bundle=False)
+        result = write_bundle(
+            self.bundle_path,
+            snapshot.files,
+            digests,
+            embeddings=embeddings,
+            embedding_model=embedding_model,
+            dimension=dimension
+        )
+        duration = time.time() - start_time
+        log_performance(logger, "Knowledge bundle build", duration, **result)
+        return {"bundle_path": str(self.bundle_path), **result, "processing_time": duration}
+
+    def get_embeddings(self, entry: KnowledgeEntry, embedding_model: str) -> Optional[List[List[float]]]:
+        """Precomputed embeddings of an entry from the bundle, if they match its current content"""
+        bundle = self._bundle
+        index = self._bundle_index.get(entry.id)
+        if bundle is None or index is None or bundle.embedding_model != embedding_model:
+            return None
+        if bundle.record(index)["content_hash"] != entry.content_hash:
+            return None
+        vectors = bundle.record_vectors(index)
+        return vectors.tolist() if vectors is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        return {
+            "data_path": str(self.data_path),
+            "bundle_path": str(self.bundle_path) if self._bundle else None,
+            "files": {f.filename: len(f.entries) for f in snapshot.files},
+            "total_entries": len(snapshot.entries),
+            "keywords": len(snapshot.by_keyword),
+            "categories": list(snapshot.by_category.keys()),
+            "loaded_at": snapshot.loaded_at
+        }
+
+
+# Global knowledge store instance
+knowledge_store = KnowledgeStore()
+
+
+def get_knowledge_store():
+    """Get the global knowledge store instance"""
+    return knowledge_store
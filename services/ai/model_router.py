@@ -0,0 +1,224 @@
+import json
+import os
+import re
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, NamedTuple, Optional, Tuple
+
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# USD per million tokens (input, output); thinking tokens are billed as output
+DEFAULT_MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.0-flash": (0.10, 0.40)
+}
+# Cached input tokens are billed at a fraction of the input price
+CACHED_INPUT_PRICE_FACTOR = 0.25
+
+# Chat.model_preference still stores the model names of the chat API schemas;
+# retired ones resolve to their current counterpart
+DEFAULT_MODEL_ALIASES: Dict[str, str] = {
+    "gemini-1.5-flash": "gemini-2.5-flash",
+    "gemini-1.5-pro": "gemini-2.5-pro"
+}
+
+# كلمات تدل على سؤال يحتاج شرحاً أو تحليلاً وليس معلومة قصيرة
+COMPLEX_MARKERS = (
+    "لماذا", "كيف", "اشرح", "وضح", "حلل", "قارن", "الفرق", "ناقش", "تأثير", "أسباب", "نتائج", "تقييم",
+    "why", "how", "explain", "compare", "analy", "difference", "impact", "evaluate"
+)
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class ModelRoute(NamedTuple):
+    name: str    # e.g. "answer:simple", "variants", "answer:preferred"
+    model: str
+
+
+class ModelRouter:
+    """
+    Picks the Gemini model of each call from its task and the question's complexity.
+
+    Tasks with a fixed, small output (question variants, news Q&A extraction)
+    go to the light model. Answers are classified by a cheap heuristic: short
+    questions without explanation/comparison markers are factual lookups and go
+    to the light model, long questions carrying such markers go to the strong
+    model, everything else to the standard one.
+
+    A chat's `model_preference` is honored: in "ceiling" mode (default) it
+    replaces the standard and strong models for that chat while short factual
+    questions may still take the light model; in "strict" mode every answer of
+    the chat uses it.
+
+    Latency samples, token usage and estimated cost are kept per route.
+    """
+
+    def __init__(
+        self,
+        light_model: str = "gemini-2.5-flash-lite",
+        standard_model: str = "gemini-2.5-flash",
+        strong_model: str = "gemini-2.5-pro",
+        task_models: Optional[Dict[str, str]] = None,
+        simple_max_words: int = 12,
+        complex_min_words: int = 25,
+        preference_mode: str = "ceiling",
+        aliases: Optional[Dict[str, str]] = None,
+        prices: Optional[Dict[str, Tuple[float, float]]] = None,
+        enabled: bool = True,
+        latency_samples: int = 512
+    ):
+        self.light_model = light_model
+        self.standard_model = standard_model
+        self.strong_model = strong_model
+        # Tasks routed by type alone
+        self.task_models = task_models if task_models is not None else {"variants": light_model, "content": light_model}
+        self.simple_max_words = simple_max_words
+        self.complex_min_words = complex_min_words
+        self.preference_mode = preference_mode
+        self.aliases = aliases if aliases is not None else dict(DEFAULT_MODEL_ALIASES)
+        self.prices = prices if prices is not None else dict(DEFAULT_MODEL_PRICES)
+        self.enabled = enabled
+        self.latency_samples = latency_samples
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def resolve(self, model_name: str) -> str:
+        return self.aliases.get(model_name, model_name)
+
+    def complexity(self, question: str) -> str:
+        """"simple", "standard" or "complex" """
+        text = question.lower()
+        words = len(_WORD_PATTERN.findall(text))
+        has_markers = any(marker in text for marker in COMPLEX_MARKERS)
+        if words <= self.simple_max_words and not has_markers:
+            return "simple"
+        if words >= self.complex_min_words and has_markers:
+            return "complex"
+        return "standard"
+
+    def route(self, task: str, question: Optional[str] = None, preference: Optional[str] = None) -> ModelRoute:
+        """Model for one call of `task` (`question` and `preference` only matter for answers)"""
+        if not self.enabled:
+            if preference:
+                return ModelRoute(f"{task}:preferred", self.resolve(preference))
+            return ModelRoute(task, self.standard_model)
+
+        if task in self.task_models:
+            return ModelRoute(task, self.task_models[task])
+
+        level = self.complexity(question) if question else "standard"
+        if preference:
+            if self.preference_mode == "strict" or level != "simple":
+                return ModelRoute(f"{task}:preferred", self.resolve(preference))
+        model = {"simple": self.light_model, "complex": self.strong_model}.get(level, self.standard_model)
+        return ModelRoute(f"{task}:{level}", model)
+
+    def _cost(self, model: str, prompt_tokens: int, cached_tokens: int, output_tokens: int) -> float:
+        input_price, output_price = self.prices.get(model, (0.0, 0.0))
+        billed_input = (prompt_tokens - cached_tokens) + cached_tokens * CACHED_INPUT_PRICE_FACTOR
+        return (billed_input * input_price + output_tokens * output_price) / 1_000_000
+
+    def record(self, route: ModelRoute, latency: float, response=None, error: bool = False):
+        """Account one finished call of `route`"""
+        metadata = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(metadata, "prompt_token_count", 0) or 0
+        cached_tokens = getattr(metadata, "cached_content_token_count", 0) or 0
+        total_tokens = getattr(metadata, "total_token_count", 0) or 0
+        # total_token_count includes the thinking tokens that candidates_token_count leaves out
+        output_tokens = max(getattr(metadata, "candidates_token_count", 0) or 0, total_tokens - prompt_tokens)
+
+        with self._lock:
+            stats = self._stats.get(route.name)
+            if stats is None:
+                stats = self._stats[route.name] = {
+                    "calls": 0, "errors": 0, "latency_total": 0.0, "prompt_tokens": 0,
+                    "cached_tokens": 0, "output_tokens": 0, "cost_usd": 0.0, "models": {}
+                }
+                self._latencies[route.name] = deque(maxlen=self.latency_samples)
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["latency_total"] += latency
+            stats["prompt_tokens"] += prompt_tokens
+            stats["cached_tokens"] += cached_tokens
+            stats["output_tokens"] += output_tokens
+            stats["cost_usd"] += self._cost(route.model, prompt_tokens, cached_tokens, output_tokens)
+            stats["models"][route.model] = stats["models"].get(route.model, 0) + 1
+            if not error:
+                self._latencies[route.name].append(latency)
+
+    def latency_percentile(self, route_name: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Latency percentile (seconds) of the recent successful calls of a route"""
+        with self._lock:
+            samples = sorted(self._latencies.get(route_name, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def get_stats(self) -> Dict[str, Any]:
+        routes = {}
+        with self._lock:
+            items = [(name, dict(stats, models=dict(stats["models"]))) for name, stats in self._stats.items()]
+        for name, stats in items:
+            calls = stats.pop("calls")
+            latency_total = stats.pop("latency_total")
+            p50, p95 = self.latency_percentile(name, 50), self.latency_percentile(name, 95)
+            routes[name] = {
+                "calls": calls,
+                **stats,
+                "cost_usd": round(stats["cost_usd"], 6),
+                "avg_cost_usd": round(stats["cost_usd"] / calls, 8) if calls else 0.0,
+                "avg_latency_ms": round(latency_total / calls * 1000, 1) if calls else 0.0,
+                "p50_latency_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None
+            }
+        return {
+            "enabled": self.enabled,
+            "models": {"light": self.light_model, "standard": self.standard_model, "strong": self.strong_model},
+            "task_models": dict(self.task_models),
+            "preference_mode": self.preference_mode,
+            "routes": routes
+        }
+
+
+def _parse_mapping(value: str) -> Dict[str, str]:
+    """"a=b,c=d" -> {"a": "b", "c": "d"}"""
+    mapping = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, target = item.split("=", 1)
+            mapping[name.strip()] = target.strip()
+    return mapping
+
+
+def create_model_router(standard_model: str) -> ModelRouter:
+    """Build the model router from environment settings"""
+    light_model = os.getenv("GEMINI_MODEL_LIGHT", "gemini-2.5-flash-lite")
+    task_models = {"variants": light_model, "content": light_model}
+    task_models.update(_parse_mapping(os.getenv("GEMINI_TASK_MODELS", "")))
+
+    prices = dict(DEFAULT_MODEL_PRICES)
+    if os.getenv("GEMINI_MODEL_PRICES"):
+        try:
+            prices.update({name: tuple(price) for name, price in json.loads(os.getenv("GEMINI_MODEL_PRICES")).items()})
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring invalid GEMINI_MODEL_PRICES: {e}")
+
+    return ModelRouter(
+        light_model=light_model,
+        standard_model=os.getenv("GEMINI_MODEL_STANDARD", standard_model),
+        strong_model=os.getenv("GEMINI_MODEL_STRONG", "gemini-2.5-pro"),
+        task_models=task_models,
+        simple_max_words=int(os.getenv("GEMINI_ROUTING_SIMPLE_MAX_WORDS", 12)),
+        complex_min_words=int(os.getenv("GEMINI_ROUTING_COMPLEX_MIN_WORDS", 25)),
+        preference_mode=os.getenv("GEMINI_ROUTING_PREFERENCE_MODE", "ceiling").lower(),
+        aliases={**DEFAULT_MODEL_ALIASES, **_parse_mapping(os.getenv("GEMINI_MODEL_ALIASES", ""))},
+        prices=prices,
+        enabled=os.getenv("GEMINI_ROUTING_ENABLED", "true").lower() == "true"
+    )
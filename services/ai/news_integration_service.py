@@ -1,18 +1,21 @@
 import asyncio
 import logging
+import os
 import time
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 import json
 import hashlib
 import uuid
 
-from .web_scraping_service import web_scraping_service, ScrapedArticle
-from .embedding_service import embedding_service
-from .qdrant_service import qdrant_service
-from .gemini_service import gemini_service
+from services.registry import registry, embedding_service, qdrant_service, gemini_service, web_scraping_service
 from config.logging_config import get_logger, log_function_entry, log_function_exit, log_performance
 
+if TYPE_CHECKING:
+    # Importing the scraper pulls in aiohttp and bs4; only needed for annotations
+    from .web_scraping_service import ScrapedArticle
+
 logger = get_logger(__name__)
 
 class NewsIntegrationService:
@@ -30,6 +33,9 @@ class NewsIntegrationService:
         self.last_update_time = None
         self.update_interval_hours = 6  # Update every 6 hours
         self.max_articles_per_update = 100
+        self.news_ttl_days = int(os.getenv("NEWS_TTL_DAYS", 30))
+        self.expiry_interval_hours = float(os.getenv("NEWS_EXPIRY_INTERVAL_HOURS", 6))
+        self._expiry_task: Optional[asyncio.Task] = None
         self.qa_generation_prompt = """
         تحويل المقال الإخباري إلى أسئلة وأجوبة:
         
@@ -171,7 +177,7 @@ class NewsIntegrationService:
             logger.error(f"Failed to scrape fresh news: {e}")
             return {"status": "error", "error": str(e)}
     
-    async def _convert_articles_to_qa(self, articles: List[ScrapedArticle]) -> List[Dict[str, Any]]:
+    async def _convert_articles_to_qa(self, articles: List["ScrapedArticle"]) -> List[Dict[str, Any]]:
         """Convert scraped articles to Q&A pairs using Gemini"""
         qa_pairs = []
         
@@ -188,7 +194,7 @@ class NewsIntegrationService:
         
         return qa_pairs
     
-    async def _generate_qa_from_article(self, article: ScrapedArticle) -> List[Dict[str, Any]]:
+    async def _generate_qa_from_article(self, article: "ScrapedArticle") -> List[Dict[str, Any]]:
         """Generate Q&A pairs from a single article using Gemini"""
         try:
             # Prepare the prompt
@@ -229,7 +235,7 @@ class NewsIntegrationService:
             logger.warning(f"Failed to generate Q&A from article {article.url}: {e}")
             return []
     
-    def _process_qa_pair(self, qa_pair: Dict[str, Any], article: ScrapedArticle) -> Optional[Dict[str, Any]]:
+    def _process_qa_pair(self, qa_pair: Dict[str, Any], article: "ScrapedArticle") -> Optional[Dict[str, Any]]:
         """Process and enhance a Q&A pair with metadata"""
         try:
             question = qa_pair.get("question", "").strip()
@@ -285,8 +291,20 @@ class NewsIntegrationService:
                     # Store in Qdrant
                     metadata = qa_pair["metadata"].copy() if qa_pair["metadata"] else {}
                     metadata["answer"] = qa_pair["answer"]
+                    metadata["category"] = qa_pair["category"]
+                    metadata["source"] = qa_pair["source"]
+                    metadata["keywords"] = qa_pair["keywords"]
+
+                    # Numeric timestamps so expired news can be deleted by range filter
+                    ingested_at = time.time()
+                    original_article = metadata.get("original_article") or {}
+                    metadata["ingested_at"] = ingested_at
+                    metadata["published_at"] = self._parse_published_timestamp(
+                        original_article.get("published_date")
+                    ) or ingested_at
+
                     success = await qdrant_service.store_qa_embedding(
-                        qa_id=qa_pair["id"],
+                        qa_id=str(qa_pair["id"]),
                         question=qa_pair["question"],
                         embedding=question_embedding,
                         metadata=metadata
@@ -362,24 +380,83 @@ class NewsIntegrationService:
             logger.error(f"Failed to search news Q&A: {e}")
             return []
     
-    async def clear_old_news(self, days_old: int = 30) -> Dict[str, Any]:
-        """Clear old news articles from the knowledge base"""
+    @staticmethod
+    def _parse_published_timestamp(published_date: Optional[str]) -> Optional[float]:
+        """Convert an RSS (RFC 822) or ISO 8601 date string to a unix timestamp"""
+        if not published_date:
+            return None
+
+        for parser in (parsedate_to_datetime, datetime.fromisoformat):
+            try:
+                return parser(published_date.strip()).timestamp()
+            except (TypeError, ValueError, IndexError):
+                continue
+
+        logger.debug(f"Could not parse published date: {published_date}")
+        return None
+
+    async def clear_old_news(self, days_old: Optional[int] = None) -> Dict[str, Any]:
+        """Delete news vectors published more than `days_old` days ago from Qdrant"""
+        log_function_entry(logger, "clear_old_news", days_old=days_old)
+        start_time = time.time()
+
         try:
+            days_old = days_old if days_old is not None else self.news_ttl_days
             cutoff_date = datetime.now() - timedelta(days=days_old)
-            
-            # This would require implementing a method in Qdrant service to delete old entries
-            # For now, we'll just log the intention
-            logger.info(f"Would clear news articles older than {cutoff_date.isoformat()}")
-            
+
+            result = await qdrant_service.delete_points_before(
+                timestamp_field="published_at",
+                cutoff=cutoff_date.timestamp(),
+                filters={"category": "news"}
+            )
+            if result.get("status") != "success":
+                return {"status": "error", "error": result.get("message"), "cutoff_date": cutoff_date.isoformat()}
+
+            duration = time.time() - start_time
+            log_performance(logger, "News expiry", duration,
+                          removed_count=result["removed_count"],
+                          reclaimed_vector_bytes=result["reclaimed_vector_bytes"])
+            log_function_exit(logger, "clear_old_news", result=result, duration=duration)
+
+            logger.info(f"🧹 Removed {result['removed_count']} news points older than {cutoff_date.isoformat()}")
             return {
                 "status": "success",
-                "message": f"Would clear news older than {days_old} days",
-                "cutoff_date": cutoff_date.isoformat()
+                "cutoff_date": cutoff_date.isoformat(),
+                "removed_count": result["removed_count"],
+                "points_before": result["points_before"],
+                "points_after": result["points_after"],
+                "reclaimed_vector_bytes": result["reclaimed_vector_bytes"],
+                "processing_time": duration
             }
-            
+
         except Exception as e:
             logger.error(f"Failed to clear old news: {e}")
             return {"status": "error", "error": str(e)}
 
+    async def _expiry_loop(self):
+        """Periodically delete expired news vectors"""
+        while True:
+            result = await self.clear_old_news()
+            if result.get("status") != "success":
+                logger.warning(f"⚠️ Scheduled news expiry failed: {result.get('error')}")
+            await asyncio.sleep(self.expiry_interval_hours * 3600)
+
+    def start_expiry_scheduler(self):
+        """Start the background news expiry job (idempotent)"""
+        if self._expiry_task and not self._expiry_task.done():
+            return
+        self._expiry_task = asyncio.create_task(self._expiry_loop())
+        logger.info(f"🕒 News expiry scheduled every {self.expiry_interval_hours}h (TTL {self.news_ttl_days} days)")
+
+    async def stop_expiry_scheduler(self):
+        """Cancel the background news expiry job"""
+        if self._expiry_task and not self._expiry_task.done():
+            self._expiry_task.cancel()
+            try:
+                await self._expiry_task
+            except asyncio.CancelledError:
+                pass
+        self._expiry_task = None
+
 # Global news integration service instance
-news_integration_service = NewsIntegrationService()
+news_integration_service = registry.proxy("news_integration_service")
@@ -1,16 +1,22 @@
 import os
+import time
 import logging
 import asyncio
+from pathlib import Path
 from typing import Dict, List, Optional, Any
-from uuid import uuid4
+from uuid import uuid4, uuid5, NAMESPACE_URL
 
+import httpx
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
-    Distance, VectorParams, PointStruct, Filter, FieldCondition, Range, MatchValue
+    Distance, VectorParams, PointStruct, Filter, FieldCondition, Range, MatchValue,
+    PointIdsList, PayloadSchemaType, FilterSelector, MatchAny, HnswConfigDiff, SearchParams, QuantizationSearchParams,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType, BinaryQuantization,
+    BinaryQuantizationConfig, VectorParamsDiff, Disabled, KeywordIndexParams, KeywordIndexType
 )
 
 # Import embedding service for generating embeddings of variants
-from .embedding_service import embedding_service
+from services.registry import registry, embedding_service
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +29,9 @@ class QdrantService:
     """
 
     def __init__(self):
+        # "server" connects to host:port; "local" runs Qdrant embedded (in memory or on a local path)
+        self.mode = os.getenv("QDRANT_MODE", "server").lower()
+        self.local_path = os.getenv("QDRANT_PATH", ":memory:")
         # Use localhost when running outside Docker, qdrant when inside Docker
         default_host = "localhost" if not os.getenv("DOCKER_ENV") else "qdrant"
         self.host = os.getenv("QDRANT_HOST", default_host)
@@ -31,13 +40,46 @@ class QdrantService:
         self.embedding_dimension = int(os.getenv("EMBEDDING_DIM", 768))
         self.client: Optional[QdrantClient] = None
 
+        # Index tuning: quantization (none | scalar | binary), HNSW graph and vector storage
+        self.quantization = os.getenv("QDRANT_QUANTIZATION", "none").lower()
+        self.quantization_always_ram = os.getenv("QDRANT_QUANTIZATION_ALWAYS_RAM", "true").lower() == "true"
+        self.quantization_rescore = os.getenv("QDRANT_QUANTIZATION_RESCORE", "true").lower() == "true"
+        self.quantization_oversampling = float(os.getenv("QDRANT_QUANTIZATION_OVERSAMPLING", 2.0))
+        self.hnsw_m = int(os.getenv("QDRANT_HNSW_M", 16))
+        self.hnsw_ef_construct = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", 100))
+        self.hnsw_ef = int(os.getenv("QDRANT_HNSW_EF", 128))
+        self.on_disk_vectors = os.getenv("QDRANT_ON_DISK_VECTORS", "false").lower() == "true"
+        # Built once: it is consulted by every search
+        self.quantization_config = self._build_quantization_config()
+
+        # Payload fields used in filters (category routing, news expiry)
+        self.payload_indexes = {
+            "qa_id": PayloadSchemaType.KEYWORD,
+            # Tenant index: points of one category are stored together, so a
+            # category-filtered search only visits that partition
+            "category": KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True),
+            "published_at": PayloadSchemaType.FLOAT,
+            "ingested_at": PayloadSchemaType.FLOAT
+        }
+
         self._initialize_client()
 
+    @property
+    def is_local(self) -> bool:
+        return self.mode == "local"
+
     def _initialize_client(self):
         """Initialize Qdrant client"""
         try:
-            self.client = QdrantClient(host=self.host, port=self.port)
-            logger.info(f"Qdrant client connected to {self.host}:{self.port}")
+            if self.is_local:
+                if self.local_path == ":memory:":
+                    self.client = QdrantClient(location=":memory:")
+                else:
+                    self.client = QdrantClient(path=self.local_path)
+                logger.info(f"Qdrant running in embedded local mode ({self.local_path})")
+            else:
+                self.client = QdrantClient(host=self.host, port=self.port)
+                logger.info(f"Qdrant client connected to {self.host}:{self.port}")
         except Exception as e:
             logger.error(f"Failed to connect to Qdrant: {e}")
             self.client = None
@@ -57,16 +99,131 @@ class QdrantService:
                     collection_name=self.collection_name,
                     vectors_config=VectorParams(
                         size=self.embedding_dimension,
-                        distance=Distance.COSINE
-                    )
+                        distance=Distance.COSINE,
+                        on_disk=self.on_disk_vectors
+                    ),
+                    hnsw_config=self._build_hnsw_config(),
+                    quantization_config=self.quantization_config
+                )
+                logger.info(
+                    f"Created Qdrant collection: {self.collection_name} "
+                    f"(quantization={self.quantization}, m={self.hnsw_m}, "
+                    f"ef_construct={self.hnsw_ef_construct}, on_disk={self.on_disk_vectors})"
                 )
-                logger.info(f"Created Qdrant collection: {self.collection_name}")
             else:
                 logger.info(f"Qdrant collection {self.collection_name} already exists")
+                await self._migrate_collection_config()
+
+            await self._ensure_payload_indexes()
 
         except Exception as e:
             logger.error(f"Failed to ensure collection exists: {e}")
 
+    def _build_quantization_config(self):
+        """Quantization config for the configured mode (None keeps full float32 vectors)"""
+        if self.quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=self.quantization_always_ram
+                )
+            )
+        if self.quantization == "binary":
+            return BinaryQuantization(
+                binary=BinaryQuantizationConfig(always_ram=self.quantization_always_ram)
+            )
+        if self.quantization != "none":
+            logger.warning(f"Unknown QDRANT_QUANTIZATION '{self.quantization}', quantization disabled")
+        return None
+
+    def _build_hnsw_config(self) -> HnswConfigDiff:
+        return HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def _build_search_params(self, exact: bool = False) -> SearchParams:
+        """Search-time params: hnsw_ef, plus rescoring/oversampling when quantized"""
+        quantization_params = None
+        if self.quantization_config is not None:
+            quantization_params = QuantizationSearchParams(
+                ignore=exact,
+                rescore=self.quantization_rescore,
+                oversampling=self.quantization_oversampling
+            )
+        return SearchParams(hnsw_ef=self.hnsw_ef, exact=exact, quantization=quantization_params)
+
+    @staticmethod
+    def _config_differs(current: Any, desired: Any) -> bool:
+        """True when a field set in `desired` differs in `current` (fields the server adds are ignored)"""
+        if isinstance(desired, dict):
+            return not isinstance(current, dict) or any(
+                QdrantService._config_differs(current.get(name), value) for name, value in desired.items()
+            )
+        return current != desired
+
+    def _quantization_changed(self, current_quantization) -> bool:
+        desired_quantization = self.quantization_config
+        if type(current_quantization) is not type(desired_quantization):
+            return True
+        if desired_quantization is None:
+            return False
+        return self._config_differs(
+            current_quantization.model_dump(mode="json"),
+            desired_quantization.model_dump(mode="json", exclude_none=True)
+        )
+
+    async def _migrate_collection_config(self):
+        """Apply configured HNSW, quantization and on-disk settings to an existing collection in place"""
+        if self.is_local:
+            # Local mode is brute force: HNSW and quantization settings do not apply
+            return
+        try:
+            info = await asyncio.to_thread(
+                self.client.get_collection,
+                collection_name=self.collection_name
+            )
+            config = info.config
+            current_hnsw = config.hnsw_config
+            current_quantization = config.quantization_config
+            current_on_disk = bool(getattr(config.params.vectors, "on_disk", False))
+
+            hnsw_changed = (current_hnsw.m != self.hnsw_m or
+                            current_hnsw.ef_construct != self.hnsw_ef_construct)
+            quantization_changed = self._quantization_changed(current_quantization)
+            on_disk_changed = current_on_disk != self.on_disk_vectors
+
+            if not (hnsw_changed or quantization_changed or on_disk_changed):
+                return
+
+            await asyncio.to_thread(
+                self.client.update_collection,
+                collection_name=self.collection_name,
+                vectors_config={"": VectorParamsDiff(on_disk=self.on_disk_vectors)} if on_disk_changed else None,
+                hnsw_config=self._build_hnsw_config() if hnsw_changed else None,
+                quantization_config=(self.quantization_config or Disabled.DISABLED) if quantization_changed else None
+            )
+            logger.info(
+                f"Migrated Qdrant collection {self.collection_name} config "
+                f"(hnsw={hnsw_changed}, quantization={quantization_changed}, on_disk={on_disk_changed})"
+            )
+        except Exception as e:
+            logger.error(f"Failed to migrate collection config: {e}")
+
+    async def _ensure_payload_indexes(self):
+        """Create payload indexes for fields used in filters (no-op if they already exist)"""
+        if self.is_local:
+            # Local mode filters by brute force; payload indexes are not supported
+            return
+        for field_name, field_schema in self.payload_indexes.items():
+            try:
+                await asyncio.to_thread(
+                    self.client.create_payload_index,
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema
+                )
+            except Exception as e:
+                logger.debug(f"Payload index for {field_name} not created: {e}")
+
     def is_connected(self) -> bool:
         """Check if Qdrant client is connected"""
         if not self.client:
@@ -150,6 +307,8 @@ class QdrantService:
                 for key, value in filters.items():
                     if isinstance(value, str):
                         conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
+                    elif isinstance(value, list):
+                        conditions.append(FieldCondition(key=key, match=MatchAny(any=value)))
                     elif isinstance(value, (int, float)):
                         conditions.append(FieldCondition(key=key, range=Range(gte=value)))
                 if conditions:
@@ -162,26 +321,153 @@ class QdrantService:
                 limit=limit,
                 score_threshold=score_threshold,
                 query_filter=query_filter,
+                search_params=self._build_search_params(),
                 with_payload=True,
                 with_vectors=False
             )
 
-            results = []
-            for hit in search_result:
-                results.append({
-                    "qa_id": hit.payload.get("qa_id"),
-                    "question": hit.payload.get("question"),
-                    "answer": hit.payload.get("answer"),
-                    "similarity_score": float(hit.score),
-                    "metadata": {k: v for k, v in hit.payload.items() if k not in ["qa_id", "question", "answer"]}
-                })
-            return results
+            categories = (filters or {}).get("category")
+            if isinstance(categories, str):
+                categories = [categories]
+            return self._merge_search_hits(search_result, limit, categories)
 
         except Exception as e:
             logger.error(f"Failed to search similar questions: {e}")
             return []
 
-    async def add_qa_pair(
+    @staticmethod
+    def _merge_search_hits(hits, limit: int, categories: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Turn search hits into one result per Q&A pair.
+
+        A shared variant point expands into the pairs that use that question (only
+        those of `categories` when the search was filtered by category). They tie
+        on similarity, so they are ranked by how well their own pair point matched
+        the query (when it was among the hits), then by confidence.
+        """
+        pair_scores = {
+            hit.payload.get("qa_id"): float(hit.score)
+            for hit in hits if "answers" not in hit.payload
+        }
+        candidates = []
+        for hit in hits:
+            payload = hit.payload
+            if "answers" in payload:
+                for member in payload["answers"]:
+                    if categories and member.get("category") not in categories:
+                        continue
+                    candidates.append(((float(hit.score), pair_scores.get(member["qa_id"], 0.0), member.get("confidence", 0.0)), {
+                        "qa_id": member["qa_id"],
+                        "question": payload.get("question"),
+                        "answer": member.get("answer"),
+                        "similarity_score": float(hit.score),
+                        "metadata": {
+                            **{k: v for k, v in member.items() if k not in ["qa_id", "answer"]},
+                            "is_variant": True,
+                            "shared_variant_answers": len(payload["answers"])
+                        }
+                    }))
+            else:
+                candidates.append(((float(hit.score), float(hit.score), payload.get("confidence", 0.0)), {
+                    "qa_id": payload.get("qa_id"),
+                    "question": payload.get("question"),
+                    "answer": payload.get("answer"),
+                    "similarity_score": float(hit.score),
+                    "metadata": {k: v for k, v in payload.items() if k not in ["qa_id", "question", "answer"]}
+                }))
+
+        results, seen = [], set()
+        for _, result in sorted(candidates, key=lambda candidate: candidate[0], reverse=True):
+            if result["qa_id"] is not None:
+                if result["qa_id"] in seen:
+                    continue
+                seen.add(result["qa_id"])
+            results.append(result)
+            if len(results) >= limit:
+                break
+        return results
+
+    @staticmethod
+    def qa_point_id(qa_id: str, index: int) -> str:
+        """Deterministic point ID so re-ingesting a pair overwrites its points instead of duplicating them"""
+        return str(uuid5(NAMESPACE_URL, f"syria-qa:{qa_id}:{index}"))
+
+    async def delete_qa_points(self, qa_ids: List[str], batch_size: int = 256) -> bool:
+        """Delete every point (main question and variants) belonging to the given Q&A pairs"""
+        if not qa_ids:
+            return True
+        if not self.client or not self.is_connected():
+            logger.error("Qdrant client not connected")
+            return False
+
+        try:
+            for start in range(0, len(qa_ids), batch_size):
+                batch = qa_ids[start:start + batch_size]
+                await asyncio.to_thread(
+                    self.client.delete,
+                    collection_name=self.collection_name,
+                    points_selector=FilterSelector(
+                        filter=Filter(must=[FieldCondition(key="qa_id", match=MatchAny(any=batch))])
+                    ),
+                    wait=True
+                )
+            logger.debug(f"Deleted points of {len(qa_ids)} Q&A pairs")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete Q&A points: {e}")
+            return False
+
+    async def delete_points_by_category(self, categories: List[str]) -> bool:
+        """
+        Delete every point whose category is one of `categories` (shared variant
+        points match when any of their categories does). Points of other
+        categories, e.g. user_generated and news, are left untouched.
+        """
+        if not categories:
+            return True
+        if not self.client or not self.is_connected():
+            logger.error("Qdrant client not connected")
+            return False
+
+        try:
+            await asyncio.to_thread(
+                self.client.delete,
+                collection_name=self.collection_name,
+                points_selector=FilterSelector(
+                    filter=Filter(must=[FieldCondition(key="category", match=MatchAny(any=list(categories)))])
+                ),
+                wait=True
+            )
+            logger.info(f"Deleted points of {len(categories)} categories from {self.collection_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete points by category: {e}")
+            return False
+
+    async def count_points_outside_categories(self, categories: List[str]) -> Optional[int]:
+        """
+        Count the points whose category is none of `categories` (untagged points
+        included); None when the count fails.
+        """
+        if not self.client or not self.is_connected():
+            logger.error("Qdrant client not connected")
+            return None
+
+        try:
+            result = await asyncio.to_thread(
+                self.client.count,
+                collection_name=self.collection_name,
+                count_filter=Filter(
+                    must_not=[FieldCondition(key="category", match=MatchAny(any=list(categories)))]
+                ) if categories else None,
+                exact=True
+            )
+            return result.count
+        except Exception as e:
+            logger.error(f"Failed to count points outside categories: {e}")
+            return None
+
+    def build_qa_points(
         self,
         qa_id: str,
         question_variants: List[str],
@@ -190,42 +476,152 @@ class QdrantService:
         confidence: float,
         source: str,
         category: str,
-        embedding: List[float]
-    ) -> bool:
-        """Add a Q&A pair to Qdrant with all variants"""
+        embedding: List[float],
+        variant_embeddings: Optional[Dict[int, List[float]]] = None
+    ) -> List[PointStruct]:
+        """
+        Build the points of a Q&A pair: the main point (embedding of the whole pair)
+        plus one point per embedded variant, keyed by the variant's index.
+        """
+        main_question = question_variants[0] if question_variants else ""
+        payload = {
+            "qa_id": qa_id,
+            "question": main_question,
+            "answer": answer,
+            "keywords": keywords,
+            "confidence": confidence,
+            "source": source,
+            "category": category,
+            "question_variants": question_variants
+        }
+
+        points = [PointStruct(id=self.qa_point_id(qa_id, 0), vector=embedding, payload=payload)]
+        for variant_index, variant_embedding in (variant_embeddings or {}).items():
+            variant_payload = payload.copy()
+            variant_payload["question"] = question_variants[variant_index]
+            variant_payload["is_variant"] = True
+            points.append(PointStruct(
+                id=self.qa_point_id(qa_id, variant_index),
+                vector=variant_embedding,
+                payload=variant_payload
+            ))
+        return points
+
+    @staticmethod
+    def variant_point_id(text: str) -> str:
+        """Deterministic point ID of a shared question variant (one point per distinct text)"""
+        return str(uuid5(NAMESPACE_URL, f"syria-variant:{text}"))
+
+    @staticmethod
+    def build_variant_payload(text: str, members: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Payload of a shared variant point: the question text and the answers of
+        every Q&A pair that lists it, highest confidence first.
+        """
+        answers = sorted(members, key=lambda member: member.get("confidence", 0.0), reverse=True)
+        return {
+            "question": text,
+            "is_variant": True,
+            "qa_ids": [member["qa_id"] for member in answers],
+            "answers": answers,
+            # Lists match a filter value when any element matches
+            "category": sorted({member["category"] for member in answers}),
+            "source": sorted({member["source"] for member in answers}),
+            "confidence": max((member.get("confidence", 0.0) for member in answers), default=0.0)
+        }
+
+    def build_variant_point(self, text: str, members: List[Dict[str, Any]], embedding: List[float]) -> PointStruct:
+        return PointStruct(
+            id=self.variant_point_id(text),
+            vector=embedding,
+            payload=self.build_variant_payload(text, members)
+        )
+
+    async def update_variant_payloads(self, groups: Dict[str, List[Dict[str, Any]]]) -> bool:
+        """Rewrite the answers of shared variant points whose pairs changed (no re-embedding)"""
+        if not groups:
+            return True
         if not self.client or not self.is_connected():
             logger.error("Qdrant client not connected")
             return False
 
         try:
-            # Store the main question (first variant)
-            main_question = question_variants[0] if question_variants else ""
-            
-            payload = {
-                "qa_id": qa_id,
-                "question": main_question,
-                "answer": answer,
-                "keywords": keywords,
-                "confidence": confidence,
-                "source": source,
-                "category": category,
-                "question_variants": question_variants
-            }
+            for text, members in groups.items():
+                await asyncio.to_thread(
+                    self.client.overwrite_payload,
+                    collection_name=self.collection_name,
+                    payload=self.build_variant_payload(text, members),
+                    points=[self.variant_point_id(text)]
+                )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update {len(groups)} variant payloads: {e}")
+            return False
 
-            point = PointStruct(
-                id=str(uuid4()),
-                vector=embedding,
-                payload=payload
-            )
+    async def delete_variant_points(self, texts: List[str], batch_size: int = 256) -> bool:
+        """Delete shared variant points no Q&A pair uses any more"""
+        if not texts:
+            return True
+        if not self.client or not self.is_connected():
+            logger.error("Qdrant client not connected")
+            return False
 
+        try:
+            for start in range(0, len(texts), batch_size):
+                await asyncio.to_thread(
+                    self.client.delete,
+                    collection_name=self.collection_name,
+                    points_selector=PointIdsList(
+                        points=[self.variant_point_id(text) for text in texts[start:start + batch_size]]
+                    ),
+                    wait=True
+                )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete variant points: {e}")
+            return False
+
+    async def upsert_points(self, points: List[PointStruct]) -> bool:
+        """Upsert a batch of prepared points in one request"""
+        if not points:
+            return True
+        if not self.client or not self.is_connected():
+            logger.error("Qdrant client not connected")
+            return False
+
+        try:
             await asyncio.to_thread(
                 self.client.upsert,
                 collection_name=self.collection_name,
-                points=[point]
+                points=points
             )
-            
-            # Store additional variants if they exist
-            for variant in question_variants[1:]:
+            return True
+        except Exception as e:
+            logger.error(f"Failed to upsert {len(points)} points: {e}")
+            return False
+
+    async def add_qa_pair(
+        self,
+        qa_id: str,
+        question_variants: List[str],
+        answer: str,
+        keywords: List[str],
+        confidence: float,
+        source: str,
+        category: str,
+        embedding: List[float]
+    ) -> bool:
+        """Add a Q&A pair to Qdrant with all variants"""
+        if not self.client or not self.is_connected():
+            logger.error("Qdrant client not connected")
+            return False
+
+        try:
+            main_question = question_variants[0] if question_variants else ""
+
+            # Embed additional variants if they exist
+            variant_embeddings = {}
+            for variant_index, variant in enumerate(question_variants[1:], start=1):
                 if variant and variant != main_question:
                     # Guard: ensure embedding_service is available
                     if not embedding_service.is_available():
@@ -233,22 +629,15 @@ class QdrantService:
                         continue
                     variant_embedding = await embedding_service.generate_embedding(variant)
                     if variant_embedding:
-                        variant_payload = payload.copy()
-                        variant_payload["question"] = variant
-                        variant_payload["is_variant"] = True
-                        
-                        variant_point = PointStruct(
-                            id=str(uuid4()),
-                            vector=variant_embedding,
-                            payload=variant_payload
-                        )
-                        
-                        await asyncio.to_thread(
-                            self.client.upsert,
-                            collection_name=self.collection_name,
-                            points=[variant_point]
-                        )
-            
+                        variant_embeddings[variant_index] = variant_embedding
+
+            points = self.build_qa_points(
+                qa_id, question_variants, answer, keywords, confidence, source, category,
+                embedding, variant_embeddings
+            )
+            if not await self.upsert_points(points):
+                return False
+
             logger.debug(f"Successfully stored Q&A pair {qa_id} with {len(question_variants)} variants")
             return True
             
@@ -309,6 +698,218 @@ class QdrantService:
             logger.error(f"Failed to get collection stats: {e}")
             return {"status": "error", "message": str(e)}
 
+    async def delete_points_before(
+        self,
+        timestamp_field: str,
+        cutoff: float,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 256
+    ) -> Dict[str, Any]:
+        """
+        Delete points whose numeric timestamp payload field is older than cutoff.
+        Points are scrolled and deleted in batches so large expiries never hold
+        a single huge request; returns the number of removed points and the
+        estimated reclaimed vector storage.
+        """
+        if not self.client or not self.is_connected():
+            return {"status": "error", "message": "Qdrant not connected"}
+
+        conditions = [FieldCondition(key=timestamp_field, range=Range(lt=cutoff))]
+        for key, value in (filters or {}).items():
+            conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
+        expiry_filter = Filter(must=conditions)
+
+        try:
+            points_before = (await asyncio.to_thread(
+                self.client.get_collection,
+                collection_name=self.collection_name
+            )).points_count or 0
+
+            removed = 0
+            while True:
+                records, _ = await asyncio.to_thread(
+                    self.client.scroll,
+                    collection_name=self.collection_name,
+                    scroll_filter=expiry_filter,
+                    limit=batch_size,
+                    with_payload=False,
+                    with_vectors=False
+                )
+                if not records:
+                    break
+
+                await asyncio.to_thread(
+                    self.client.delete,
+                    collection_name=self.collection_name,
+                    points_selector=PointIdsList(points=[record.id for record in records]),
+                    wait=True
+                )
+                removed += len(records)
+                logger.debug(f"Deleted batch of {len(records)} expired points")
+
+                if len(records) < batch_size:
+                    break
+
+            points_after = (await asyncio.to_thread(
+                self.client.get_collection,
+                collection_name=self.collection_name
+            )).points_count or 0
+
+            # float32 vectors: 4 bytes per dimension (payload storage not included)
+            reclaimed_bytes = removed * self.embedding_dimension * 4
+
+            logger.info(f"Deleted {removed} points with {timestamp_field} < {cutoff} from {self.collection_name}")
+            return {
+                "status": "success",
+                "removed_count": removed,
+                "points_before": points_before,
+                "points_after": points_after,
+                "reclaimed_vector_bytes": reclaimed_bytes
+            }
+        except Exception as e:
+            logger.error(f"Failed to delete expired points: {e}")
+            return {"status": "error", "message": str(e)}
+
+    async def benchmark_recall(self, k: int = 10, sample_size: int = 100) -> Dict[str, Any]:
+        """
+        Measure recall@k of the configured (HNSW + quantization) search against an
+        exact, unquantized baseline, using stored vectors as queries.
+        """
+        if not self.client or not self.is_connected():
+            return {"status": "error", "message": "Qdrant not connected"}
+
+        try:
+            records, _ = await asyncio.to_thread(
+                self.client.scroll,
+                collection_name=self.collection_name,
+                limit=sample_size,
+                with_payload=False,
+                with_vectors=True
+            )
+            if not records:
+                return {"status": "error", "message": "Collection is empty"}
+
+            recalls = []
+            baseline_latency = 0.0
+            tuned_latency = 0.0
+            for record in records:
+                start = time.perf_counter()
+                exact_hits = await asyncio.to_thread(
+                    self.client.search,
+                    collection_name=self.collection_name,
+                    query_vector=record.vector,
+                    limit=k,
+                    search_params=self._build_search_params(exact=True),
+                    with_payload=False
+                )
+                baseline_latency += time.perf_counter() - start
+
+                start = time.perf_counter()
+                tuned_hits = await asyncio.to_thread(
+                    self.client.search,
+                    collection_name=self.collection_name,
+                    query_vector=record.vector,
+                    limit=k,
+                    search_params=self._build_search_params(),
+                    with_payload=False
+                )
+                tuned_latency += time.perf_counter() - start
+
+                expected = {hit.id for hit in exact_hits}
+                if expected:
+                    recalls.append(len(expected & {hit.id for hit in tuned_hits}) / len(expected))
+
+            full_vector_bytes = self.embedding_dimension * 4
+            quantized_vector_bytes = {
+                "scalar": self.embedding_dimension,
+                "binary": self.embedding_dimension / 8
+            }.get(self.quantization, full_vector_bytes)
+
+            return {
+                "status": "success",
+                "k": k,
+                "queries": len(records),
+                "recall_at_k": sum(recalls) / len(recalls) if recalls else 0.0,
+                "baseline_avg_latency_ms": baseline_latency / len(records) * 1000,
+                "tuned_avg_latency_ms": tuned_latency / len(records) * 1000,
+                "quantization": self.quantization,
+                "hnsw": {"m": self.hnsw_m, "ef_construct": self.hnsw_ef_construct, "hnsw_ef": self.hnsw_ef},
+                "on_disk_vectors": self.on_disk_vectors,
+                "vector_memory_ratio": quantized_vector_bytes / full_vector_bytes
+            }
+        except Exception as e:
+            logger.error(f"Failed to benchmark recall: {e}")
+            return {"status": "error", "message": str(e)}
+
+    @property
+    def rest_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def export_snapshot(self, target_path: Path) -> bool:
+        """Create a collection snapshot on the server and download it to target_path"""
+        if self.is_local:
+            logger.error("Snapshots require a Qdrant server (QDRANT_MODE=server)")
+            return False
+        if not self.client or not self.is_connected():
+            logger.error("Qdrant client not connected")
+            return False
+
+        try:
+            snapshot = await asyncio.to_thread(
+                self.client.create_snapshot,
+                collection_name=self.collection_name,
+                wait=True
+            )
+            url = f"{self.rest_url}/collections/{self.collection_name}/snapshots/{snapshot.name}"
+
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target_path.with_suffix(target_path.suffix + ".part")
+            async with httpx.AsyncClient(timeout=None) as http:
+                async with http.stream("GET", url) as response:
+                    response.raise_for_status()
+                    with open(tmp_path, "wb") as f:
+                        async for chunk in response.aiter_bytes():
+                            f.write(chunk)
+            tmp_path.replace(target_path)
+
+            # The artifact now lives on our side; drop the server copy
+            await asyncio.to_thread(
+                self.client.delete_snapshot,
+                collection_name=self.collection_name,
+                snapshot_name=snapshot.name
+            )
+            logger.info(f"Exported snapshot of {self.collection_name} to {target_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to export snapshot: {e}")
+            return False
+
+    async def import_snapshot(self, snapshot_path: Path) -> bool:
+        """Upload a snapshot file and recover the collection from it (replaces existing data)"""
+        if self.is_local:
+            logger.info("Snapshot restore skipped in local Qdrant mode")
+            return False
+        if not self.client or not self.is_connected():
+            logger.error("Qdrant client not connected")
+            return False
+
+        try:
+            url = f"{self.rest_url}/collections/{self.collection_name}/snapshots/upload"
+            async with httpx.AsyncClient(timeout=None) as http:
+                with open(snapshot_path, "rb") as f:
+                    response = await http.post(
+                        url,
+                        params={"priority": "snapshot", "wait": "true"},
+                        files={"snapshot": (snapshot_path.name, f, "application/octet-stream")}
+                    )
+                response.raise_for_status()
+
+            logger.info(f"Restored {self.collection_name} from snapshot {snapshot_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to import snapshot {snapshot_path}: {e}")
+            return False
+
     async def clear_collection(self) -> bool:
         """Clear all data from the collection"""
         if not self.client or not self.is_connected():
@@ -331,4 +932,4 @@ class QdrantService:
 
 
 # Global instance
-qdrant_service = QdrantService()
+qdrant_service = registry.proxy("qdrant_service")
@@ -0,0 +1,149 @@
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SemanticCache:
+    """
+    In-process semantic cache for hot questions.
+
+    Embeddings of recently answered questions are kept L2-normalized in a single
+    contiguous float32 matrix, so a lookup is one matrix-vector product followed
+    by an argmax (cosine top-1). The cache is bounded to `max_entries` rows and
+    evicts the least recently used (``lru``) or least frequently used (``lfu``)
+    entry when full.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        max_entries: int = 512,
+        similarity_threshold: float = 0.95,
+        eviction_policy: str = "lru"
+    ):
+        if eviction_policy not in ("lru", "lfu"):
+            raise ValueError(f"Unsupported eviction policy: {eviction_policy}")
+
+        self.dimension = dimension
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.eviction_policy = eviction_policy
+
+        self._vectors = np.zeros((max_entries, dimension), dtype=np.float32)
+        self._values: List[Any] = [None] * max_entries
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._use_count = np.zeros(max_entries, dtype=np.int64)
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _normalize(self, embedding: List[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.shape != (self.dimension,):
+            return None
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    def _best_match(self, vector: np.ndarray) -> Tuple[int, float]:
+        scores = self._vectors[:self._size] @ vector
+        index = int(np.argmax(scores))
+        return index, float(scores[index])
+
+    def _touch(self, index: int):
+        self._clock += 1
+        self._last_used[index] = self._clock
+        self._use_count[index] += 1
+
+    def _victim(self) -> int:
+        if self.eviction_policy == "lfu":
+            # Fewest uses first, least recently used among ties
+            return int(np.lexsort((self._last_used, self._use_count))[0])
+        return int(np.argmin(self._last_used))
+
+    def lookup(self, embedding: List[float]) -> Optional[Tuple[Any, float]]:
+        """Return (value, similarity) of the closest cached question above the threshold"""
+        vector = self._normalize(embedding)
+        with self._lock:
+            if vector is None or self._size == 0:
+                self.misses += 1
+                return None
+
+            index, score = self._best_match(vector)
+            if score < self.similarity_threshold:
+                self.misses += 1
+                return None
+
+            self._touch(index)
+            self.hits += 1
+            return self._values[index], score
+
+    def add(self, embedding: List[float], value: Any):
+        """Cache value under embedding, replacing a near-identical entry or evicting one when full"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            index = None
+            if self._size:
+                closest, score = self._best_match(vector)
+                if score >= 0.999:
+                    index = closest
+
+            if index is None:
+                if self._size < self.max_entries:
+                    index = self._size
+                    self._size += 1
+                else:
+                    index = self._victim()
+                    self.evictions += 1
+
+            self._vectors[index] = vector
+            self._values[index] = value
+            self._use_count[index] = 0
+            self._touch(index)
+
+    def clear(self):
+        with self._lock:
+            self._values = [None] * self.max_entries
+            self._last_used[:] = 0
+            self._use_count[:] = 0
+            self._size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "max_entries": self.max_entries,
+            "eviction_policy": self.eviction_policy,
+            "similarity_threshold": self.similarity_threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "memory_bytes": self._vectors.nbytes
+        }
+
+
+def create_semantic_cache(dimension: int) -> Optional[SemanticCache]:
+    """Build the question cache from environment settings (None when disabled)"""
+    if os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    return SemanticCache(
+        dimension=dimension,
+        max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", 512)),
+        similarity_threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.95)),
+        eviction_policy=os.getenv("SEMANTIC_CACHE_EVICTION", "lru").lower()
+    )
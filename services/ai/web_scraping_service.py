@@ -13,6 +13,7 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from config.logging_config import get_logger, log_function_entry, log_function_exit, log_performance
+from services.registry import registry
 
 logger = get_logger(__name__)
 
@@ -859,4 +860,4 @@ class WebScrapingService:
         logger.info("🧹 Cleared scraped URLs cache")
 
 # Global web scraping service instance
-web_scraping_service = WebScrapingService()
+web_scraping_service = registry.proxy("web_scraping_service")
@@ -1,15 +1,22 @@
 # Authentication utilities to break circular dependencies
 from fastapi import Depends, HTTPException, status, Request
+from sqlalchemy import DateTime
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
+import asyncio
 import logging
 import os
+import uuid
 from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
 from jose import jwt
 from passlib.context import CryptContext
 
 from services.database.database import get_db
+from services.database.two_tier_cache import two_tier_cache
+from models.domain.user import User
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -20,6 +27,50 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Credentials never leave the database through the user cache
+USER_CACHE_EXCLUDED_COLUMNS = {
+    "password_hash", "token", "token_expiry", "reset_token", "reset_token_expiry",
+    "oauth_data", "oauth_access_token", "oauth_refresh_token", "two_factor_secret"
+}
+USER_CACHE_TTL_SECONDS = int(os.getenv("CACHE_USER_TTL_SECONDS", 300))
+
+
+def _user_to_cache(user: User) -> Dict[str, Any]:
+    data = {}
+    for column in User.__table__.columns:
+        if column.name in USER_CACHE_EXCLUDED_COLUMNS:
+            continue
+        value = getattr(user, column.name)
+        data[column.name] = value.isoformat() if isinstance(value, datetime) else str(value) if isinstance(value, uuid.UUID) else value
+    return data
+
+
+def _user_from_cache(data: Dict[str, Any]) -> User:
+    """Detached User holding the cached columns (credential columns stay None)"""
+    values = dict(data)
+    for column in User.__table__.columns:
+        if values.get(column.name) is None:
+            continue
+        if isinstance(column.type, DateTime):
+            values[column.name] = datetime.fromisoformat(values[column.name])
+        elif isinstance(column.type, UUID):
+            values[column.name] = uuid.UUID(values[column.name])
+    return User(**values)
+
+
+async def get_cached_user_by_email(db: Session, email: str) -> Optional[User]:
+    """User lookup of the auth dependencies through the two-tier cache"""
+    from services.repositories import get_user_repository
+    user_repo = get_user_repository()
+
+    async def load():
+        user = await asyncio.to_thread(user_repo.get_user_by_email, db, email)
+        return _user_to_cache(user) if user else None
+
+    data = await two_tier_cache.get_or_load("users", email, load, ttl=USER_CACHE_TTL_SECONDS)
+    return _user_from_cache(data) if data else None
+
+
 def verify_token_direct(token: str) -> dict:
     """Verify JWT token without importing auth service"""
     try:
@@ -37,7 +88,7 @@ def verify_token_direct(token: str) -> dict:
         logger.error(f"Token verification error: {e}")
         return None
 
-def get_current_user_simple(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user_simple(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     """Simplified current user dependency that avoids circular imports"""
     logger.debug("Authenticating user with token")
     credentials_exception = HTTPException(
@@ -64,12 +115,8 @@ def get_current_user_simple(token: str = Depends(oauth2_scheme), db: Session = D
         logger.error(f"JWT token validation error: {e}")
         raise credentials_exception
     
-    logger.debug("Getting user repository")
-    # Import here to avoid circular dependency
-    from services.repositories import get_user_repository
-    user_repo = get_user_repository()
     logger.debug(f"Looking up user by email: {email}")
-    user = user_repo.get_user_by_email(db, email)
+    user = await get_cached_user_by_email(db, email)
     
     if user is None:
         logger.error(f"User not found in database for email: {email}")
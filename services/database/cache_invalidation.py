@@ -0,0 +1,73 @@
+# Invalidate two-tier cache entries when the rows they were built from change
+from typing import Iterable, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from config.logging_config import get_logger
+from models.domain.user import User
+from models.domain.qa_pair import QAPair
+from models.domain.chat import ChatSettings
+from .two_tier_cache import two_tier_cache
+
+logger = get_logger(__name__)
+
+PENDING_KEY = "two_tier_cache_invalidations"
+
+
+def _user_keys(user: User) -> Iterable[Tuple[str, str]]:
+    # The user cache is keyed by email; a changed email invalidates the old one too
+    emails = {user.email, *inspect(user).attrs.email.history.deleted}
+    return [("users", email) for email in emails if email]
+
+
+def _qa_pair_keys(qa_pair: QAPair) -> Iterable[Tuple[str, str]]:
+    return [("answers", str(qa_pair.id))]
+
+
+def _chat_settings_keys(settings: ChatSettings) -> Iterable[Tuple[str, str]]:
+    return [("chat_settings", str(settings.user_id))]
+
+
+CACHED_MODELS = {
+    User: _user_keys,
+    QAPair: _qa_pair_keys,
+    ChatSettings: _chat_settings_keys
+}
+
+
+def _collect(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        return
+    keys = CACHED_MODELS[mapper.class_](target)
+    session.info.setdefault(PENDING_KEY, set()).update(keys)
+
+
+def _track_email(target, value, oldvalue, initiator):
+    # Registered with active_history so the previous email is loaded into the attribute history
+    pass
+
+
+def _after_commit(session: Session):
+    # Invalidate only once the change is visible, so no worker re-caches the old row
+    for namespace, key in session.info.pop(PENDING_KEY, ()):
+        two_tier_cache.invalidate_sync(namespace, key)
+
+
+def _after_rollback(session: Session, previous_transaction=None):
+    session.info.pop(PENDING_KEY, None)
+
+
+def register_cache_invalidation():
+    """Hook the ORM so committed updates/deletes of cached rows invalidate them on every worker (idempotent)"""
+    for model in CACHED_MODELS:
+        for identifier in ("after_update", "after_delete"):
+            if not event.contains(model, identifier, _collect):
+                event.listen(model, identifier, _collect)
+    if not event.contains(User.email, "set", _track_email):
+        event.listen(User.email, "set", _track_email, active_history=True)
+    if not event.contains(Session, "after_commit", _after_commit):
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_soft_rollback", _after_rollback)
+    logger.debug(f"Cache invalidation registered for {', '.join(model.__name__ for model in CACHED_MODELS)}")
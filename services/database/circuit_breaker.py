@@ -0,0 +1,106 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker for an external dependency.
+
+    While closed every call goes through. `failure_threshold` failures within
+    `failure_window` seconds open the circuit: calls are refused immediately
+    instead of each waiting for a connection timeout. After `reset_timeout`
+    seconds one probe call is let through (half-open); its success closes the
+    circuit again, its failure re-opens it for another cool-down.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, failure_window: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_window = failure_window
+
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self._failures = []
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.stats = {"opened": 0, "rejected": 0, "failures": 0}
+
+    def allow_request(self) -> bool:
+        """Whether a call may be attempted; in half-open state only one probe is in flight at a time"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN and now - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_started_at = None
+                logger.info(f"🔌 Circuit '{self.name}' half-open, probing")
+            # A probe whose outcome was never reported stops blocking after a cool-down
+            if self.state == HALF_OPEN and (
+                self._probe_started_at is None or now - self._probe_started_at >= self.reset_timeout
+            ):
+                self._probe_started_at = now
+                return True
+            self.stats["rejected"] += 1
+            return False
+
+    @property
+    def probing(self) -> bool:
+        return self.state == HALF_OPEN
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"✅ Circuit '{self.name}' closed, dependency recovered")
+            self.state = CLOSED
+            self._failures.clear()
+            self._probe_started_at = None
+
+    def record_failure(self, error: Any = None):
+        with self._lock:
+            now = time.monotonic()
+            self.stats["failures"] += 1
+            self.last_error = str(error) if error is not None else None
+            self._failures = [at for at in self._failures if now - at < self.failure_window] + [now]
+            if self.state == HALF_OPEN or len(self._failures) >= self.failure_threshold:
+                self._open(now)
+
+    def trip(self, error: Any = None):
+        """Open the circuit right away (e.g. the initial connection failed)"""
+        with self._lock:
+            self.last_error = str(error) if error is not None else self.last_error
+            self._open(time.monotonic())
+
+    def _open(self, now: float):
+        if self.state != OPEN:
+            self.stats["opened"] += 1
+            logger.warning(f"⚠️ Circuit '{self.name}' open for {self.reset_timeout}s: {self.last_error}")
+        self.state = OPEN
+        self._opened_at = now
+        self._probe_started_at = None
+        self._failures.clear()
+
+    def get_status(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = max(0.0, round(self.reset_timeout - (time.monotonic() - self._opened_at), 1))
+        return {
+            "name": self.name,
+            "state": self.state,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "retry_in_seconds": retry_in,
+            "last_error": self.last_error,
+            **self.stats
+        }
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config.logging_config import get_logger, log_performance
+
+logger = get_logger(__name__)
+
+# Extend the lease only while we still own it
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Delete the lease only while we still own it
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class InitCoordinator:
+    """
+    Elects one worker to run one-time startup work (knowledge base ingestion).
+
+    Workers race for a Redis ``SET NX PX`` lease. The winner renews the lease
+    while it works and publishes a shared readiness record; the other workers
+    poll that record instead of repeating the work. If the leader dies its lease
+    expires and a waiting worker takes over. Without Redis every worker simply
+    runs the work itself, as before. Redis is only used through the asyncio
+    client, so coordination never blocks the event loop.
+    """
+
+    def __init__(self, key_prefix: str = "syria:init"):
+        self.lock_key = f"{key_prefix}:lock"
+        self.state_key = f"{key_prefix}:state"
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_ttl_seconds = float(os.getenv("INIT_LEASE_TTL_SECONDS", 30))
+        self.poll_interval_seconds = float(os.getenv("INIT_POLL_INTERVAL_SECONDS", 2))
+        self.wait_timeout_seconds = float(os.getenv("INIT_WAIT_TIMEOUT_SECONDS", 1800))
+        # How long a finished initialization is trusted by workers that start later
+        self.state_ttl_seconds = int(os.getenv("INIT_STATE_TTL_SECONDS", 3600))
+        self.role = "pending"
+        self.lease_lost = False
+
+    async def _client(self):
+        try:
+            from services.registry import redis_service
+            return redis_service.async_client if await redis_service.is_connected_async() else None
+        except Exception as e:
+            logger.warning(f"⚠️ Redis unavailable for init coordination: {e}")
+            return None
+
+    async def read_state(self) -> Optional[Dict[str, Any]]:
+        """Cluster-wide initialization record, if any"""
+        client = await self._client()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(self.state_key)
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to read cluster init state: {e}")
+            return None
+
+    async def _publish_state(self, client, version: str, status: str, result: Optional[Dict[str, Any]] = None):
+        record = {
+            "status": status,
+            "version": version,
+            "leader": self.worker_id,
+            "updated_at": time.time(),
+            "result": result
+        }
+        await client.set(self.state_key, json.dumps(record, ensure_ascii=False, default=str), ex=self.state_ttl_seconds)
+
+    async def _renew_lease(self, client):
+        ttl_ms = int(self.lease_ttl_seconds * 1000)
+        while True:
+            await asyncio.sleep(self.lease_ttl_seconds / 3)
+            try:
+                if not await client.eval(RENEW_SCRIPT, 1, self.lock_key, self.worker_id, ttl_ms):
+                    self.lease_lost = True
+                    logger.error("❌ Lost the initialization lease; another worker may take over")
+                    return
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to renew initialization lease: {e}")
+
+    async def run_once(
+        self,
+        version: str,
+        initializer: Callable[[], Awaitable[Dict[str, Any]]],
+        coordinate: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run `initializer` on exactly one worker per `version` (e.g. knowledge hash).
+
+        Only a "completed" record is reused; after a failed initialization the
+        workers compete for the lease again. With `coordinate=False` (state the
+        work builds is per process) every worker runs it itself.
+
+        Returns {"role": "leader"|"follower"|"standalone", "result": ..., "state": ...}.
+        """
+        client = await self._client() if coordinate else None
+        if client is None:
+            self.role = "standalone"
+            if coordinate:
+                logger.info("Redis not available, initializing without cluster coordination")
+            return {"role": self.role, "result": await initializer(), "state": None}
+
+        start_time = time.time()
+        while True:
+            state = await self.read_state()
+            if state and state.get("version") == version and state.get("status") == "completed":
+                self.role = "follower"
+                logger.info(f"✅ Initialization already done by {state.get('leader')} ({state.get('status')})")
+                return {"role": self.role, "result": state.get("result"), "state": state}
+
+            if await client.set(self.lock_key, self.worker_id, nx=True, px=int(self.lease_ttl_seconds * 1000)):
+                return await self._run_as_leader(client, version, initializer)
+
+            if time.time() - start_time > self.wait_timeout_seconds:
+                self.role = "follower"
+                logger.warning("⚠️ Timed out waiting for the initialization leader")
+                return {"role": self.role, "result": {"status": "error", "error": "Timed out waiting for leader"}, "state": state}
+
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    async def _run_as_leader(self, client, version: str, initializer) -> Dict[str, Any]:
+        self.role = "leader"
+        self.lease_lost = False
+        logger.info(f"👑 Worker {self.worker_id} elected to run initialization")
+        start_time = time.time()
+        renew_task = asyncio.create_task(self._renew_lease(client))
+        try:
+            await self._publish_state(client, version, "in_progress")
+            result = await initializer()
+            status = "completed" if result.get("status") == "success" else "failed"
+            await self._publish_state(client, version, status, result)
+            log_performance(logger, "Leader initialization", time.time() - start_time, status=status)
+            return {"role": self.role, "result": result, "state": await self.read_state()}
+        except Exception as e:
+            await self._publish_state(client, version, "failed", {"status": "error", "error": str(e)})
+            raise
+        finally:
+            renew_task.cancel()
+            try:
+                await client.eval(RELEASE_SCRIPT, 1, self.lock_key, self.worker_id)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to release initialization lease: {e}")
+
+    async def get_cluster_status(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "role": self.role,
+            "lease_lost": self.lease_lost,
+            "shared_state": await self.read_state()
+        }
+
+
+# Global initialization coordinator instance
+init_coordinator = InitCoordinator()
@@ -1,16 +1,84 @@
 import json
 import os
+import asyncio
 import logging
 import time
-from typing import Dict, List, Optional, Any
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Any
+import msgpack
 import redis
+import redis.asyncio as aioredis
 from redis import Redis
-import asyncio
-from pathlib import Path
+from redis.client import NEVER_DECODE
+from services.ai.knowledge_store import knowledge_store, tokenize, KnowledgeDelta, KnowledgeEntry, KnowledgeFile
 from config.logging_config import get_logger, log_function_entry, log_function_exit, log_performance, log_error_with_context
+from services.registry import registry
+from .circuit_breaker import CircuitBreaker
 
 logger = get_logger(__name__)
 
+# Holds the version namespace of the complete knowledge cache (syria:kb:<version>:...)
+KNOWLEDGE_POINTER_KEY = "syria:kb:current"
+
+# A cached Q&A pair is one msgpack array with the fields in this order
+RECORD_LAYOUT = ("keywords", "category", "confidence", "source", "question_variants", "answer")
+
+# Index key kinds of the knowledge cache and the stats counters tracking them
+INDEX_COUNTERS = {
+    "qa": "qa_pairs",
+    "keyword": "keyword_indexes",
+    "category": "category_indexes",
+    "question": "question_indexes",
+    "token": "token_indexes"
+}
+
+# Relevance weights precomputed into the token posting lists
+VARIANT_TOKEN_WEIGHT = 20.0   # per question variant containing the token
+KEYWORD_WEIGHT = 10.0         # the token is a keyword of the pair
+KEYWORD_TOKEN_WEIGHT = 5.0    # the token is part of a multi-word keyword
+EXACT_QUESTION_SCORE = 100.0
+IMPORTANT_KEYWORDS = ("عاصمة", "capital", "دمشق", "damascus")
+IMPORTANT_KEYWORD_BONUS = 15.0
+
+
+def _normalize_question(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def encode_record(entry: KnowledgeEntry) -> bytes:
+    """Binary cache record of a Q&A pair (fields in RECORD_LAYOUT order)"""
+    return msgpack.packb([
+        list(entry.keywords),
+        entry.category,
+        float(entry.confidence),
+        entry.source,
+        list(entry.question_variants),
+        entry.answer
+    ], use_bin_type=True)
+
+
+def unpack_record(blob: bytes) -> List[Any]:
+    """Field values of a record in RECORD_LAYOUT order"""
+    return msgpack.unpackb(blob, raw=False)
+
+
+def record_to_dict(qa_id: str, values: List[Any]) -> Dict[str, Any]:
+    fields = dict(zip(RECORD_LAYOUT, values))
+    return {
+        "id": qa_id,
+        "question_variants": fields["question_variants"],
+        "answer": fields["answer"],
+        "keywords": fields["keywords"],
+        "confidence": fields["confidence"],
+        "source": fields["source"],
+        "category": fields["category"]
+    }
+
+
+def decode_record(qa_id: str, blob: bytes) -> Dict[str, Any]:
+    return record_to_dict(qa_id, unpack_record(blob))
+
+
 class RedisService:
     def __init__(self):
         log_function_entry(logger, "__init__")
@@ -21,8 +89,29 @@ class RedisService:
         self.redis_url = os.getenv("REDIS_URL", default_redis_url)
         logger.debug(f"🔧 Redis URL: {self.redis_url}")
         self.client: Optional[Redis] = None
-        self.syria_data_path = Path(__file__).parent.parent / "data" / "syria_knowledge"
-        logger.debug(f"🔧 Syria data path: {self.syria_data_path}")
+        # Async client for request-path reads; both clients use explicitly sized pools
+        self.async_client: Optional[aioredis.Redis] = None
+        self.max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+        self.socket_timeout = float(os.getenv("REDIS_SOCKET_TIMEOUT", 2.0))
+        self.socket_connect_timeout = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", 2.0))
+        self.health_check_interval = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+        # Knowledge cache versioning and bulk loading
+        self.load_chunk_size = int(os.getenv("REDIS_LOAD_CHUNK_SIZE", 1000))  # commands per pipeline flush
+        self.retired_namespace_ttl = int(os.getenv("REDIS_RETIRED_NAMESPACE_TTL", 60))
+        self.namespace_refresh_seconds = float(os.getenv("REDIS_NAMESPACE_REFRESH_SECONDS", 5))
+        self._namespace: Optional[str] = None
+        self._namespace_checked_at = 0.0
+        # Background SCAN recount of the stats counters (0 disables it)
+        self.stats_recount_interval = float(os.getenv("REDIS_STATS_RECOUNT_INTERVAL_SECONDS", 3600))
+        self.scan_count = int(os.getenv("REDIS_SCAN_COUNT", 1000))
+        self._stats_task: Optional[asyncio.Task] = None
+        # Decides availability instead of a PING per call; fails fast while Redis is down
+        self.breaker = CircuitBreaker(
+            "redis",
+            failure_threshold=int(os.getenv("REDIS_BREAKER_FAILURE_THRESHOLD", 5)),
+            reset_timeout=float(os.getenv("REDIS_BREAKER_COOLDOWN_SECONDS", 30)),
+            failure_window=float(os.getenv("REDIS_BREAKER_FAILURE_WINDOW_SECONDS", 60))
+        )
         
         try:
             self._ensure_connection()
@@ -43,12 +132,24 @@ class RedisService:
         
         logger.debug("🔧 Establishing Redis connection...")
         try:
-            self.client = redis.from_url(self.redis_url, decode_responses=True)
-            logger.debug("✅ Redis client created")
+            pool_options = dict(
+                max_connections=self.max_connections,
+                socket_timeout=self.socket_timeout,
+                socket_connect_timeout=self.socket_connect_timeout,
+                health_check_interval=self.health_check_interval,
+                decode_responses=True
+            )
+            self.client = Redis(connection_pool=redis.ConnectionPool.from_url(self.redis_url, **pool_options))
+            # Connects lazily, on first use inside the event loop
+            self.async_client = aioredis.Redis(
+                connection_pool=aioredis.ConnectionPool.from_url(self.redis_url, **pool_options)
+            )
+            logger.debug("✅ Redis clients created")
             
             # Test connection
             logger.debug("🔧 Testing Redis connection...")
             self.client.ping()
+            self.breaker.record_success()
             duration = time.time() - start_time
             log_performance(logger, "Redis connection establishment", duration)
             logger.info("✅ Redis connection established successfully")
@@ -58,206 +159,400 @@ class RedisService:
             log_error_with_context(logger, e, "_ensure_connection", redis_url=self.redis_url, duration=duration)
             logger.warning(f"❌ Failed to connect to Redis: {e}")
             self.client = None
-            # Don't raise exception - allow graceful degradation
+            self.async_client = None
+            # Don't raise exception - allow graceful degradation; reconnect after the cool-down
+            self.breaker.trip(e)
         
         log_function_exit(logger, "_ensure_connection", duration=time.time() - start_time)
     
     def is_connected(self) -> bool:
-        """Check if Redis is connected"""
-        try:
-            if self.client:
+        """
+        Check if Redis may be used.
+        
+        The circuit breaker answers without a round-trip; only the half-open
+        probe after a cool-down talks to Redis (reconnecting if needed).
+        """
+        if not self.breaker.allow_request():
+            return False
+        if self.breaker.probing:
+            if self.client is None:
+                self._ensure_connection()
+                return self.client is not None
+            try:
                 self.client.ping()
-                return True
-        except Exception:
+                self.breaker.record_success()
+            except Exception as e:
+                self.breaker.record_failure(e)
+                return False
+        return self.client is not None
+    
+    async def is_connected_async(self) -> bool:
+        """Async variant of is_connected for request-path methods"""
+        if not self.breaker.allow_request():
             return False
-        return False
+        if self.breaker.probing:
+            if self.async_client is None:
+                await asyncio.to_thread(self._ensure_connection)
+                return self.async_client is not None
+            try:
+                await self.async_client.ping()
+                self.breaker.record_success()
+            except Exception as e:
+                self.breaker.record_failure(e)
+                return False
+        return self.async_client is not None
+    
+    def _record_error(self, error: Exception):
+        """Count connection-level errors towards the circuit breaker (command errors don't trip it)"""
+        if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+            self.breaker.record_failure(error)
+    
+    async def close(self):
+        """Release both connection pools"""
+        if self.async_client:
+            await self.async_client.aclose()
+        if self.client:
+            self.client.close()
+    
+    async def _current_namespace_async(self) -> str:
+        now = time.monotonic()
+        if self._namespace is None or now - self._namespace_checked_at > self.namespace_refresh_seconds:
+            self._namespace = await self.async_client.get(KNOWLEDGE_POINTER_KEY) or "empty"
+            self._namespace_checked_at = now
+        return self._namespace
+    
+    def _current_namespace(self) -> str:
+        """Version of the knowledge keys readers should use (pointer re-read every few seconds)"""
+        now = time.monotonic()
+        if self._namespace is None or now - self._namespace_checked_at > self.namespace_refresh_seconds:
+            self._namespace = self.client.get(KNOWLEDGE_POINTER_KEY) or "empty"
+            self._namespace_checked_at = now
+        return self._namespace
+    
+    def _key(self, *parts: str, namespace: Optional[str] = None) -> str:
+        """Key of the knowledge cache inside a version namespace (current one by default)"""
+        return ":".join(["syria", "kb", namespace or self._current_namespace(), *parts])
     
     def load_syria_knowledge_to_cache(self) -> bool:
-        """Load all Syria knowledge JSON files into Redis cache"""
+        """
+        Load the Syria knowledge corpus from the shared knowledge store into Redis cache.
+        
+        Everything is written into a fresh version namespace through chunked,
+        non-transactional pipelines; the version pointer is then swapped in one
+        SET, so readers see either the previous cache or the complete new one.
+        The replaced version expires after a grace period.
+        """
         if not self.is_connected():
             logger.warning("Redis not connected, skipping Syria knowledge cache loading")
             return False
             
         try:
-            json_files = [
-                "general.json",
-                "cities.json", 
-                "culture.json",
-                "economy.json",
-                "government.json",
-                "Real_post_liberation_events.json"
-            ]
-            
+            start_time = time.time()
+            namespace = f"v{int(time.time() * 1000)}"
+            pipe = self.client.pipeline(transaction=False)
             total_cached = 0
-            
-            for filename in json_files:
-                file_path = self.syria_data_path / filename
-                if file_path.exists():
-                    cached_count = self._cache_json_file(file_path)
-                    total_cached += cached_count
-                    logger.info(f"Cached {cached_count} items from {filename}")
-                else:
-                    logger.warning(f"File not found: {file_path}")
+            round_trips = 0
+            
+            for knowledge_file in knowledge_store.snapshot.files:
+                for entry in knowledge_file.entries:
+                    self._cache_knowledge_entry(entry, pipe, namespace)
+                    total_cached += 1
+                    if len(pipe) >= self.load_chunk_size:
+                        pipe.execute()
+                        round_trips += 1
+                self._cache_category_info(knowledge_file, pipe, namespace)
+                logger.info(f"Cached {len(knowledge_file.entries)} items from {knowledge_file.filename}")
             
             # Cache metadata
-            self.client.set("syria:metadata:total_items", total_cached)
-            self.client.set("syria:metadata:last_updated", str(asyncio.get_event_loop().time()))
+            pipe.set(self._key("metadata", "total_items", namespace=namespace), total_cached)
+            pipe.set(self._key("metadata", "last_updated", namespace=namespace), str(time.time()))
+            self._write_index_counters(pipe, namespace)
+            pipe.execute()
+            round_trips += 1
+            
+            # Atomic switch; GET returns the version actually replaced, even if another worker loaded meanwhile
+            previous = self.client.set(KNOWLEDGE_POINTER_KEY, namespace, get=True)
+            self._namespace, self._namespace_checked_at = namespace, time.monotonic()
+            retired_keys = self._retire_namespace(previous)
             
+            duration = time.time() - start_time
+            log_performance(logger, "Redis knowledge load", duration, items=total_cached,
+                            round_trips=round_trips, namespace=namespace, retired_keys=retired_keys)
             logger.info(f"Successfully cached {total_cached} Syria knowledge items")
             return True
             
         except Exception as e:
+            self._record_error(e)
             logger.error(f"Error loading Syria knowledge to cache: {e}")
             return False
     
-    def _cache_json_file(self, file_path: Path) -> int:
-        """Cache a single JSON file's content"""
+    def _retire_namespace(self, namespace: Optional[str]) -> int:
+        """Let the keys of a replaced version (or the unversioned legacy layout) expire"""
+        if namespace:
+            patterns = [f"syria:kb:{namespace}:*"]
+        else:
+            patterns = [f"syria:{kind}:*" for kind in
+                        ("qa", "keyword", "category", "category_info", "question", "token", "metadata")]
+        
+        retired = 0
+        pipe = self.client.pipeline(transaction=False)
+        for pattern in patterns:
+            # SCAN walks the keyspace incrementally instead of blocking Redis like KEYS
+            for key in self.client.scan_iter(match=pattern, count=1000):
+                pipe.expire(key, self.retired_namespace_ttl)
+                retired += 1
+                if len(pipe) >= self.load_chunk_size:
+                    pipe.execute()
+        pipe.execute()
+        return retired
+    
+    def _cache_knowledge_entry(self, entry: KnowledgeEntry, pipe, namespace: Optional[str] = None):
+        """Queue the writes caching one Q&A pair with its keyword, category and search index memberships"""
+        namespace = namespace or self._current_namespace()
+        # Cache the full Q&A pair as one binary record
+        pipe.set(self._key("qa", entry.id, namespace=namespace), encode_record(entry))
+        
+        # Create keyword indexes for fast searching
+        for keyword in entry.keywords:
+            pipe.sadd(self._key("keyword", keyword.lower(), namespace=namespace), entry.id)
+        
+        # Create category index
+        pipe.sadd(self._key("category", entry.category, namespace=namespace), entry.id)
+        
+        # Search indexes: exact question lookup and weighted token posting lists
+        for question in {_normalize_question(variant) for variant in entry.question_variants}:
+            pipe.sadd(self._key("question", question, namespace=namespace), entry.id)
+        for token, weight in self._token_weights(entry).items():
+            pipe.zadd(self._key("token", token, namespace=namespace), {entry.id: weight})
+    
+    def _uncache_knowledge_entry(self, entry: KnowledgeEntry, pipe, delete_record: bool = True):
+        """Queue the removal of a Q&A pair's index memberships (and optionally its record)"""
+        namespace = self._current_namespace()
+        for keyword in entry.keywords:
+            pipe.srem(self._key("keyword", keyword.lower(), namespace=namespace), entry.id)
+        pipe.srem(self._key("category", entry.category, namespace=namespace), entry.id)
+        for question in {_normalize_question(variant) for variant in entry.question_variants}:
+            pipe.srem(self._key("question", question, namespace=namespace), entry.id)
+        for token in self._token_weights(entry):
+            pipe.zrem(self._key("token", token, namespace=namespace), entry.id)
+        if delete_record:
+            pipe.delete(self._key("qa", entry.id, namespace=namespace))
+    
+    @staticmethod
+    def _token_weights(entry: KnowledgeEntry) -> Dict[str, float]:
+        """Relevance of each token to a pair, as scored by fuzzy_search"""
+        weights: Counter = Counter()
+        for variant in entry.question_variants:
+            for token in set(tokenize(variant)):
+                weights[token] += VARIANT_TOKEN_WEIGHT
+        for keyword in entry.keywords:
+            keyword_tokens = tokenize(keyword)
+            for token in set(keyword_tokens):
+                weights[token] += KEYWORD_WEIGHT if len(keyword_tokens) == 1 else KEYWORD_TOKEN_WEIGHT
+        return dict(weights)
+    
+    def _cache_category_info(self, knowledge_file: KnowledgeFile, pipe, namespace: Optional[str] = None):
+        # Cache category metadata
+        namespace = namespace or self._current_namespace()
+        pipe.hset(self._key("category_info", knowledge_file.category, namespace=namespace), mapping={
+            "description": knowledge_file.description,
+            "total_items": str(len(knowledge_file.entries))
+        })
+        pipe.sadd(self._key("categories", namespace=namespace), knowledge_file.category)
+    
+    def _write_index_counters(self, pipe, namespace: str):
+        """
+        Queue the stats counters of a cache that mirrors the knowledge store.
+        
+        The cache holds exactly the store's pairs after a load or delta, so the
+        counts are computed from the snapshot instead of by counting keys.
+        """
+        entries = knowledge_store.snapshot.entries
+        keywords, questions, tokens = set(), set(), set()
+        for entry in entries:
+            keywords.update(keyword.lower() for keyword in entry.keywords)
+            questions.update(_normalize_question(variant) for variant in entry.question_variants)
+            tokens.update(self._token_weights(entry))
+        pipe.hset(self._key("stats", namespace=namespace), mapping={
+            "qa_pairs": len(entries),
+            "keyword_indexes": len(keywords),
+            "category_indexes": len({entry.category for entry in entries}),
+            "question_indexes": len(questions),
+            "token_indexes": len(tokens),
+            "counted_at": str(time.time()),
+            "counted_by": "load"
+        })
+    
+    def recount_cache_stats(self) -> Dict[str, Any]:
+        """
+        Recount the index keys of the current cache version with SCAN and store the counters.
+        
+        SCAN walks the keyspace in small batches without blocking other clients;
+        this corrects drift (evictions, manual edits) in the load-time counters.
+        """
+        if not self.is_connected():
+            return {"status": "error", "error": "Redis not connected"}
+        
+        start_time = time.time()
+        namespace = self._current_namespace()
+        counters = {
+            field: sum(1 for _ in self.client.scan_iter(match=self._key(kind, "*", namespace=namespace), count=self.scan_count))
+            for kind, field in INDEX_COUNTERS.items()
+        }
+        memory = self.client.info("memory")
+        self.client.hset(self._key("stats", namespace=namespace), mapping={
+            **counters,
+            "used_memory": memory.get("used_memory", 0),
+            "used_memory_human": memory.get("used_memory_human", ""),
+            "counted_at": str(time.time()),
+            "counted_by": "scan"
+        })
+        duration = time.time() - start_time
+        log_performance(logger, "Redis cache stats recount", duration, namespace=namespace, **counters)
+        return {"status": "success", "namespace": namespace, **counters, "processing_time": duration}
+    
+    async def _stats_maintenance_loop(self):
+        while True:
+            await asyncio.sleep(self.stats_recount_interval)
+            try:
+                await asyncio.to_thread(self.recount_cache_stats)
+            except Exception as e:
+                self._record_error(e)
+                logger.warning(f"⚠️ Redis stats recount failed: {e}")
+    
+    def start_stats_maintenance(self):
+        """Start the periodic stats recount (idempotent; disabled when the interval is 0)"""
+        if self.stats_recount_interval <= 0 or self.client is None:
+            return
+        if self._stats_task and not self._stats_task.done():
+            return
+        self._stats_task = asyncio.create_task(self._stats_maintenance_loop())
+        logger.info(f"🧮 Recounting Redis cache stats every {self.stats_recount_interval}s")
+    
+    async def stop_stats_maintenance(self):
+        if self._stats_task and not self._stats_task.done():
+            self._stats_task.cancel()
+            try:
+                await self._stats_task
+            except asyncio.CancelledError:
+                pass
+        self._stats_task = None
+    
+    def apply_knowledge_delta(self, delta: KnowledgeDelta) -> bool:
+        """Apply a reloaded knowledge file's delta to the cache without reloading everything"""
+        if not self.is_connected():
+            logger.warning("Redis not connected, skipping knowledge delta")
+            return False
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            category = data.get("category", file_path.stem)
-            qa_pairs = data.get("qa_pairs", [])
-            
-            cached_count = 0
-            
-            # Cache each Q&A pair
-            for qa_pair in qa_pairs:
-                qa_id = qa_pair.get("id")
-                if qa_id:
-                    # Cache the full Q&A pair
-                    self.client.hset(f"syria:qa:{qa_id}", mapping={
-                        "question_variants": json.dumps(qa_pair.get("question_variants", []), ensure_ascii=False),
-                        "answer": qa_pair.get("answer", ""),
-                        "keywords": json.dumps(qa_pair.get("keywords", []), ensure_ascii=False),
-                        "confidence": str(qa_pair.get("confidence", 1.0)),
-                        "source": qa_pair.get("source", ""),
-                        "category": category
-                    })
-                    
-                    # Create keyword indexes for fast searching
-                    for keyword in qa_pair.get("keywords", []):
-                        self.client.sadd(f"syria:keyword:{keyword.lower()}", qa_id)
-                    
-                    # Create category index
-                    self.client.sadd(f"syria:category:{category}", qa_id)
-                    
-                    cached_count += 1
-            
-            # Cache category metadata
-            self.client.hset(f"syria:category_info:{category}", mapping={
-                "description": data.get("description", ""),
-                "total_items": str(len(qa_pairs))
-            })
-            
-            return cached_count
+            # One pipelined round-trip; commands run in the order they were queued
+            pipe = self.client.pipeline(transaction=False)
+            for entry in delta.removed:
+                self._uncache_knowledge_entry(entry, pipe)
+            # Old keywords/category of changed pairs may no longer apply
+            for entry in delta.previous:
+                self._uncache_knowledge_entry(entry, pipe, delete_record=False)
+            for entry in delta.added + delta.changed:
+                self._cache_knowledge_entry(entry, pipe)
+            
+            knowledge_file = knowledge_store.snapshot.get_file(delta.filename)
+            if knowledge_file:
+                self._cache_category_info(knowledge_file, pipe)
+            pipe.set(self._key("metadata", "total_items"), len(knowledge_store.snapshot.entries))
+            pipe.set(self._key("metadata", "last_updated"), str(time.time()))
+            self._write_index_counters(pipe, self._current_namespace())
+            pipe.execute()
+            
+            logger.info(f"Applied knowledge delta for {delta.filename}: {len(delta.added)} added, "
+                        f"{len(delta.changed)} changed, {len(delta.removed)} removed")
+            return True
             
         except Exception as e:
-            logger.error(f"Error caching file {file_path}: {e}")
-            return 0
+            self._record_error(e)
+            logger.error(f"Error applying knowledge delta for {delta.filename}: {e}")
+            return False
     
-    def search_by_keyword(self, keyword: str, limit: int = 10) -> List[Dict[str, Any]]:
+    async def search_by_keyword(self, keyword: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search Syria knowledge by keyword"""
-        if not self.is_connected():
+        if not await self.is_connected_async():
             return []
         
         try:
+            namespace = await self._current_namespace_async()
             keyword_lower = keyword.lower()
-            qa_ids = self.client.smembers(f"syria:keyword:{keyword_lower}")
-            
-            results = []
-            for qa_id in list(qa_ids)[:limit]:
-                qa_data = self.client.hgetall(f"syria:qa:{qa_id}")
-                if qa_data:
-                    results.append({
-                        "id": qa_id,
-                        "question_variants": json.loads(qa_data.get("question_variants", "[]")),
-                        "answer": qa_data.get("answer", ""),
-                        "keywords": json.loads(qa_data.get("keywords", "[]")),
-                        "confidence": float(qa_data.get("confidence", 1.0)),
-                        "source": qa_data.get("source", ""),
-                        "category": qa_data.get("category", "")
-                    })
-            
-            return results
+            qa_ids = await self.async_client.smembers(self._key("keyword", keyword_lower, namespace=namespace))
+            return await self._fetch_records(list(qa_ids)[:limit], namespace)
             
         except Exception as e:
+            self._record_error(e)
             logger.error(f"Error searching by keyword '{keyword}': {e}")
             return []
     
-    def search_by_category(self, category: str, limit: int = 20) -> List[Dict[str, Any]]:
+    async def search_by_category(self, category: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Get all items from a specific category"""
-        if not self.is_connected():
+        if not await self.is_connected_async():
             return []
         
         try:
-            qa_ids = self.client.smembers(f"syria:category:{category}")
-            
-            results = []
-            for qa_id in list(qa_ids)[:limit]:
-                qa_data = self.client.hgetall(f"syria:qa:{qa_id}")
-                if qa_data:
-                    results.append({
-                        "id": qa_id,
-                        "question_variants": json.loads(qa_data.get("question_variants", "[]")),
-                        "answer": qa_data.get("answer", ""),
-                        "keywords": json.loads(qa_data.get("keywords", "[]")),
-                        "confidence": float(qa_data.get("confidence", 1.0)),
-                        "source": qa_data.get("source", ""),
-                        "category": qa_data.get("category", "")
-                    })
-            
-            return results
+            namespace = await self._current_namespace_async()
+            qa_ids = await self.async_client.smembers(self._key("category", category, namespace=namespace))
+            return await self._fetch_records(list(qa_ids)[:limit], namespace)
             
         except Exception as e:
+            self._record_error(e)
             logger.error(f"Error searching by category '{category}': {e}")
             return []
     
-    def get_qa_by_id(self, qa_id: str) -> Optional[Dict[str, Any]]:
+    async def _fetch_blobs(self, qa_ids: List[str], namespace: str) -> List[Optional[bytes]]:
+        """Raw records of the given pairs in one MGET (None for pairs no longer cached)"""
+        if not qa_ids:
+            return []
+        keys = [self._key("qa", qa_id, namespace=namespace) for qa_id in qa_ids]
+        # The records are binary; skip the client's UTF-8 response decoding
+        return await self.async_client.execute_command("MGET", *keys, **{NEVER_DECODE: []})
+    
+    async def _fetch_records(self, qa_ids: Iterable[str], namespace: str) -> List[Dict[str, Any]]:
+        """Fetch and decode cached Q&A pairs with one MGET, keeping the given order"""
+        qa_ids = list(qa_ids)
+        blobs = await self._fetch_blobs(qa_ids, namespace)
+        return [decode_record(qa_id, blob) for qa_id, blob in zip(qa_ids, blobs) if blob is not None]
+    
+    async def get_qa_by_id(self, qa_id: str) -> Optional[Dict[str, Any]]:
         """Get specific Q&A pair by ID"""
-        if not self.is_connected():
+        if not await self.is_connected_async():
             return None
         
         try:
-            qa_data = self.client.hgetall(f"syria:qa:{qa_id}")
-            if qa_data:
-                return {
-                    "id": qa_id,
-                    "question_variants": json.loads(qa_data.get("question_variants", "[]")),
-                    "answer": qa_data.get("answer", ""),
-                    "keywords": json.loads(qa_data.get("keywords", "[]")),
-                    "confidence": float(qa_data.get("confidence", 1.0)),
-                    "source": qa_data.get("source", ""),
-                    "category": qa_data.get("category", "")
-                }
-            return None
+            records = await self._fetch_records([qa_id], await self._current_namespace_async())
+            return records[0] if records else None
             
         except Exception as e:
+            self._record_error(e)
             logger.error(f"Error getting Q&A by ID '{qa_id}': {e}")
             return None
     
-    def get_all_categories(self) -> List[str]:
+    async def get_all_categories(self) -> List[str]:
         """Get all available categories"""
-        if not self.is_connected():
+        if not await self.is_connected_async():
             return []
         
         try:
-            pattern = "syria:category_info:*"
-            keys = self.client.keys(pattern)
-            categories = [key.replace("syria:category_info:", "") for key in keys]
-            return categories
+            namespace = await self._current_namespace_async()
+            return sorted(await self.async_client.smembers(self._key("categories", namespace=namespace)))
             
         except Exception as e:
+            self._record_error(e)
             logger.error(f"Error getting categories: {e}")
             return []
     
-    def get_category_info(self, category: str) -> Optional[Dict[str, Any]]:
+    async def get_category_info(self, category: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific category"""
-        if not self.is_connected():
+        if not await self.is_connected_async():
             return None
         
         try:
-            info = self.client.hgetall(f"syria:category_info:{category}")
+            namespace = await self._current_namespace_async()
+            info = await self.async_client.hgetall(self._key("category_info", category, namespace=namespace))
             if info:
                 return {
                     "category": category,
@@ -267,208 +562,171 @@ class RedisService:
             return None
             
         except Exception as e:
+            self._record_error(e)
             logger.error(f"Error getting category info for '{category}': {e}")
             return None
     
-    def fuzzy_search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Perform fuzzy search across all Syria knowledge with improved relevance scoring"""
-        if not self.is_connected():
+    async def fuzzy_search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search the cached Syria knowledge through its token index.
+        
+        Exact question matches win; otherwise pairs are ranked by the precomputed
+        weights of the query tokens in their posting lists. A query costs two
+        round-trips (index lookups, then one record MGET) whatever the corpus size.
+        """
+        if not await self.is_connected_async():
             return []
         
         try:
             query_lower = query.lower().strip()
-            query_words = query_lower.split()
-            all_results = []
-            
-            # First, try to find exact question matches
-            exact_question_matches = self._search_exact_question_matches(query_lower)
-            if exact_question_matches:
-                # If we find exact matches, return them with high confidence
-                return exact_question_matches[:limit]
-            
-            # If no exact matches, perform semantic search with relevance scoring
-            scored_results = []
-            
-            # Get all Q&A pairs
-            all_qa_keys = self.client.keys("syria:qa:*")
-            
-            for qa_key in all_qa_keys:
-                qa_id = qa_key.replace("syria:qa:", "")
-                qa_data = self.client.hgetall(qa_key)
-                
-                if qa_data:
-                    # Calculate relevance score
-                    relevance_score = self._calculate_relevance_score(
-                        query_lower, query_words, qa_data
-                    )
-                    
-                    if relevance_score > 0:  # Only include relevant results
-                        result = {
-                            "id": qa_id,
-                            "question_variants": json.loads(qa_data.get("question_variants", "[]")),
-                            "answer": qa_data.get("answer", ""),
-                            "keywords": json.loads(qa_data.get("keywords", "[]")),
-                            "confidence": float(qa_data.get("confidence", 1.0)),
-                            "source": qa_data.get("source", ""),
-                            "category": qa_data.get("category", ""),
-                            "relevance_score": relevance_score
-                        }
-                        scored_results.append(result)
-            
-            # Sort by relevance score (highest first) and return top results
-            scored_results.sort(key=lambda x: x["relevance_score"], reverse=True)
-            
-            # Remove relevance_score from final results
-            for result in scored_results[:limit]:
-                result.pop("relevance_score", None)
-            
-            return scored_results[:limit]
+            tokens = list(dict.fromkeys(tokenize(query_lower)))
+            
+            # All keys of one query come from the same cache version
+            namespace = await self._current_namespace_async()
+            pipe = self.async_client.pipeline(transaction=False)
+            pipe.smembers(self._key("question", _normalize_question(query_lower), namespace=namespace))
+            for token in tokens:
+                pipe.zrange(self._key("token", token, namespace=namespace), 0, -1, withscores=True)
+            exact_ids, *postings = await pipe.execute()
+            
+            if exact_ids:
+                return (await self._fetch_records(sorted(exact_ids), namespace))[:limit]
+            
+            scores: Counter = Counter()
+            for posting in postings:
+                for qa_id, weight in posting:
+                    scores[qa_id] += weight
+            if not scores:
+                return []
+            
+            # Over-fetch a little so the keyword bonus can still reorder the top results
+            candidate_ids = [qa_id for qa_id, _ in scores.most_common(limit * 2)]
+            blobs = dict(zip(candidate_ids, await self._fetch_blobs(candidate_ids, namespace)))
+            candidates = [qa_id for qa_id in candidate_ids if blobs[qa_id] is not None]
+            # Records are unpacked lazily: all candidates only when the keyword bonus needs them
+            values = {}
+            if any(keyword in query_lower for keyword in IMPORTANT_KEYWORDS):
+                for qa_id in candidates:
+                    values[qa_id] = unpack_record(blobs[qa_id])
+                    if any(keyword.lower() in IMPORTANT_KEYWORDS for keyword in values[qa_id][0]):
+                        scores[qa_id] += IMPORTANT_KEYWORD_BONUS
+            candidates.sort(key=lambda qa_id: scores[qa_id], reverse=True)
+            
+            return [
+                record_to_dict(qa_id, values.get(qa_id) or unpack_record(blobs[qa_id]))
+                for qa_id in candidates[:limit]
+            ]
             
         except Exception as e:
+            self._record_error(e)
             logger.error(f"Error in fuzzy search for '{query}': {e}")
             return []
     
-    def _search_exact_question_matches(self, query: str) -> List[Dict[str, Any]]:
-        """Search for exact question matches in question variants"""
-        if not self.is_connected():
-            return []
-        
-        try:
-            exact_matches = []
-            all_qa_keys = self.client.keys("syria:qa:*")
-            
-            for qa_key in all_qa_keys:
-                qa_id = qa_key.replace("syria:qa:", "")
-                qa_data = self.client.hgetall(qa_key)
-                
-                if qa_data:
-                    question_variants = json.loads(qa_data.get("question_variants", "[]"))
-                    
-                    # Check for exact matches in question variants
-                    for variant in question_variants:
-                        if query == variant.lower().strip():
-                            result = {
-                                "id": qa_id,
-                                "question_variants": question_variants,
-                                "answer": qa_data.get("answer", ""),
-                                "keywords": json.loads(qa_data.get("keywords", "[]")),
-                                "confidence": float(qa_data.get("confidence", 1.0)),
-                                "source": qa_data.get("source", ""),
-                                "category": qa_data.get("category", "")
-                            }
-                            exact_matches.append(result)
-                            break
-            
-            return exact_matches
-            
-        except Exception as e:
-            logger.error(f"Error in exact question search: {e}")
-            return []
-    
-    def _calculate_relevance_score(self, query: str, query_words: List[str], qa_data: Dict[str, str]) -> float:
-        """Calculate relevance score for a Q&A pair based on the query"""
-        try:
-            score = 0.0
-            
-            # Get question variants and keywords
-            question_variants = json.loads(qa_data.get("question_variants", "[]"))
-            keywords = json.loads(qa_data.get("keywords", "[]"))
-            
-            # Check for exact question match (highest priority)
-            for variant in question_variants:
-                if query == variant.lower().strip():
-                    return 100.0  # Maximum score for exact match
-            
-            # Check for partial question matches
-            for variant in question_variants:
-                variant_lower = variant.lower()
-                if query in variant_lower or variant_lower in query:
-                    score += 50.0
-                elif any(word in variant_lower for word in query_words if len(word) > 2):
-                    score += 20.0
-            
-            # Check keyword matches
-            keywords_lower = [kw.lower() for kw in keywords]
-            for word in query_words:
-                if len(word) > 2:  # Only consider words longer than 2 characters
-                    if word in keywords_lower:
-                        score += 10.0
-                    elif any(word in kw for kw in keywords_lower):
-                        score += 5.0
-            
-            # Bonus for important keywords like "عاصمة" (capital)
-            important_keywords = ["عاصمة", "capital", "دمشق", "damascus"]
-            if any(keyword in query for keyword in important_keywords):
-                if any(keyword in keywords_lower for keyword in important_keywords):
-                    score += 15.0
-            
-            return score
-            
-        except Exception as e:
-            logger.error(f"Error calculating relevance score: {e}")
-            return 0.0
+    @staticmethod
+    def custom_key(key: str) -> str:
+        return f"syria:custom:{key}"
     
-    def cache_custom_data(self, key: str, data: Any, expiry: int = 3600) -> bool:
+    async def cache_custom_data(self, key: str, data: Any, expiry: int = 3600) -> bool:
         """Cache custom data with optional expiry"""
-        if not self.is_connected():
+        if not await self.is_connected_async():
             return False
         
         try:
             serialized_data = json.dumps(data, ensure_ascii=False)
-            self.client.setex(f"syria:custom:{key}", expiry, serialized_data)
+            await self.async_client.setex(self.custom_key(key), expiry, serialized_data)
             return True
             
         except Exception as e:
+            self._record_error(e)
             logger.error(f"Error caching custom data '{key}': {e}")
             return False
     
-    def get_custom_data(self, key: str) -> Any:
+    async def get_custom_data(self, key: str) -> Any:
         """Retrieve custom cached data"""
-        if not self.is_connected():
+        if not await self.is_connected_async():
             return None
         
         try:
-            data = self.client.get(f"syria:custom:{key}")
+            data = await self.async_client.get(self.custom_key(key))
             if data:
                 return json.loads(data)
             return None
             
         except Exception as e:
+            self._record_error(e)
             logger.error(f"Error getting custom data '{key}': {e}")
             return None
     
-    def get_cache_stats(self) -> Dict[str, Any]:
-        """Get Redis cache statistics"""
-        if not self.is_connected():
-            return {"connected": False}
+    async def delete_custom_data(self, key: str) -> bool:
+        """Delete custom cached data"""
+        if not await self.is_connected_async():
+            return False
         
         try:
-            total_items = self.client.get("syria:metadata:total_items") or "0"
-            last_updated = self.client.get("syria:metadata:last_updated") or "Never"
+            await self.async_client.delete(self.custom_key(key))
+            return True
             
-            # Count different types of keys
-            qa_keys = len(self.client.keys("syria:qa:*"))
-            keyword_keys = len(self.client.keys("syria:keyword:*"))
-            category_keys = len(self.client.keys("syria:category:*"))
+        except Exception as e:
+            self._record_error(e)
+            logger.error(f"Error deleting custom data '{key}': {e}")
+            return False
+    
+    async def publish(self, channel: str, message: str) -> bool:
+        """Publish a message on a pub/sub channel"""
+        if not await self.is_connected_async():
+            return False
+        
+        try:
+            await self.async_client.publish(channel, message)
+            return True
+            
+        except Exception as e:
+            self._record_error(e)
+            logger.error(f"Error publishing to '{channel}': {e}")
+            return False
+    
+    async def get_cache_stats(self) -> Dict[str, Any]:
+        """Get Redis cache statistics from the maintained counters (one round-trip)"""
+        if not await self.is_connected_async():
+            return {"connected": False, "circuit": self.breaker.get_status()}
+        
+        try:
+            namespace = await self._current_namespace_async()
+            pipe = self.async_client.pipeline(transaction=False)
+            pipe.get(self._key("metadata", "total_items", namespace=namespace))
+            pipe.get(self._key("metadata", "last_updated", namespace=namespace))
+            pipe.hgetall(self._key("stats", namespace=namespace))
+            total_items, last_updated, stats = await pipe.execute()
             
             return {
                 "connected": True,
-                "total_syria_items": int(total_items),
-                "last_updated": last_updated,
-                "qa_pairs_cached": qa_keys,
-                "keyword_indexes": keyword_keys,
-                "category_indexes": category_keys,
-                "redis_memory_info": self.client.info("memory")
+                "namespace": namespace,
+                "total_syria_items": int(total_items or 0),
+                "last_updated": last_updated or "Never",
+                "qa_pairs_cached": int(stats.get("qa_pairs", 0)),
+                "keyword_indexes": int(stats.get("keyword_indexes", 0)),
+                "category_indexes": int(stats.get("category_indexes", 0)),
+                "question_indexes": int(stats.get("question_indexes", 0)),
+                "token_indexes": int(stats.get("token_indexes", 0)),
+                "counted_at": stats.get("counted_at"),
+                "counted_by": stats.get("counted_by"),
+                "circuit": self.breaker.get_status(),
+                # Sampled by the recount job rather than calling INFO per request
+                "redis_memory_info": {
+                    "used_memory": int(stats.get("used_memory", 0)),
+                    "used_memory_human": stats.get("used_memory_human", "")
+                }
             }
             
         except Exception as e:
+            self._record_error(e)
             logger.error(f"Error getting cache stats: {e}")
-            return {"connected": False, "error": str(e)}
+            return {"connected": False, "error": str(e), "circuit": self.breaker.get_status()}
 
 
 # Global Redis service instance
-redis_service = RedisService()
+redis_service = registry.proxy("redis_service")
 
 def get_redis_service():
     """Get the global Redis service instance"""
-    return redis_service
\ No newline at end of file
+    return registry.get("redis_service")
\ No newline at end of file
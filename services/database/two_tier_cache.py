@@ -0,0 +1,367 @@
+import asyncio
+import json
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Writes an L2 entry only if neither the key's nor the namespace's version
+# moved since the load started (an invalidation on any worker bumps them)
+L2_SET_IF_CURRENT_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[3] and (redis.call('GET', KEYS[3]) or '0') == ARGV[4] then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+return 0
+"""
+# Version counters outlive any load by far; an expired counter reads as "0" again
+VERSION_TTL_SECONDS = 86400
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    delta: float        # seconds the loader took; scales the early-refresh window
+    expires_at: float   # wall-clock expiry shared by every worker through Redis
+
+
+class TwoTierCache:
+    """
+    In-process LRU (L1) in front of Redis (L2), shared by every uvicorn worker.
+
+    Reads try L1, then L2 (through ``RedisService.get_custom_data``), then the
+    loader. Writes through a namespace (``invalidate``) drop the entry from L2
+    and publish the key on a Redis pub/sub channel; every worker's listener
+    drops it from its L1 within milliseconds. L1 entries additionally live at
+    most `l1_ttl` seconds, which bounds staleness while the listener is down.
+    Invalidations also bump a per-key (or per-namespace) version in Redis and a
+    load only writes L2 if the versions it read before calling the loader are
+    unchanged, so a slow load on one worker can't re-cache a value another
+    worker has just invalidated.
+
+    Stampedes on hot keys are avoided with probabilistic early refresh
+    (XFetch): as an entry nears expiry a single reader, chosen at random with a
+    probability growing with the loader's cost, recomputes it while everyone
+    else keeps using the cached value. Concurrent misses for one key in a
+    worker share one loader call.
+    """
+
+    def __init__(
+        self,
+        redis_service,
+        channel: str = "syria:cache:invalidate",
+        l1_max_entries: int = 2048,
+        l1_ttl: float = 60.0,
+        default_ttl: int = 300,
+        early_refresh_beta: float = 1.0,
+        reconnect_seconds: float = 5.0
+    ):
+        self.redis_service = redis_service
+        self.channel = channel
+        self.l1_max_entries = l1_max_entries
+        self.l1_ttl = l1_ttl
+        self.default_ttl = default_ttl
+        self.early_refresh_beta = early_refresh_beta
+        self.reconnect_seconds = reconnect_seconds
+        self.origin = uuid.uuid4().hex[:12]
+
+        self._l1: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Bumped on every invalidation so an in-flight load can't re-cache a stale value
+        self._epochs: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        self.listening = False
+        # Callbacks run for invalidations published by other workers, per namespace
+        self._invalidation_listeners: Dict[str, List[Callable[[Optional[str]], None]]] = {}
+
+    # ---- L1 ----
+
+    def _l1_get(self, full_key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            item = self._l1.get(full_key)
+            if item is None:
+                return None
+            entry, l1_expires_at = item
+            if time.monotonic() >= l1_expires_at or time.time() >= entry.expires_at:
+                del self._l1[full_key]
+                return None
+            self._l1.move_to_end(full_key)
+            return entry
+
+    def _l1_set(self, full_key: str, entry: CacheEntry):
+        l1_expires_at = time.monotonic() + min(self.l1_ttl, entry.expires_at - time.time())
+        with self._lock:
+            self._l1[full_key] = (entry, l1_expires_at)
+            self._l1.move_to_end(full_key)
+            while len(self._l1) > self.l1_max_entries:
+                self._l1.popitem(last=False)
+
+    def _l1_drop(self, namespace: str, key: Optional[str]):
+        with self._lock:
+            self._epochs[namespace] = self._epochs.get(namespace, 0) + 1
+            if key is not None:
+                self._l1.pop(f"{namespace}:{key}", None)
+            else:
+                for full_key in [k for k in self._l1 if k.startswith(f"{namespace}:")]:
+                    del self._l1[full_key]
+
+    # ---- L2 ----
+
+    @staticmethod
+    def _l2_key(full_key: str) -> str:
+        return f"tt:{full_key}"
+
+    async def _l2_get(self, full_key: str) -> Optional[CacheEntry]:
+        data = await self.redis_service.get_custom_data(self._l2_key(full_key))
+        if not data or time.time() >= data.get("e", 0):
+            return None
+        return CacheEntry(data.get("v"), data.get("d", 0.0), data["e"])
+
+    def _version_keys(self, namespace: str, full_key: str) -> List[str]:
+        return [
+            self.redis_service.custom_key(f"tt:ver:{full_key}"),
+            self.redis_service.custom_key(f"tt:nsver:{namespace}")
+        ]
+
+    async def _l2_versions(self, namespace: str, full_key: str) -> Optional[List[str]]:
+        """Current key and namespace versions, None when Redis is unavailable"""
+        if not await self.redis_service.is_connected_async():
+            return None
+        try:
+            versions = await self.redis_service.async_client.mget(self._version_keys(namespace, full_key))
+            return [version or "0" for version in versions]
+        except Exception as e:
+            self.redis_service._record_error(e)
+            logger.warning(f"⚠️ Failed to read cache versions of {full_key}: {e}")
+            return None
+
+    async def _l2_set_if_current(self, namespace: str, full_key: str, entry: CacheEntry, ttl: int, versions: List[str]) -> bool:
+        if not await self.redis_service.is_connected_async():
+            return False
+        try:
+            serialized = json.dumps({"v": entry.value, "d": entry.delta, "e": entry.expires_at}, ensure_ascii=False)
+            return bool(await self.redis_service.async_client.eval(
+                L2_SET_IF_CURRENT_SCRIPT, 3,
+                self.redis_service.custom_key(self._l2_key(full_key)), *self._version_keys(namespace, full_key),
+                serialized, ttl, *versions
+            ))
+        except Exception as e:
+            self.redis_service._record_error(e)
+            logger.warning(f"⚠️ Failed to write cache entry {full_key}: {e}")
+            return False
+
+    # ---- reads ----
+
+    def _should_refresh(self, entry: CacheEntry) -> bool:
+        """XFetch: refresh early with a probability rising as expiry approaches"""
+        if entry.delta <= 0 or self.early_refresh_beta <= 0:
+            return False
+        return time.time() - entry.delta * self.early_refresh_beta * math.log(random.random() or 1e-12) >= entry.expires_at
+
+    def _stats_for(self, namespace: str) -> Dict[str, int]:
+        if namespace not in self._stats:
+            self._stats[namespace] = {
+                "l1_hits": 0, "l2_hits": 0, "misses": 0, "coalesced": 0, "early_refreshes": 0, "invalidations": 0
+            }
+        return self._stats[namespace]
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Cached value of `key`, loading it with `loader` on a miss.
+
+        Values must be JSON-serializable; a loader returning None is not cached.
+        """
+        stats = self._stats_for(namespace)
+        full_key = f"{namespace}:{key}"
+
+        entry = self._l1_get(full_key)
+        if entry is not None and not self._should_refresh(entry):
+            stats["l1_hits"] += 1
+            return entry.value
+
+        if entry is None:
+            entry = await self._l2_get(full_key)
+            if entry is not None and not self._should_refresh(entry):
+                self._l1_set(full_key, entry)
+                stats["l2_hits"] += 1
+                return entry.value
+
+        return await self._load(namespace, full_key, loader, ttl or self.default_ttl, refresh=entry is not None)
+
+    async def _load(self, namespace: str, full_key: str, loader, ttl: int, refresh: bool) -> Any:
+        stats = self._stats_for(namespace)
+        future = self._inflight.get(full_key)
+        if future is not None:
+            stats["coalesced"] += 1
+            return await asyncio.shield(future)
+        stats["early_refreshes" if refresh else "misses"] += 1
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = future
+        epoch = self._epochs.get(namespace, 0)
+        try:
+            versions = await self._l2_versions(namespace, full_key)
+            start_time = time.monotonic()
+            value = await loader()
+            if value is not None and self._epochs.get(namespace, 0) == epoch:
+                entry = CacheEntry(value, time.monotonic() - start_time, time.time() + ttl)
+                # L1 is only filled when L2 accepted the value (or Redis is down
+                # altogether): otherwise another worker invalidated it meanwhile
+                if versions is None or await self._l2_set_if_current(namespace, full_key, entry, ttl, versions):
+                    self._l1_set(full_key, entry)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; don't warn when there are none
+            raise
+        finally:
+            self._inflight.pop(full_key, None)
+
+    # ---- invalidation ----
+
+    def _message(self, namespace: str, key: Optional[str]) -> str:
+        return json.dumps({"namespace": namespace, "key": key, "origin": self.origin}, ensure_ascii=False)
+
+    async def invalidate(self, namespace: str, key: Optional[str] = None):
+        """Drop `key` (or the whole namespace) from this worker, Redis and every other worker"""
+        self._l1_drop(namespace, key)
+        self._stats_for(namespace)["invalidations"] += 1
+        if not await self.redis_service.is_connected_async():
+            return
+        try:
+            pipe = self.redis_service.async_client.pipeline(transaction=True)
+            self._queue_invalidation(pipe, namespace, key)
+            await pipe.execute()
+        except Exception as e:
+            self.redis_service._record_error(e)
+            logger.warning(f"⚠️ Failed to broadcast cache invalidation for {namespace}:{key}: {e}")
+
+    def _queue_invalidation(self, pipe, namespace: str, key: Optional[str]):
+        """Bump the version, drop the L2 entry and notify the other workers"""
+        key_version, namespace_version = self._version_keys(namespace, f"{namespace}:{key}")
+        version_key = key_version if key is not None else namespace_version
+        pipe.incr(version_key)
+        pipe.expire(version_key, VERSION_TTL_SECONDS)
+        if key is not None:
+            pipe.delete(self.redis_service.custom_key(self._l2_key(f"{namespace}:{key}")))
+        pipe.publish(self.channel, self._message(namespace, key))
+
+    def invalidate_sync(self, namespace: str, key: Optional[str] = None):
+        """`invalidate` for synchronous callers (ORM events, repositories)"""
+        self._l1_drop(namespace, key)
+        self._stats_for(namespace)["invalidations"] += 1
+        if not self.redis_service.is_connected():
+            return
+        try:
+            pipe = self.redis_service.client.pipeline(transaction=True)
+            self._queue_invalidation(pipe, namespace, key)
+            pipe.execute()
+        except Exception as e:
+            self.redis_service._record_error(e)
+            logger.warning(f"⚠️ Failed to broadcast cache invalidation for {namespace}:{key}: {e}")
+
+    def _apply_invalidation(self, raw: str):
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.origin:
+            return
+        namespace, key = message.get("namespace", ""), message.get("key")
+        self._l1_drop(namespace, key)
+        for callback in self._invalidation_listeners.get(namespace, ()):
+            try:
+                callback(key)
+            except Exception as e:
+                logger.warning(f"⚠️ Invalidation listener for {namespace} failed: {e}")
+
+    def add_invalidation_listener(self, namespace: str, callback: Callable[[Optional[str]], None]):
+        """Call `callback(key)` when another worker invalidates `key` (or None) of `namespace`"""
+        self._invalidation_listeners.setdefault(namespace, []).append(callback)
+
+    async def _listen(self):
+        while True:
+            pubsub = None
+            try:
+                if await self.redis_service.is_connected_async():
+                    pubsub = self.redis_service.async_client.pubsub(ignore_subscribe_messages=True)
+                    await pubsub.subscribe(self.channel)
+                    # Invalidations may have been missed while unsubscribed
+                    with self._lock:
+                        self._l1.clear()
+                    self.listening = True
+                    logger.info(f"📡 Listening for cache invalidations on {self.channel}")
+                    async for message in pubsub.listen():
+                        self._apply_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.redis_service._record_error(e)
+                logger.warning(f"⚠️ Cache invalidation listener disconnected: {e}")
+            finally:
+                self.listening = False
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+            await asyncio.sleep(self.reconnect_seconds)
+
+    def start_invalidation_listener(self):
+        """Subscribe to cross-worker invalidations (idempotent)"""
+        if self._listener_task and not self._listener_task.done():
+            return
+        self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop_invalidation_listener(self):
+        if self._listener_task and not self._listener_task.done():
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+        self._listener_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        namespaces = {}
+        for namespace, stats in self._stats.items():
+            hits = stats["l1_hits"] + stats["l2_hits"]
+            lookups = hits + stats["misses"] + stats["coalesced"] + stats["early_refreshes"]
+            namespaces[namespace] = {**stats, "hit_ratio": round(hits / lookups, 4) if lookups else 0.0}
+        return {
+            "l1_entries": len(self._l1),
+            "l1_max_entries": self.l1_max_entries,
+            "listening": self.listening,
+            "namespaces": namespaces
+        }
+
+
+def create_two_tier_cache() -> TwoTierCache:
+    from services.registry import redis_service
+    return TwoTierCache(
+        redis_service,
+        l1_max_entries=int(os.getenv("CACHE_L1_MAX_ENTRIES", 2048)),
+        l1_ttl=float(os.getenv("CACHE_L1_TTL_SECONDS", 60)),
+        default_ttl=int(os.getenv("CACHE_DEFAULT_TTL_SECONDS", 300)),
+        early_refresh_beta=float(os.getenv("CACHE_EARLY_REFRESH_BETA", 1.0))
+    )
+
+
+# Global two-tier cache instance
+two_tier_cache = create_two_tier_cache()
@@ -7,10 +7,12 @@ from jose import JWTError
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 import logging
+import os
 import time
 
 from services.auth import get_auth_service, oauth2_scheme
 from services.database.database import get_db
+from services.auth_utils import get_cached_user_by_email
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -18,7 +20,7 @@ logger = get_logger(__name__)
 
 limiter = Limiter(key_func=get_remote_address)
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     logger.debug("Authenticating user with token")
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -44,11 +46,8 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         logger.error(f"JWT token validation error: {e}")
         raise credentials_exception
     
-    logger.debug("Getting user repository")
-    from services.repositories import get_user_repository
-    user_repo = get_user_repository()
     logger.debug(f"Looking up user by email: {email}")
-    user = user_repo.get_user_by_email(db, email)
+    user = await get_cached_user_by_email(db, email)
     
     if user is None:
         logger.error(f"User not found in database for email: {email}")
@@ -56,3 +55,18 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     
     logger.info(f"User authenticated successfully: {user.email}")
     return user
+
+
+def _admin_emails() -> set:
+    return {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+
+
+async def get_current_admin_user(current_user=Depends(get_current_user)):
+    """Authenticated user whose email is listed in ADMIN_EMAILS (no admins when unset)"""
+    if current_user.status != "active" or (current_user.email or "").lower() not in _admin_emails():
+        logger.warning(f"Admin access denied for user: {current_user.email}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions"
+        )
+    return current_user
@@ -0,0 +1,146 @@
+# Lazy service registry: services are built on first use instead of at import time
+import importlib
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from config.logging_config import get_logger, log_performance
+
+logger = get_logger(__name__)
+
+
+class ServiceRegistry:
+    """
+    Registry of the application's singleton services.
+
+    Each service is registered with a factory, either a callable or a
+    "module.path:ClassName" string so that the service module (and its heavy
+    imports such as qdrant_client or google.generativeai) is only imported
+    when the service is first used. Construction happens once per process;
+    a factory that raises is retried on the next access.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Union[str, Callable[[], Any]]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._proxies: Dict[str, "LazyService"] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Union[str, Callable[[], Any]]):
+        self._factories[name] = factory
+
+    def _resolve_factory(self, name: str) -> Callable[[], Any]:
+        factory = self._factories.get(name)
+        if factory is None:
+            raise KeyError(f"Service not registered: {name}")
+        if isinstance(factory, str):
+            module_path, _, attribute = factory.partition(":")
+            factory = getattr(importlib.import_module(module_path), attribute)
+        return factory
+
+    def get(self, name: str) -> Any:
+        """Return the service instance, constructing it on first use"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name not in self._instances:
+                start_time = time.time()
+                try:
+                    self._instances[name] = self._resolve_factory(name)()
+                except Exception as e:
+                    logger.error(f"❌ Failed to construct service {name}: {e}")
+                    raise
+                log_performance(logger, f"Lazy construction of {name}", time.time() - start_time)
+            return self._instances[name]
+
+    def proxy(self, name: str) -> "LazyService":
+        """Module-level stand-in for a service that resolves it on attribute access"""
+        with self._lock:
+            if name not in self._proxies:
+                self._proxies[name] = LazyService(self, name)
+            return self._proxies[name]
+
+    def is_initialized(self, name: str) -> bool:
+        return name in self._instances
+
+    def initialize(self, names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Eagerly construct services (e.g. from the lifespan handler), reporting failures instead of raising"""
+        results = {}
+        for name in names or list(self._factories):
+            try:
+                self.get(name)
+                results[name] = "ready"
+            except Exception as e:
+                results[name] = f"failed: {e}"
+        return results
+
+    def override(self, name: str, instance: Any):
+        """Replace a service instance (tests, alternative backends)"""
+        with self._lock:
+            self._instances[name] = instance
+
+    def reset(self, name: Optional[str] = None):
+        """Drop constructed instances so they are rebuilt on next use"""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+    def get_status(self) -> Dict[str, bool]:
+        return {name: name in self._instances for name in self._factories}
+
+
+class LazyService:
+    """Proxy forwarding attribute access to the registry's instance of a service"""
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ServiceRegistry, name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def _instance(self) -> Any:
+        return self._registry.get(self._name)
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._instance(), attribute)
+
+    def __setattr__(self, attribute: str, value: Any):
+        setattr(self._instance(), attribute, value)
+
+    def __repr__(self) -> str:
+        state = "initialized" if self._registry.is_initialized(self._name) else "lazy"
+        return f"<LazyService {self._name} ({state})>"
+
+
+registry = ServiceRegistry()
+
+registry.register("embedding_service", "services.ai.embedding_service:EmbeddingService")
+registry.register("qdrant_service", "services.ai.qdrant_service:QdrantService")
+registry.register("gemini_service", "services.ai.gemini_service:GeminiService")
+registry.register("identity_service", "services.ai.identity_service:IdentityService")
+registry.register("intelligent_qa_service", "services.ai.intelligent_qa_service:IntelligentQAService")
+registry.register("data_integration_service", "services.ai.data_integration_service:DataIntegrationService")
+registry.register("web_scraping_service", "services.ai.web_scraping_service:WebScrapingService")
+registry.register("news_integration_service", "services.ai.news_integration_service:NewsIntegrationService")
+registry.register("chat_management_service", "services.ai.chat_management_service:ChatManagementService")
+registry.register("redis_service", "services.database.redis_service:RedisService")
+
+embedding_service = registry.proxy("embedding_service")
+qdrant_service = registry.proxy("qdrant_service")
+gemini_service = registry.proxy("gemini_service")
+identity_service = registry.proxy("identity_service")
+intelligent_qa_service = registry.proxy("intelligent_qa_service")
+data_integration_service = registry.proxy("data_integration_service")
+web_scraping_service = registry.proxy("web_scraping_service")
+news_integration_service = registry.proxy("news_integration_service")
+chat_management_service = registry.proxy("chat_management_service")
+redis_service = registry.proxy("redis_service")
+
+
+def get_registry() -> ServiceRegistry:
+    """Get the global service registry"""
+    return registry